@@ -2,6 +2,7 @@ import { useState, useEffect, useCallback, useRef } from 'react';
 import axios from 'axios';
 import { useAuth } from '../context/AuthContext';
 import Layout from '../components/Layout';
+import { trainInventoryModel } from '../services/predictionService';
 import {
   BarChart,
   Bar,
@@ -87,7 +88,7 @@ function InventoryForecasting() {
     setTrainSuccess(false);
     setError(null);
     try {
-      await axios.post(`${API_URL}/ml/inventory/train`, {}, getHeaders());
+      await trainInventoryModel();
       await loadAllData();
       setTrainSuccess(true);
       setTimeout(() => setTrainSuccess(false), 5000);
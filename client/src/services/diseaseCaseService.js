@@ -1,4 +1,5 @@
 import axios from 'axios';
+import { trainModel } from './predictionService';
 
 const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:3000/api';
 const ML_API_URL = import.meta.env.VITE_ML_API_URL || 'http://localhost:3000/api/ml';
@@ -295,14 +296,7 @@ export const getPandemicRisk = async (params = {}) => {
 /**
  * Train ML model
  */
-export const trainMLModel = async () => {
-  const response = await axios.post(
-    `${API_URL}/ml/disease/train`,
-    {},
-    getAuthHeader()
-  );
-  return response.data;
-};
+export const trainMLModel = () => trainModel('/disease/train');
 
 /**
  * Get ML service health status
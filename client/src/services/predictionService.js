@@ -51,18 +51,61 @@ export const getReorderSuggestions = async (days) => {
   return response.data;
 };
 
+const TRAINING_POLL_INTERVAL = 3000; // 3 seconds
+// Matches the ML service's TRAINING_WAIT_TIMEOUT (30 minutes)
+const TRAINING_TIMEOUT = parseInt(import.meta.env.VITE_ML_TRAINING_TIMEOUT || '1800000', 10);
+
 /**
- * Train the sales forecasting model (Admin only)
+ * Error carrying a message where the pages look for it (err.response.data.message)
  */
-export const trainSalesModel = async () => {
-  const response = await axios.post(`${API_URL}/ml/sales/train`, {}, getAuthHeaders());
-  return response.data;
+const trainingError = (message) => {
+  const error = new Error(message);
+  error.response = { data: { message } };
+  return error;
 };
 
 /**
- * Train the inventory forecasting model (Admin only)
+ * Poll a queued training job until it finishes (Admin only)
+ * @param {string} jobId - Job id returned by a train endpoint
+ * @returns {Promise<Object>} The finished job; rejects if training failed, the
+ *   job is unknown or it is still running after TRAINING_TIMEOUT
  */
-export const trainInventoryModel = async () => {
-  const response = await axios.post(`${API_URL}/ml/inventory/train`, {}, getAuthHeaders());
-  return response.data;
+export const waitForTrainingJob = async (jobId) => {
+  if (!jobId) throw trainingError('Training job was not queued');
+  const deadline = Date.now() + TRAINING_TIMEOUT;
+
+  while (Date.now() < deadline) {
+    let response;
+    try {
+      response = await axios.get(`${API_URL}/ml/jobs/${jobId}`, getAuthHeaders());
+    } catch (err) {
+      if (err.response?.status === 404) throw trainingError('Training job not found');
+      throw err;
+    }
+    const job = response.data?.job;
+    if (!job) throw trainingError('Training job status is unavailable');
+    if (job.status === 'succeeded') return job;
+    if (job.status === 'failed') throw trainingError(job.error || 'Training failed');
+    await new Promise((resolve) => setTimeout(resolve, TRAINING_POLL_INTERVAL));
+  }
+  throw trainingError('Training is still running; check the model status later');
+};
+
+/**
+ * Queue a training job and wait for it to finish (Admin only)
+ * @param {string} path - Train endpoint under /api/ml, e.g. /sales/train
+ */
+export const trainModel = async (path) => {
+  const response = await axios.post(`${API_URL}/ml${path}`, {}, getAuthHeaders());
+  return waitForTrainingJob(response.data.job_id);
 };
+
+/**
+ * Train the sales forecasting model (Admin only)
+ */
+export const trainSalesModel = () => trainModel('/sales/train');
+
+/**
+ * Train the inventory forecasting model (Admin only)
+ */
+export const trainInventoryModel = () => trainModel('/inventory/train');
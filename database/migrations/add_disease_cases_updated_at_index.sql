@@ -0,0 +1,5 @@
+-- Migration: Index disease_cases.updated_at
+-- Lets the ML service's case store fetch recently updated cases without a table scan
+
+CREATE INDEX IF NOT EXISTS idx_disease_cases_updated_at
+  ON disease_cases(updated_at);
@@ -407,6 +407,7 @@ CREATE INDEX idx_disease_cases_disease ON disease_cases(disease_name);
 CREATE INDEX idx_disease_cases_date ON disease_cases(diagnosis_date);
 CREATE INDEX idx_disease_cases_species ON disease_cases(species);
 CREATE INDEX idx_disease_cases_category ON disease_cases(disease_category);
+CREATE INDEX idx_disease_cases_updated_at ON disease_cases(updated_at);
 CREATE INDEX idx_inventory_category ON inventory(category);
 CREATE INDEX idx_inventory_quantity ON inventory(quantity);
 CREATE INDEX idx_inventory_code ON inventory(item_code);
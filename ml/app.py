@@ -3,16 +3,33 @@ Flask API Server for ML Services
 Provides REST API endpoints for machine learning predictions
 """
 
+import time
+_IMPORT_STARTED = time.perf_counter()
+
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 import os
-import glob
+import functools
+import threading
 from dotenv import load_dotenv
 
 # DB connection for retraining check
 import sys
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-from config.db_connection import get_raw_db_connection as get_db_connection
+from config.db_connection import pooled_connection, get_pool_stats
+from utils.prophet_pool import get_prophet_pool
+from utils.training_jobs import get_training_jobs
+from utils.startup import get_startup_tracker
+from utils.model_watcher import get_model_watcher
+from utils.model_registry import get_model_registry
+from utils.response_cache import get_response_cache
+from utils.single_flight import get_single_flight
+from utils.metrics import track_requests, render_metrics, model_inference, observe_model_load
+from utils.request_profiler import get_request_profiler, PROFILE_HEADER, PROFILE_PARAM
+from utils.process_memory import memory_usage
+# pandas, sklearn and the model scripts are imported by the startup loader
+# thread or inside the endpoints that need them, so the app answers health
+# checks before they finish importing
 
 # Load environment variables
 load_dotenv()
@@ -20,11 +37,40 @@ load_dotenv()
 # Initialize Flask app
 app = Flask(__name__)
 CORS(app)
+# Latency, in-flight and error metrics for every route (/metrics)
+track_requests(app)
+# Opt-in cProfile of any route (admin token header/flag or ML_PROFILE_SAMPLE_RATE)
+request_profiler = get_request_profiler()
+request_profiler.install(app)
 
 # Configuration
-app.config['DEBUG'] = os.getenv('FLASK_DEBUG', 'True') == 'True'
+app.config['DEBUG'] = os.getenv('FLASK_DEBUG', 'False') == 'True'
 app.config['PORT'] = int(os.getenv('FLASK_PORT', 5001))
 
+# Saved model versions (models/registry.json)
+MODELS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models')
+model_registry = get_model_registry(MODELS_DIR)
+
+# Cached analytics responses, dropped per model whenever that model is swapped
+response_cache = get_response_cache()
+_case_store_watched = False
+
+
+def watch_case_store():
+    """
+    Drop cached disease responses whenever the disease case store's snapshot
+    changes: those views read the store, which refreshes in the background
+    """
+    global _case_store_watched
+    if _case_store_watched:
+        return
+    from utils.case_store import get_case_store
+    get_case_store().add_listener(lambda frame, delta: response_cache.invalidate('disease'))
+    _case_store_watched = True
+
+# Concurrent identical forecast requests share one Prophet fit/predict
+single_flight = get_single_flight()
+
 # Global ML model instances
 disease_model = None
 sales_model = None
@@ -37,38 +83,47 @@ def load_disease_model():
     
     try:
         from scripts.disease_prediction import DiseasePredictionModel
-        import joblib
-        
-        disease_model = DiseasePredictionModel()
+        from utils.model_artifacts import load_artifact
         
-        # Get the absolute path to models directory
-        app_dir = os.path.dirname(os.path.abspath(__file__))
-        models_dir = os.path.join(app_dir, 'models')
+        model = DiseasePredictionModel()
         
-        # Try to load the latest saved model
-        model_pattern = os.path.join(models_dir, 'disease_prediction_*.pkl')
-        model_files = glob.glob(model_pattern)
-        
-        if model_files:
-            latest_model = max(model_files)
-            print(f"Loading disease prediction model: {latest_model}")
-            loaded_data = joblib.load(latest_model)
-            
+        # Serve the registry's pinned or newest version
+        entry = model_registry.resolve('disease_prediction')
+
+        if entry:
+            print(f"Loading disease prediction model v{entry['version']}: {entry['path']}")
+            start = time.perf_counter()
+            loaded_data = load_artifact(entry['path'])
+
+            # Support both save formats: flat dict and base-class-wrapped {'model': {...}}
+            model_components = loaded_data.get('model', loaded_data)
+            if not isinstance(model_components, dict):
+                model_components = loaded_data
+
             # Restore model components
-            disease_model.model = loaded_data
-            disease_model.classification_model = loaded_data.get('classification_model')
-            disease_model.clustering_model = loaded_data.get('clustering_model')
-            disease_model.label_encoders = loaded_data.get('label_encoders', {})
-            disease_model.scaler = loaded_data.get('scaler')
-            disease_model.training_date = loaded_data.get('training_date')
-            disease_model.data_size = loaded_data.get('data_size', 0)
-            disease_model.species_distribution = loaded_data.get('species_distribution', {})
-            disease_model.category_distribution = loaded_data.get('category_distribution', {})
+            model.model = model_components
+            model.classification_model = model_components.get('classification_model')
+            model.clustering_model = model_components.get('clustering_model')
+            model.label_encoders = model_components.get('label_encoders', {})
+            model.scaler = model_components.get('scaler')
+            model.training_date = model_components.get('training_date')
+            model.data_size = model_components.get('data_size', 0)
+            model.species_distribution = model_components.get('species_distribution', {})
+            model.category_distribution = model_components.get('category_distribution', {})
+            model.prepare_fast_path()
             
-            print(f"✓ Disease model loaded successfully (trained on {disease_model.data_size} cases)")
+            print(f"✓ Disease model loaded successfully (trained on {model.data_size} cases)")
+            load_seconds = time.perf_counter() - start
+            model_registry.record_load('disease_prediction', entry['version'], load_seconds)
+            observe_model_load('disease', load_seconds)
+            # Swap only once the new model is fully restored; requests keep the old one until then
+            disease_model = model
+            watch_case_store()
+            response_cache.invalidate('disease')
+            startup.mark_ready('disease')
             return True
         else:
-            print(f"⚠️  No trained disease model found in {models_dir}")
+            print(f"⚠️  No trained disease model found in {MODELS_DIR}")
             print("   Train the model by running: python scripts/disease_prediction.py")
             return False
             
@@ -85,22 +140,17 @@ def load_sales_model():
 
     try:
         from scripts.sales_forecasting import SalesForecastingModel
-        import joblib
-
-        sales_model = SalesForecastingModel()
+        from utils.model_artifacts import load_artifact
 
-        # Get the absolute path to models directory
-        app_dir = os.path.dirname(os.path.abspath(__file__))
-        models_dir = os.path.join(app_dir, 'models')
+        model = SalesForecastingModel()
 
-        # Try to load the latest saved model
-        model_pattern = os.path.join(models_dir, 'sales_forecasting_*.pkl')
-        model_files = glob.glob(model_pattern)
+        # Serve the registry's pinned or newest version
+        entry = model_registry.resolve('sales_forecasting')
 
-        if model_files:
-            latest_model = max(model_files)
-            print(f"Loading sales forecasting model: {latest_model}")
-            loaded_data = joblib.load(latest_model)
+        if entry:
+            print(f"Loading sales forecasting model v{entry['version']}: {entry['path']}")
+            start = time.perf_counter()
+            loaded_data = load_artifact(entry['path'])
 
             # Support both save formats: flat dict and base-class-wrapped {'model': {...}}
             model_components = loaded_data.get('model', loaded_data)
@@ -108,21 +158,28 @@ def load_sales_model():
                 model_components = loaded_data
 
             # Restore model components
-            sales_model.prophet_model = model_components.get('prophet_model')
-            sales_model.demand_model = model_components.get('demand_model')
-            sales_model.scaler = model_components.get('scaler')
-            sales_model.feature_columns = model_components.get('feature_columns', [])
-            sales_model.training_data = model_components.get('training_data', {})
+            model.prophet_model = model_components.get('prophet_model')
+            model.demand_model = model_components.get('demand_model')
+            model.scaler = model_components.get('scaler')
+            model.feature_columns = model_components.get('feature_columns', [])
+            model.training_data = model_components.get('training_data', {})
 
             import pandas as pd
             monthly_records = model_components.get('monthly_summary', [])
             if monthly_records:
-                sales_model.monthly_summary = pd.DataFrame(monthly_records)
+                model.monthly_summary = pd.DataFrame(monthly_records)
 
             print(f"✓ Sales forecasting model loaded successfully")
+            load_seconds = time.perf_counter() - start
+            model_registry.record_load('sales_forecasting', entry['version'], load_seconds)
+            observe_model_load('sales', load_seconds)
+            # Swap only once the new model is fully restored; requests keep the old one until then
+            sales_model = model
+            response_cache.invalidate('sales')
+            startup.mark_ready('sales')
             return True
         else:
-            print(f"⚠️  No trained sales model found in {models_dir}")
+            print(f"⚠️  No trained sales model found in {MODELS_DIR}")
             print("   Train the model via POST /api/ml/sales/train")
             return False
 
@@ -139,22 +196,17 @@ def load_inventory_model():
 
     try:
         from scripts.inventory_forecasting import InventoryForecastingModel
-        import joblib
+        from utils.model_artifacts import load_artifact
 
-        inventory_model = InventoryForecastingModel()
+        model = InventoryForecastingModel()
 
-        # Get the absolute path to models directory
-        app_dir = os.path.dirname(os.path.abspath(__file__))
-        models_dir = os.path.join(app_dir, 'models')
+        # Serve the registry's pinned or newest version
+        entry = model_registry.resolve('inventory_forecasting')
 
-        # Try to load the latest saved model
-        model_pattern = os.path.join(models_dir, 'inventory_forecasting_*.pkl')
-        model_files = glob.glob(model_pattern)
-
-        if model_files:
-            latest_model = max(model_files)
-            print(f"Loading inventory forecasting model: {latest_model}")
-            loaded_data = joblib.load(latest_model)
+        if entry:
+            print(f"Loading inventory forecasting model v{entry['version']}: {entry['path']}")
+            start = time.perf_counter()
+            loaded_data = load_artifact(entry['path'])
 
             # Support both save formats: flat dict and base-class-wrapped {'model': {...}}
             model_components = loaded_data.get('model', loaded_data)
@@ -162,17 +214,24 @@ def load_inventory_model():
                 model_components = loaded_data
 
             # Restore model components
-            inventory_model.demand_model = model_components.get('demand_model')
-            inventory_model.scaler = model_components.get('scaler')
-            inventory_model.feature_columns = model_components.get('feature_columns', [])
-            inventory_model.item_stats = model_components.get('item_stats', {})
-            inventory_model.category_map = model_components.get('category_map', {})
+            model.demand_model = model_components.get('demand_model')
+            model.scaler = model_components.get('scaler')
+            model.feature_columns = model_components.get('feature_columns', [])
+            model.item_stats = model_components.get('item_stats', {})
+            model.category_map = model_components.get('category_map', {})
 
-            item_count = len(inventory_model.item_stats)
+            item_count = len(model.item_stats)
             print(f"✓ Inventory forecasting model loaded successfully ({item_count} items)")
+            load_seconds = time.perf_counter() - start
+            model_registry.record_load('inventory_forecasting', entry['version'], load_seconds)
+            observe_model_load('inventory', load_seconds)
+            # Swap only once the new model is fully restored; requests keep the old one until then
+            inventory_model = model
+            response_cache.invalidate('inventory')
+            startup.mark_ready('inventory')
             return True
         else:
-            print(f"⚠️  No trained inventory model found in {models_dir}")
+            print(f"⚠️  No trained inventory model found in {MODELS_DIR}")
             print("   Train the model via POST /api/ml/inventory/train")
             return False
 
@@ -183,14 +242,125 @@ def load_inventory_model():
         return False
 
 
-# Load models at startup
-print("\n" + "=" * 60)
-print("  VetCare Pro ML Service - Starting Up")
-print("=" * 60)
-load_disease_model()
-load_sales_model()
-load_inventory_model()
-print("=" * 60 + "\n")
+def swap_disease_model():
+    """Load a freshly trained disease model and warm its default forecasts"""
+    if not load_disease_model():
+        return False
+    # Warm the forecast cache for the default forecasting views in the background
+    threading.Thread(target=disease_model.precompute_forecasts, daemon=True).start()
+    return True
+
+
+def has_model_file(name):
+    """True when the registry has a version to serve for the model name"""
+    return model_registry.resolve(name) is not None
+
+
+startup = get_startup_tracker()
+model_watcher = get_model_watcher(MODELS_DIR)
+
+# Hot reload: a new registry version (trained here, in another worker or by a
+# script) or a pin/rollback is loaded in the background and swapped in
+model_watcher.register('disease', 'disease_prediction', swap_disease_model)
+model_watcher.register('sales', 'sales_forecasting', load_sales_model)
+model_watcher.register('inventory', 'inventory_forecasting', load_inventory_model)
+
+TRAINED_MODEL_KEYS = ('disease', 'sales', 'inventory')
+
+
+def swap_trained_model(model_key):
+    """Swap in a model a training job just saved and tell the other workers"""
+    keys = list(TRAINED_MODEL_KEYS) if model_key == 'all' else [model_key]
+    swapped = all([model_watcher.reload(key, force=True) for key in keys])
+    if swapped:
+        model_watcher.notify(model_key)
+    return swapped
+
+
+def startup_loader(model_key, loader):
+    """Wrap a loader so the watcher records the file loaded at startup"""
+    def load():
+        loaded = loader()
+        model_watcher.mark_loaded(model_key)
+        return loaded
+    return load
+
+
+# Background training jobs swap their model in through the watcher once it is saved
+training_jobs = get_training_jobs()
+for key in TRAINED_MODEL_KEYS + ('all',):
+    training_jobs.register_loader(key, lambda key=key: swap_trained_model(key))
+
+
+def cached_response(model_key, sources, params=None):
+    """
+    Serve a read-only GET endpoint from the response cache, with ETag and
+    Last-Modified so clients can revalidate with If-None-Match / If-Modified-Since
+
+    Args:
+        model_key (str): Model the response is computed from; reloading it drops the entry
+        sources (tuple): Database tables the view queries itself (response_cache.SOURCE_WATERMARKS);
+            () for views computed only from the model or the disease case store, which
+            invalidate their entries when they change
+        params (dict): Query param name -> (type, default) the response depends on
+    """
+    params = params or {}
+
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper():
+            if not response_cache.enabled:
+                return view()
+            key = (request.path,) + tuple(
+                (name, request.args.get(name, default, type=type_))
+                for name, (type_, default) in sorted(params.items())
+            )
+            entry, token = response_cache.get(key, model_key, sources)
+            cache_status = 'HIT'
+            if entry is None:
+                result = view()
+                response, status = result if isinstance(result, tuple) else (result, 200)
+                # Errors and 503s while a model loads are never cached
+                if status != 200:
+                    return result
+                entry = response_cache.put(key, model_key, token, response.get_data())
+                cache_status = 'MISS'
+
+            response = app.response_class(entry.body, mimetype='application/json')
+            response.set_etag(entry.etag)
+            response.last_modified = entry.last_modified
+            response.cache_control.private = True
+            response.cache_control.no_cache = True
+            response.headers['X-Cache'] = cache_status
+            response.make_conditional(request)
+            if response.status_code == 304:
+                response_cache.record_not_modified()
+            return response
+        return wrapper
+    return decorator
+
+
+startup.register('disease', startup_loader('disease', load_disease_model), lambda: has_model_file('disease_prediction'))
+startup.register('sales', startup_loader('sales', load_sales_model), lambda: has_model_file('sales_forecasting'))
+startup.register('inventory', startup_loader('inventory', load_inventory_model), lambda: has_model_file('inventory_forecasting'))
+
+# Load models at startup (spawned worker processes re-import this module as
+# __mp_main__; they never serve requests, so skip the load there). By default
+# the load runs in a background thread and /api/ml/ready reports 503 until it
+# finishes; ML_BACKGROUND_MODEL_LOAD=false loads before the module returns.
+if __name__ != '__mp_main__':
+    print("\n" + "=" * 60)
+    print("  VetCare Pro ML Service - Starting Up")
+    print("=" * 60)
+    if os.getenv('ML_BACKGROUND_MODEL_LOAD', 'true').lower() == 'true':
+        print("Loading models in the background (readiness: /api/ml/ready)")
+        startup.start_background()
+    else:
+        startup.load_all()
+    # gunicorn.conf.py starts the watcher in each worker after fork instead
+    if os.getenv('ML_MODEL_WATCHER_AUTOSTART', 'true').lower() == 'true':
+        model_watcher.start(wait_for=startup)
+    print("=" * 60 + "\n")
 
 
 # ===========================================================================
@@ -207,21 +377,59 @@ def health_check():
     }), 200
 
 
+@app.route('/api/ml/live', methods=['GET'])
+def liveness_check():
+    """Liveness probe: the process is up and serving, whether or not models are loaded"""
+    return jsonify({
+        'status': 'alive',
+        'uptime_seconds': round(startup.elapsed(), 3)
+    }), 200
+
+
+@app.route('/api/ml/ready', methods=['GET'])
+def readiness_check():
+    """
+    Readiness probe: 200 once startup model loading has settled, 503 while
+    models are still loading. ?model=disease|sales|inventory requires that
+    model to be loaded.
+    """
+    model_key = request.args.get('model')
+    if model_key is not None and model_key not in startup.models:
+        return jsonify({
+            'success': False,
+            'error': f"Unknown model '{model_key}'. Use one of: {', '.join(startup.models)}"
+        }), 400
+
+    report = startup.get_report()
+    ready = startup.is_ready(model_key)
+    return jsonify({
+        'ready': ready,
+        'models': {name: m['status'] for name, m in report['models'].items()},
+        'uptime_seconds': report['uptime_seconds']
+    }), 200 if ready else 503
+
+
+@app.route('/api/ml/startup', methods=['GET'])
+def get_startup_report():
+    """Startup timings: app import time, per-module import time and per-model load time"""
+    return jsonify({
+        'success': True,
+        'startup': startup.get_report()
+    }), 200
+
+
 @app.route('/api/ml/models/status', methods=['GET'])
 def get_models_status():
     """Get status of all ML models"""
     try:
-        from datetime import datetime
-
-        def latest_model_date(prefix):
-            """Return ISO timestamp from the latest model file's modification time, or None."""
-            app_dir = os.path.dirname(os.path.abspath(__file__))
-            files = glob.glob(os.path.join(app_dir, 'models', f'{prefix}_*.pkl'))
-            if not files:
-                return None
-            latest_file = max(files)
-            mtime = os.path.getmtime(latest_file)
-            return datetime.fromtimestamp(mtime).isoformat()
+        from utils.case_store import get_case_store
+        from utils.outbreak_index import get_outbreak_index
+        from utils.forecast_cache import get_forecast_cache
+
+        def latest_model_date(name):
+            """Return ISO timestamp the served registry version was saved, or None."""
+            entry = model_registry.resolve(name)
+            return entry['created_at'] if entry else None
 
         models_status = {
             'disease_prediction': {
@@ -234,7 +442,8 @@ def get_models_status():
                     if disease_model and disease_model.training_date
                     else latest_model_date('disease_prediction')
                 ),
-                'confidence': disease_model.get_model_confidence() if disease_model else None
+                'confidence': disease_model.get_model_confidence() if disease_model else None,
+                'prediction_cache': disease_model.get_prediction_cache_stats() if disease_model else None
             },
             'sales_forecasting': {
                 'loaded': sales_model is not None,
@@ -254,9 +463,307 @@ def get_models_status():
 
         return jsonify({
             'success': True,
-            'models': models_status
+            'models': models_status,
+            'disease_case_store': get_case_store().get_stats(),
+            'outbreak_index': get_outbreak_index().get_stats(),
+            'disease_forecast_cache': get_forecast_cache().get_stats(),
+            'prophet_pool': get_prophet_pool().get_stats(),
+            'training_jobs': training_jobs.get_stats(),
+            'memory': memory_usage(),
+            'model_reload': model_watcher.get_stats(),
+            'model_registry': model_registry.get_stats(),
+            'profiling': request_profiler.get_stats(),
+            'response_cache': response_cache.get_stats(),
+            'request_coalescing': single_flight.get_stats(),
+            'startup': startup.get_report()
+        }), 200
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Prometheus metrics (request latency, DB queries, inference, Prophet, caches, model loads)"""
+    rendered = render_metrics()
+    if rendered is None:
+        return jsonify({
+            'success': False,
+            'error': 'prometheus_client is not installed'
+        }), 503
+    body, content_type = rendered
+    return app.response_class(body, content_type=content_type)
+
+
+@app.route('/api/ml/db/pool-status', methods=['GET'])
+def get_db_pool_status():
+    """Get connection pool usage (in-use, waits, wait time) for sizing under load"""
+    try:
+        return jsonify({
+            'success': True,
+            'pool': get_pool_stats()
+        }), 200
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+# ===========================================================================
+# TRAINING JOB ENDPOINTS
+# ===========================================================================
+
+def submit_training_job(model_key, message, options=None):
+    """
+    Queue a training job for model_key and answer 202 with its job id.
+
+    With ?wait=true the request blocks until the job finishes (up to
+    TRAINING_WAIT_TIMEOUT seconds) and answers like the old synchronous
+    endpoint: {'success', 'message', 'results'}.
+    """
+    try:
+        print(f"\n🚀 Queueing {model_key} model training...")
+        # A profiled train request also profiles the training run in its worker process
+        profile_path = request_profiler.job_profile_path(f'train_{model_key}') if request_profiler.active() else None
+        job = training_jobs.submit(model_key, options, profile_path=profile_path)
+
+        if request.args.get('wait', 'false').lower() != 'true':
+            return jsonify({
+                'success': True,
+                'message': 'Training job queued',
+                'job_id': job['job_id'],
+                'job': job
+            }), 202
+
+        job = training_jobs.wait(job['job_id'], timeout=int(os.getenv('TRAINING_WAIT_TIMEOUT', 1800)))
+        if job['status'] == 'succeeded':
+            return jsonify({
+                'success': True,
+                'message': message,
+                'results': job['results'],
+                'job': job
+            }), 200
+        if job['status'] == 'failed':
+            return jsonify({'success': False, 'error': job['error'], 'job': job}), 500
+        return jsonify({
+            'success': True,
+            'message': 'Training still running; poll the job for results',
+            'job_id': job['job_id'],
+            'job': job
+        }), 202
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@app.route('/api/ml/train-all', methods=['POST'])
+def train_all_models():
+    """
+    Queue a train-all job: one shared extraction, three models fitted in parallel
+
+    Query params:
+        compare: also time the standalone trainings run sequentially (true/false)
+        wait: block until the job finishes (true/false)
+    """
+    compare = request.args.get('compare', 'false').lower() == 'true'
+    return submit_training_job('all', 'All models trained successfully', {'compare': compare})
+
+
+@app.route('/api/ml/jobs', methods=['GET'])
+def list_training_jobs():
+    """
+    List recent training jobs, newest first
+
+    Query params:
+        model: only jobs for this model (disease | sales | inventory | all)
+    """
+    try:
+        return jsonify({
+            'success': True,
+            'jobs': training_jobs.list(request.args.get('model') or None)
+        }), 200
+
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/api/ml/jobs/<job_id>', methods=['GET'])
+def get_training_job(job_id):
+    """Status, stage, elapsed time and (once finished) results of one training job"""
+    try:
+        job = training_jobs.get(job_id)
+        if job is None:
+            return jsonify({'success': False, 'error': 'Training job not found'}), 404
+        return jsonify({'success': True, 'job': job}), 200
+
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+# ===========================================================================
+# MODEL REGISTRY ENDPOINTS
+# ===========================================================================
+
+REGISTRY_MODEL_NAMES = {
+    'disease': 'disease_prediction',
+    'sales': 'sales_forecasting',
+    'inventory': 'inventory_forecasting',
+}
+
+
+def registry_model_name(model_key):
+    if model_key not in REGISTRY_MODEL_NAMES:
+        raise ValueError(f"Unknown model '{model_key}'. Use one of: {', '.join(REGISTRY_MODEL_NAMES)}")
+    return REGISTRY_MODEL_NAMES[model_key]
+
+
+def serve_registry_change(model_key, message):
+    """Swap this worker to the newly served version and tell the other workers"""
+    swapped = model_watcher.reload(model_key, force=True)
+    model_watcher.notify(model_key)
+    return jsonify({
+        'success': True,
+        'message': message,
+        'model_swapped': swapped,
+        'serving': model_registry.resolve(registry_model_name(model_key))
+    }), 200
+
+
+@app.route('/api/ml/models/<model_key>/versions', methods=['GET'])
+def list_model_versions(model_key):
+    """Retained versions of a model with hash, size, metrics and load time"""
+    try:
+        name = registry_model_name(model_key)
+        return jsonify({'success': True, 'model': name, **model_registry.versions(name)}), 200
+
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/api/ml/models/<model_key>/pin', methods=['POST'])
+def pin_model_version(model_key):
+    """
+    Serve a specific version until unpinned
+
+    Request body:
+    {
+        "version": 3
+    }
+    """
+    try:
+        name = registry_model_name(model_key)
+        version = (request.get_json(silent=True) or {}).get('version')
+        if not isinstance(version, int) or isinstance(version, bool):
+            return jsonify({'success': False, 'error': 'version must be an integer'}), 400
+        model_registry.pin(name, version)
+        return serve_registry_change(model_key, f'{name} pinned to version {version}')
+
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/api/ml/models/<model_key>/unpin', methods=['POST'])
+def unpin_model_version(model_key):
+    """Go back to serving the newest version"""
+    try:
+        name = registry_model_name(model_key)
+        model_registry.unpin(name)
+        return serve_registry_change(model_key, f'{name} unpinned; serving the newest version')
+
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/api/ml/models/<model_key>/rollback', methods=['POST'])
+def rollback_model_version(model_key):
+    """Pin the version before the one currently served"""
+    try:
+        name = registry_model_name(model_key)
+        version = model_registry.rollback(name)
+        return serve_registry_change(model_key, f'{name} rolled back to version {version}')
+
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+# ===========================================================================
+# PROFILING ENDPOINTS
+# ===========================================================================
+
+def profile_access_error():
+    """403 response unless the request carries the profiling admin token, else None"""
+    supplied = request.headers.get(PROFILE_HEADER) or request.args.get(PROFILE_PARAM)
+    if request_profiler.authorized(supplied):
+        return None
+    return jsonify({
+        'success': False,
+        'error': f'Profiling requires the admin token in the {PROFILE_HEADER} header (ML_PROFILE_TOKEN)'
+    }), 403
+
+
+@app.route('/api/ml/profiles', methods=['GET'])
+def list_profiles():
+    """List captured request and training profiles, newest first (admin token required)"""
+    denied = profile_access_error()
+    if denied:
+        return denied
+    try:
+        return jsonify({
+            'success': True,
+            'profiles': request_profiler.list(),
+            'profiling': request_profiler.get_stats()
         }), 200
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@app.route('/api/ml/profiles/<name>', methods=['GET'])
+def get_profile(name):
+    """
+    Download a pstats profile (admin token required)
 
+    Query params:
+        format: pstats (default, binary file) or text (top functions report)
+        sort: pstats sort key for text (default: cumulative)
+        limit: functions listed in text (default: 40)
+    """
+    denied = profile_access_error()
+    if denied:
+        return denied
+    try:
+        if request.args.get('format', 'pstats') == 'text':
+            report = request_profiler.summary(
+                name,
+                sort=request.args.get('sort', 'cumulative'),
+                limit=request.args.get('limit', 40, type=int)
+            )
+            return app.response_class(report, mimetype='text/plain')
+        from flask import send_file
+        return send_file(request_profiler.path(name), mimetype='application/octet-stream',
+                         as_attachment=True, download_name=name)
+    except (ValueError, KeyError) as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except FileNotFoundError as e:
+        return jsonify({'success': False, 'error': str(e)}), 404
     except Exception as e:
         return jsonify({
             'success': False,
@@ -275,32 +782,28 @@ def retrain_check():
     Returns a recommendation for each model if records have grown by >10% or >50 rows.
     """
     try:
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'success': False, 'error': 'DB connection failed'}), 500
+        with pooled_connection() as conn:
+            cur = conn.cursor()
 
-        cur = conn.cursor()
+            # Fetch stored metadata
+            cur.execute("SELECT model_name, last_trained_at, records_at_last_train, model_version FROM model_metadata")
+            rows = cur.fetchall()
+            metadata = {r[0]: {'last_trained_at': r[1], 'records_at_last_train': r[2] or 0, 'model_version': r[3]} for r in rows}
 
-        # Fetch stored metadata
-        cur.execute("SELECT model_name, last_trained_at, records_at_last_train, model_version FROM model_metadata")
-        rows = cur.fetchall()
-        metadata = {r[0]: {'last_trained_at': r[1], 'records_at_last_train': r[2] or 0, 'model_version': r[3]} for r in rows}
+            # Current record counts
+            cur.execute("SELECT COUNT(*) FROM disease_cases")
+            disease_count = cur.fetchone()[0]
 
-        # Current record counts
-        cur.execute("SELECT COUNT(*) FROM disease_cases")
-        disease_count = cur.fetchone()[0]
+            cur.execute("SELECT COUNT(*) FROM billing WHERE payment_status IN ('fully_paid', 'partially_paid')")
+            billing_count = cur.fetchone()[0]
 
-        cur.execute("SELECT COUNT(*) FROM billing WHERE payment_status IN ('fully_paid', 'partially_paid')")
-        billing_count = cur.fetchone()[0]
+            cur.execute("SELECT COUNT(*) FROM inventory_transactions WHERE transaction_type = 'dispensed'")
+            tx_count = cur.fetchone()[0]
+            cur.execute("SELECT COUNT(*) FROM billing_items WHERE item_id IS NOT NULL")
+            billing_items_count = cur.fetchone()[0]
+            inventory_count = tx_count if tx_count > 0 else billing_items_count
 
-        cur.execute("SELECT COUNT(*) FROM inventory_transactions WHERE transaction_type = 'dispensed'")
-        tx_count = cur.fetchone()[0]
-        cur.execute("SELECT COUNT(*) FROM billing_items WHERE item_id IS NOT NULL")
-        billing_items_count = cur.fetchone()[0]
-        inventory_count = tx_count if tx_count > 0 else billing_items_count
-
-        cur.close()
-        conn.close()
+            cur.close()
 
         def should_retrain(current, stored):
             if stored == 0:
@@ -379,7 +882,8 @@ def predict_disease():
             }), 400
 
         # Make prediction
-        result = disease_model.predict(data)
+        with model_inference('disease', 'predict'):
+            result = disease_model.predict(data)
 
         return jsonify({
             'success': True,
@@ -393,6 +897,54 @@ def predict_disease():
         }), 500
 
 
+@app.route('/api/ml/disease/predict/batch', methods=['POST'])
+def predict_disease_batch():
+    """
+    Predict disease categories for many cases in one vectorized pass
+
+    Request body:
+    {
+        "cases": [{"pet_id": 1, "species": "Dog", "breed": "Labrador", ...}, ...],
+        "top_k": 3,             // optional: only the 3 most likely categories per case
+        "id_field": "pet_id"    // optional: input field echoed on each prediction
+    }
+    """
+    try:
+        if not disease_model or not disease_model.classification_model:
+            return jsonify({
+                'success': False,
+                'message': 'Disease prediction model not trained yet'
+            }), 503
+
+        data = request.get_json(silent=True) or {}
+        cases = data.get('cases')
+        if not isinstance(cases, list) or not cases:
+            return jsonify({'success': False, 'error': 'cases must be a non-empty list'}), 400
+
+        max_cases = int(os.getenv('DISEASE_PREDICT_BATCH_MAX', 100000))
+        if len(cases) > max_cases:
+            return jsonify({'success': False, 'error': f'At most {max_cases} cases per request'}), 400
+
+        top_k = data.get('top_k')
+        if top_k is not None and (not isinstance(top_k, int) or top_k < 1):
+            return jsonify({'success': False, 'error': 'top_k must be a positive integer'}), 400
+
+        with model_inference('disease', 'predict_batch'):
+            result = disease_model.predict_batch(cases, top_k=top_k, id_field=data.get('id_field', 'pet_id'))
+
+        return jsonify({
+            'success': True,
+            'count': len(result['predictions']),
+            'prediction': result
+        }), 200
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
 @app.route('/api/ml/disease/outbreak-risk', methods=['POST'])
 def assess_outbreak_risk():
     """
@@ -423,12 +975,13 @@ def assess_outbreak_risk():
         days_lookback = max(1, min(365, int(data.get('days_lookback', 30))))
 
         # Assess risk
-        risk_assessment = disease_model.predict_outbreak_risk(
-            species=species,
-            disease_category=disease_category,
-            region=region,
-            days_lookback=days_lookback
-        )
+        with model_inference('disease', 'outbreak_risk'):
+            risk_assessment = disease_model.predict_outbreak_risk(
+                species=species,
+                disease_category=disease_category,
+                region=region,
+                days_lookback=days_lookback
+            )
 
         return jsonify({
             'success': True,
@@ -442,7 +995,130 @@ def assess_outbreak_risk():
         }), 500
 
 
+@app.route('/api/ml/disease/outbreak-risk/batch', methods=['POST'])
+def assess_outbreak_risk_batch():
+    """
+    Assess outbreak risk for every species, disease category and region in one request
+
+    Query params or body:
+    - days_lookback (optional): Window in days, or a list of windows (default: 30)
+    - include_combinations (optional): Also score multi-dimension scopes (default: false)
+    - limit (optional): Return only the top N rows of the ranking
+    """
+    try:
+        if not disease_model:
+            return jsonify({
+                'success': False,
+                'message': 'Disease prediction model not loaded'
+            }), 503
+
+        if request.is_json:
+            data = request.get_json()
+            lookbacks = data.get('days_lookback', [30])
+        else:
+            data = request.args.to_dict()
+            lookbacks = request.args.getlist('days_lookback') or [30]
+
+        if not isinstance(lookbacks, list):
+            lookbacks = [lookbacks]
+        lookbacks = sorted({max(1, min(365, int(lb))) for lb in lookbacks})
+        include_combinations = str(data.get('include_combinations', 'false')).lower() in ('true', '1', 'yes')
+        limit = int(data['limit']) if data.get('limit') else None
+
+        with model_inference('disease', 'outbreak_risk_batch'):
+            batch = disease_model.predict_outbreak_risk_batch(
+                lookbacks=lookbacks,
+                include_combinations=include_combinations,
+                limit=limit
+            )
+
+        return jsonify({
+            'success': True,
+            'batch': batch
+        }), 200
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@app.route('/api/ml/disease/outbreak-risk/replay', methods=['GET'])
+def replay_outbreak_risk():
+    """
+    Historical as-of outbreak risk series for backtesting the scoring thresholds
+
+    Query params:
+    - species, disease_category, region (optional): Scope filters
+    - by (optional): species, disease_category or region — one series per value
+    - days_lookback (optional): Window in days (default: 30)
+    - years (optional): Days covered, counted back from today (default: 1)
+    - start_date, end_date (optional): Explicit as-of range (YYYY-MM-DD)
+    """
+    try:
+        if not disease_model:
+            return jsonify({
+                'success': False,
+                'message': 'Disease prediction model not loaded'
+            }), 503
+
+        from datetime import datetime, timedelta
+
+        days_lookback = max(1, min(365, int(request.args.get('days_lookback', 30))))
+        end_date = request.args.get('end_date') or datetime.now().date().isoformat()
+        start_date = request.args.get('start_date') or (
+            datetime.now().date() - timedelta(days=int(365 * float(request.args.get('years', 1))))
+        ).isoformat()
+        by = request.args.get('by')
+        if by and by not in ('species', 'disease_category', 'region'):
+            return jsonify({
+                'success': False,
+                'error': "by must be one of: species, disease_category, region"
+            }), 400
+
+        scope = {
+            'species': request.args.get('species'),
+            'disease_category': request.args.get('disease_category'),
+            'region': request.args.get('region')
+        }
+        scopes = [scope]
+        if by:
+            scopes = [dict(scope, **{by: value}) for value in disease_model.outbreak_index.scope_values(by)]
+
+        results = []
+        for filters in scopes:
+            series = disease_model.replay_outbreak_risk(
+                days_lookback=days_lookback, start_date=start_date, end_date=end_date, **filters
+            )
+            if series.empty:
+                continue
+            peak = series.loc[series['risk_score'].idxmax()]
+            series['date'] = series['date'].dt.strftime('%Y-%m-%d')
+            results.append({
+                'filters': filters,
+                'days_by_level': series['risk_level'].value_counts().to_dict(),
+                'peak': {'date': peak['date'].strftime('%Y-%m-%d'), 'risk_score': int(peak['risk_score'])},
+                'series': series.to_dict(orient='records')
+            })
+
+        return jsonify({
+            'success': True,
+            'days_lookback': days_lookback,
+            'start_date': start_date,
+            'end_date': end_date,
+            'results': results
+        }), 200
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
 @app.route('/api/ml/disease/patterns', methods=['GET'])
+@cached_response('disease', ())
 def analyze_disease_patterns():
     """Analyze disease patterns using clustering"""
     try:
@@ -467,6 +1143,7 @@ def analyze_disease_patterns():
 
 
 @app.route('/api/ml/disease/trends', methods=['GET'])
+@cached_response('disease', (), {'species': (str, None)})
 def get_disease_trends():
     """
     Get disease trends by species
@@ -497,6 +1174,7 @@ def get_disease_trends():
 
 
 @app.route('/api/ml/disease/geographic', methods=['GET'])
+@cached_response('disease', ())
 def get_geographic_distribution():
     """Get disease distribution by region"""
     try:
@@ -598,29 +1276,8 @@ def get_pandemic_risk():
 
 @app.route('/api/ml/disease/train', methods=['POST'])
 def train_disease_model():
-    """Train or retrain the disease prediction model"""
-    try:
-        from scripts.disease_prediction import DiseasePredictionModel
-
-        global disease_model
-
-        print("\n🚀 Starting disease prediction model training...")
-        disease_model = DiseasePredictionModel()
-        results = disease_model.train()
-
-        print("✓ Training complete!")
-
-        return jsonify({
-            'success': True,
-            'message': 'Model trained successfully',
-            'results': results
-        }), 200
-
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+    """Queue a background retrain of the disease prediction model"""
+    return submit_training_job('disease', 'Model trained successfully')
 
 
 @app.route('/api/ml/disease/forecast', methods=['GET'])
@@ -632,13 +1289,22 @@ def forecast_disease_trends():
 
         periods_months = request.args.get('periods', 12, type=int)
         periods_months = max(1, min(60, periods_months))
-        species = request.args.get('species', None)
-        disease_category = request.args.get('disease_category', None)
+        species = request.args.get('species', None) or None
+        disease_category = request.args.get('disease_category', None) or None
+
+        model = disease_model
 
-        result = disease_model.forecast_disease_trends(
-            periods_months=periods_months,
-            species=species if species else None,
-            disease_category=disease_category if disease_category else None
+        def run_forecast():
+            with model_inference('disease', 'forecast'):
+                return model.forecast_disease_trends(
+                    periods_months=periods_months,
+                    species=species,
+                    disease_category=disease_category
+                )
+
+        result, _ = single_flight.do(
+            ('disease_forecast', id(model), periods_months, species, disease_category),
+            run_forecast
         )
 
         if 'error' in result:
@@ -656,29 +1322,8 @@ def forecast_disease_trends():
 
 @app.route('/api/ml/sales/train', methods=['POST'])
 def train_sales_model():
-    """Train or retrain the sales forecasting model"""
-    try:
-        from scripts.sales_forecasting import SalesForecastingModel
-
-        global sales_model
-
-        print("\n🚀 Starting sales forecasting model training...")
-        sales_model = SalesForecastingModel()
-        results = sales_model.train()
-
-        print("✓ Sales model training complete!")
-
-        return jsonify({
-            'success': True,
-            'message': 'Sales forecasting model trained successfully',
-            'results': results
-        }), 200
-
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+    """Queue a background retrain of the sales forecasting model"""
+    return submit_training_job('sales', 'Sales forecasting model trained successfully')
 
 
 @app.route('/api/ml/sales/forecast', methods=['GET'])
@@ -699,7 +1344,13 @@ def forecast_sales():
         periods = request.args.get('periods', 90, type=int)
         periods = max(7, min(365, periods))
 
-        result = sales_model.forecast_revenue(periods=periods)
+        model = sales_model
+
+        def run_forecast():
+            with model_inference('sales', 'forecast'):
+                return model.forecast_revenue(periods=periods)
+
+        result, _ = single_flight.do(('sales_forecast', id(model), periods), run_forecast)
 
         if 'error' in result:
             return jsonify({
@@ -754,7 +1405,8 @@ def predict_monthly_revenue():
                 'error': 'month must be between 1 and 12'
             }), 400
 
-        result = sales_model.predict_monthly_revenue(month=month, year=year)
+        with model_inference('sales', 'predict_month'):
+            result = sales_model.predict_monthly_revenue(month=month, year=year)
 
         if 'error' in result:
             return jsonify({
@@ -775,6 +1427,7 @@ def predict_monthly_revenue():
 
 
 @app.route('/api/ml/sales/trends', methods=['GET'])
+@cached_response('sales', ('billing', 'billing_items', 'appointments'), {'months': (int, 12)})
 def get_sales_trends():
     """
     Get historical sales trends and seasonal patterns
@@ -813,6 +1466,7 @@ def get_sales_trends():
 
 
 @app.route('/api/ml/sales/top-services', methods=['GET'])
+@cached_response('sales', ('billing', 'billing_items'), {'limit': (int, 10)})
 def get_top_revenue_services():
     """
     Get top revenue-generating services and products
@@ -854,29 +1508,8 @@ def get_top_revenue_services():
 
 @app.route('/api/ml/inventory/train', methods=['POST'])
 def train_inventory_model():
-    """Train or retrain the inventory forecasting model"""
-    try:
-        from scripts.inventory_forecasting import InventoryForecastingModel
-
-        global inventory_model
-
-        print("\n🚀 Starting inventory forecasting model training...")
-        inventory_model = InventoryForecastingModel()
-        results = inventory_model.train()
-
-        print("✓ Inventory model training complete!")
-
-        return jsonify({
-            'success': True,
-            'message': 'Inventory forecasting model trained successfully',
-            'results': results
-        }), 200
-
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+    """Queue a background retrain of the inventory forecasting model"""
+    return submit_training_job('inventory', 'Inventory forecasting model trained successfully')
 
 
 @app.route('/api/ml/inventory/forecast', methods=['POST'])
@@ -913,7 +1546,8 @@ def forecast_inventory():
             }), 400
 
         days = max(7, min(365, int(data.get('days', 30))))
-        result = inventory_model.predict_item_demand(item_id=item_id, days=days)
+        with model_inference('inventory', 'forecast'):
+            result = inventory_model.predict_item_demand(item_id=item_id, days=days)
 
         if 'error' in result:
             return jsonify({
@@ -945,7 +1579,8 @@ def get_reorder_suggestions():
 
         days = request.args.get('days', 30, type=int)
         days = max(7, min(365, days))
-        result = inventory_model.get_reorder_recommendations(days=days)
+        with model_inference('inventory', 'reorder_suggestions'):
+            result = inventory_model.get_reorder_recommendations(days=days)
 
         if 'error' in result:
             return jsonify({
@@ -966,6 +1601,7 @@ def get_reorder_suggestions():
 
 
 @app.route('/api/ml/inventory/fast-moving', methods=['GET'])
+@cached_response('inventory', (), {'limit': (int, 10)})
 def get_fast_moving_items():
     """
     Get fast-moving and slow-moving inventory items
@@ -1004,6 +1640,7 @@ def get_fast_moving_items():
 
 
 @app.route('/api/ml/inventory/category-analysis', methods=['GET'])
+@cached_response('inventory', ())
 def get_category_demand_analysis():
     """Get demand analysis broken down by inventory category"""
     try:
@@ -1065,7 +1702,8 @@ def predict_restock_date():
                 'error': 'item_id is required'
             }), 400
 
-        result = inventory_model.predict_restock_date(item_id=item_id)
+        with model_inference('inventory', 'predict_restock'):
+            result = inventory_model.predict_restock_date(item_id=item_id)
 
         if 'error' in result:
             return jsonify({
@@ -1182,8 +1820,12 @@ def internal_error(error):
     }), 500
 
 
+startup.mark_app_imported(_IMPORT_STARTED)
+
+
 if __name__ == '__main__':
     port = app.config['PORT']
     print(f"Starting ML Service on port {port}...")
     print(f"Health check: http://localhost:{port}/api/ml/health")
+    print("Development server; for production run: gunicorn -c gunicorn.conf.py app:app")
     app.run(host='0.0.0.0', port=port, debug=app.config['DEBUG'])
@@ -1,5 +1,13 @@
 """Configuration package for ML services"""
 
-from .db_connection import DatabaseConnection, get_db_connection
+from .db_connection import (
+    DatabaseConnection, get_db_connection, get_raw_db_connection,
+    get_pool, get_pool_stats, pooled_connection
+)
+from .db_pool import ConnectionPool, PooledConnection, PoolTimeoutError
 
-__all__ = ['DatabaseConnection', 'get_db_connection']
+__all__ = [
+    'DatabaseConnection', 'get_db_connection', 'get_raw_db_connection',
+    'get_pool', 'get_pool_stats', 'pooled_connection',
+    'ConnectionPool', 'PooledConnection', 'PoolTimeoutError'
+]
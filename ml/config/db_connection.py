@@ -3,43 +3,96 @@ Database Connection Utility for ML Services
 Handles PostgreSQL connections for data extraction and model training
 """
 
-import psycopg2
-from psycopg2.extras import RealDictCursor
 import os
+import threading
+import uuid
+from contextlib import contextmanager
+
+from psycopg2.extras import RealDictCursor
 from dotenv import load_dotenv
 
+from .db_pool import ConnectionPool
+
 # Load environment variables
 load_dotenv()
 
+
+def get_connection_params():
+    """Build psycopg2 connection parameters from environment variables"""
+    params = {
+        'host': os.getenv('DB_HOST', 'localhost'),
+        'port': os.getenv('DB_PORT', '5432'),
+        'database': os.getenv('DB_NAME', 'vetcarepro'),
+        'user': os.getenv('DB_USER', 'postgres')
+    }
+
+    # Only include password if it's explicitly set
+    password = os.getenv('DB_PASSWORD', '')
+    if password:
+        params['password'] = password
+
+    return params
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Returns the process-wide ConnectionPool, creating it on first use"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    get_connection_params(),
+                    min_size=int(os.getenv('DB_POOL_MIN', 1)),
+                    max_size=int(os.getenv('DB_POOL_MAX', 10)),
+                    max_lifetime=int(os.getenv('DB_POOL_MAX_LIFETIME', 1800)),
+                    checkout_timeout=int(os.getenv('DB_POOL_TIMEOUT', 30)),
+                    statement_timeout_ms=int(os.getenv('DB_STATEMENT_TIMEOUT_MS', 60000))
+                )
+    return _pool
+
+
+def get_pool_stats():
+    """Returns usage statistics of the process-wide pool"""
+    return get_pool().get_stats()
+
+
+@contextmanager
+def pooled_connection(statement_timeout_ms=None):
+    """
+    Borrow a pooled connection for the duration of a with-block
+
+    Args:
+        statement_timeout_ms (int, optional): Override the pool's default statement timeout
+    """
+    conn = get_pool().acquire(statement_timeout_ms)
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
 class DatabaseConnection:
     """Manages database connections for ML data operations"""
     
     def __init__(self):
-        self.connection_params = {
-            'host': os.getenv('DB_HOST', 'localhost'),
-            'port': os.getenv('DB_PORT', '5432'),
-            'database': os.getenv('DB_NAME', 'vetcarepro'),
-            'user': os.getenv('DB_USER', 'postgres')
-        }
-        
-        # Only include password if it's explicitly set
-        password = os.getenv('DB_PASSWORD', '')
-        if password:
-            self.connection_params['password'] = password
-            
+        self.connection_params = get_connection_params()
         self.connection = None
     
     def connect(self):
-        """Establish database connection"""
+        """Borrow a connection from the process-wide pool"""
         try:
-            self.connection = psycopg2.connect(**self.connection_params)
+            self.connection = get_pool().acquire()
             return self.connection
         except Exception as e:
             print(f"Error connecting to database: {e}")
             raise
     
     def disconnect(self):
-        """Close database connection"""
+        """Return the connection to the pool"""
         if self.connection:
             self.connection.close()
             self.connection = None
@@ -76,6 +129,43 @@ class DatabaseConnection:
                 self.connection.rollback()
             raise
     
+    def stream_query(self, query, params=None, itersize=5000):
+        """
+        Execute a SQL query on a named server-side cursor and yield row batches
+
+        Args:
+            query (str): SQL query to execute
+            params (tuple): Query parameters
+            itersize (int): Rows fetched from the server per round trip
+
+        Yields:
+            tuple: (column_names, list of row tuples); the first batch is always
+            yielded, even when empty, so callers learn the column names
+        """
+        if not self.connection:
+            self.connect()
+
+        cursor = self.connection.cursor(name=f"ml_stream_{uuid.uuid4().hex[:12]}")
+        cursor.itersize = itersize
+        try:
+            cursor.execute(query, params)
+            rows = cursor.fetchmany(itersize)
+            columns = [d[0] for d in cursor.description]
+            yield columns, rows
+            while len(rows) == itersize:
+                rows = cursor.fetchmany(itersize)
+                if rows:
+                    yield columns, rows
+        except Exception as e:
+            print(f"Error streaming query: {e}")
+            raise
+        finally:
+            try:
+                cursor.close()
+                self.connection.rollback()
+            except Exception:
+                pass
+
     def __enter__(self):
         """Context manager entry"""
         self.connect()
@@ -92,9 +182,9 @@ def get_db_connection():
     return DatabaseConnection()
 
 
-# Convenience function that returns a raw psycopg2 connection
+# Convenience function that returns a pooled psycopg2 connection
 # Used by scripts that call conn.cursor() / conn.close() / conn.commit() directly
 def get_raw_db_connection():
-    """Returns a raw psycopg2 connection (supports .cursor(), .close(), .commit(), .rollback())"""
-    db = DatabaseConnection()
-    return db.connect()
+    """Returns a pooled psycopg2 connection (supports .cursor(), .close(), .commit(), .rollback());
+    .close() returns it to the pool"""
+    return get_pool().acquire()
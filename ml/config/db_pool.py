@@ -0,0 +1,295 @@
+"""
+Process-wide PostgreSQL Connection Pool for ML Services
+Shares psycopg2 connections across DataLoader, model scripts and Flask endpoints
+"""
+
+import os
+import threading
+import time
+
+import psycopg2
+
+# Connections a forked child inherited from its parent. They are kept referenced
+# and never closed here: closing (or garbage-collecting) one would send the
+# server a terminate message on the parent's socket and end the parent's session.
+_inherited_connections = []
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no pooled connection becomes available in time"""
+
+
+class PooledConnection:
+    """
+    Thin proxy around a psycopg2 connection borrowed from the pool.
+
+    Behaves like a raw connection (.cursor(), .commit(), .rollback(), ...),
+    but .close() hands the connection back to the pool instead of closing it.
+    """
+
+    _pool = None
+    _conn = None
+
+    def __init__(self, pool, conn):
+        self._pool = pool
+        self._conn = conn
+
+    def close(self):
+        """Return the connection to the pool"""
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            self._pool.release(conn)
+
+    @property
+    def closed(self):
+        return self._conn is None or self._conn.closed
+
+    def __getattr__(self, name):
+        if self._conn is None:
+            raise psycopg2.InterfaceError("connection already returned to pool")
+        return getattr(self._conn, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __del__(self):
+        # Safety net for callers that forget close() on an error path
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class ConnectionPool:
+    """
+    Thread-safe connection pool with health check on checkout, max connection
+    lifetime, per-checkout statement timeout and usage statistics.
+    """
+
+    def __init__(self, connection_params, min_size=1, max_size=10,
+                 max_lifetime=1800, checkout_timeout=30, statement_timeout_ms=60000):
+        """
+        Args:
+            connection_params (dict): Keyword arguments for psycopg2.connect
+            min_size (int): Connections kept open while idle
+            max_size (int): Upper bound on open connections
+            max_lifetime (int): Seconds before a connection is recycled
+            checkout_timeout (int): Seconds to wait for a free connection
+            statement_timeout_ms (int): Default statement_timeout per checkout (0 = none)
+        """
+        self.connection_params = connection_params
+        self.min_size = max(0, min_size)
+        self.max_size = max(1, max_size, self.min_size)
+        self.max_lifetime = max_lifetime
+        self.checkout_timeout = checkout_timeout
+        self.statement_timeout_ms = statement_timeout_ms
+
+        self._lock = threading.Condition()
+        self._idle = []          # idle raw connections, most recently used last
+        self._created_at = {}    # id(conn) -> monotonic creation time
+        self._in_use = 0
+        self._closed = False
+        self._pid = os.getpid()
+
+        self._stats = {
+            'checkouts': 0,
+            'waits': 0,
+            'wait_time_total': 0.0,
+            'wait_time_max': 0.0,
+            'timeouts': 0,
+            'connections_created': 0,
+            'connections_recycled': 0,
+            'connections_discarded': 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+
+    def _check_fork(self):
+        """Drop inherited connections after a fork (never share sockets across processes)"""
+        if os.getpid() != self._pid:
+            _inherited_connections.extend(self._idle)
+            self._idle = []
+            self._created_at = {}
+            self._in_use = 0
+            self._pid = os.getpid()
+
+    def _open(self):
+        conn = psycopg2.connect(**self.connection_params)
+        with self._lock:
+            self._created_at[id(conn)] = time.monotonic()
+            self._stats['connections_created'] += 1
+        return conn
+
+    def _discard(self, conn):
+        self._created_at.pop(id(conn), None)
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _expired(self, conn):
+        created = self._created_at.get(id(conn), 0)
+        return self.max_lifetime and (time.monotonic() - created) > self.max_lifetime
+
+    def _prepare(self, conn, statement_timeout_ms):
+        """
+        Health check + statement timeout in one round trip.
+        Raises if the connection is dead.
+        """
+        conn.autocommit = True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SET statement_timeout = %s", (int(statement_timeout_ms),))
+        finally:
+            conn.autocommit = False
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def acquire(self, statement_timeout_ms=None):
+        """
+        Borrow a connection from the pool.
+
+        Args:
+            statement_timeout_ms (int, optional): Override the default statement timeout
+
+        Returns:
+            PooledConnection: Connection proxy; call .close() to return it
+        """
+        timeout_ms = self.statement_timeout_ms if statement_timeout_ms is None else statement_timeout_ms
+        deadline = time.monotonic() + self.checkout_timeout
+        waited = None
+
+        with self._lock:
+            self._check_fork()
+            if self._closed:
+                raise psycopg2.InterfaceError("connection pool is closed")
+            while True:
+                conn = None
+                while self._idle:
+                    candidate = self._idle.pop()
+                    if candidate.closed or self._expired(candidate):
+                        self._stats['connections_recycled'] += 1
+                        self._discard(candidate)
+                        continue
+                    conn = candidate
+                    break
+
+                if conn is not None or self._in_use + len(self._idle) < self.max_size:
+                    self._in_use += 1
+                    break
+
+                if waited is None:
+                    waited = time.monotonic()
+                    self._stats['waits'] += 1
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats['timeouts'] += 1
+                    raise PoolTimeoutError(
+                        f"No database connection available after {self.checkout_timeout}s "
+                        f"(pool max_size={self.max_size})"
+                    )
+                self._lock.wait(remaining)
+
+            if waited is not None:
+                wait_time = time.monotonic() - waited
+                self._stats['wait_time_total'] += wait_time
+                self._stats['wait_time_max'] = max(self._stats['wait_time_max'], wait_time)
+            self._stats['checkouts'] += 1
+
+        # Network I/O happens outside the lock
+        try:
+            if conn is not None:
+                try:
+                    self._prepare(conn, timeout_ms)
+                except psycopg2.Error:
+                    with self._lock:
+                        self._stats['connections_discarded'] += 1
+                        self._discard(conn)
+                    conn = None
+            if conn is None:
+                conn = self._open()
+                self._prepare(conn, timeout_ms)
+        except Exception:
+            with self._lock:
+                self._in_use -= 1
+                self._lock.notify()
+            raise
+
+        return PooledConnection(self, conn)
+
+    def release(self, conn):
+        """Return a raw connection to the pool (called by PooledConnection.close)"""
+        with self._lock:
+            self._check_fork()
+            if id(conn) not in self._created_at:
+                # Borrowed before a fork: the socket belongs to the parent
+                _inherited_connections.append(conn)
+                return
+            self._in_use = max(0, self._in_use - 1)
+            try:
+                if self._closed or conn.closed:
+                    self._stats['connections_discarded'] += 1
+                    self._discard(conn)
+                elif self._expired(conn):
+                    self._stats['connections_recycled'] += 1
+                    self._discard(conn)
+                else:
+                    if conn.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                        conn.rollback()
+                    self._idle.append(conn)
+            except Exception:
+                self._stats['connections_discarded'] += 1
+                self._discard(conn)
+            self._lock.notify()
+
+    def warm_up(self):
+        """Open connections until min_size idle connections exist"""
+        with self._lock:
+            self._check_fork()
+            if self._closed:
+                return
+            while len(self._idle) + self._in_use < self.min_size:
+                self._idle.append(self._open())
+
+    def close_all(self):
+        """
+        Close every idle connection and stop lending new ones; connections still
+        in use are closed when they are released
+        """
+        with self._lock:
+            self._check_fork()
+            self._closed = True
+            for conn in self._idle:
+                self._discard(conn)
+            self._idle = []
+
+    def get_stats(self):
+        """
+        Get pool usage statistics
+
+        Returns:
+            dict: Sizing, in-use counts, waits and wait times
+        """
+        with self._lock:
+            self._check_fork()
+            stats = dict(self._stats)
+            stats.update({
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+                'in_use': self._in_use,
+                'idle': len(self._idle),
+                'open_connections': self._in_use + len(self._idle),
+                'max_lifetime_seconds': self.max_lifetime,
+                'statement_timeout_ms': self.statement_timeout_ms,
+                'wait_time_total': round(stats['wait_time_total'], 4),
+                'wait_time_max': round(stats['wait_time_max'], 4),
+                'wait_time_avg': round(stats['wait_time_total'] / stats['waits'], 4) if stats['waits'] else 0.0,
+            })
+            return stats
@@ -0,0 +1,99 @@
+"""
+Gunicorn Configuration for the ML Service
+Production entrypoint: gunicorn -c gunicorn.conf.py app:app
+"""
+
+import gc
+import os
+import shutil
+import tempfile
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Cap native thread pools per worker. Must be set before numpy/sklearn load,
+# otherwise every worker starts one BLAS/OpenMP thread per core.
+NATIVE_THREADS = os.getenv('ML_NATIVE_THREADS', '1')
+for var in ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS',
+            'NUMEXPR_NUM_THREADS', 'VECLIB_MAXIMUM_THREADS', 'LOKY_MAX_CPU_COUNT'):
+    os.environ.setdefault(var, NATIVE_THREADS)
+
+workers = int(os.getenv('ML_WORKERS', 2))
+
+# Every worker has its own Prophet pool; split the cores between them so
+# PROPHET_WORKERS x workers never exceeds the machine
+CPU_COUNT = os.cpu_count() or 1
+PROPHET_OVERSUBSCRIBED = False
+if os.getenv('PROPHET_WORKERS'):
+    PROPHET_OVERSUBSCRIBED = int(os.environ['PROPHET_WORKERS']) * workers > CPU_COUNT
+else:
+    os.environ['PROPHET_WORKERS'] = str(max(1, min(4, CPU_COUNT // max(1, workers))))
+
+# Load models in the master before forking so workers share them copy-on-write,
+# and start the reload watcher per worker (threads do not survive fork). Forced:
+# a background load still running at fork time would never finish in the workers
+os.environ['ML_BACKGROUND_MODEL_LOAD'] = 'false'
+os.environ['ML_MODEL_WATCHER_AUTOSTART'] = 'false'
+# Job status polls can land on any worker; share job snapshots through a directory
+if not os.getenv('TRAINING_JOB_DIR'):
+    os.environ['TRAINING_JOB_DIR'] = os.path.join(tempfile.gettempdir(), 'vetcarepro-ml-jobs')
+# /metrics aggregates every worker from per-process files in this directory.
+# It must be set before prometheus_client is imported, and is emptied on each
+# start so counters from a previous run are not summed in
+if not os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+    os.environ['PROMETHEUS_MULTIPROC_DIR'] = os.path.join(tempfile.gettempdir(), 'vetcarepro-ml-metrics')
+shutil.rmtree(os.environ['PROMETHEUS_MULTIPROC_DIR'], ignore_errors=True)
+os.makedirs(os.environ['PROMETHEUS_MULTIPROC_DIR'], exist_ok=True)
+
+bind = f"0.0.0.0:{os.getenv('FLASK_PORT', 5001)}"
+threads = int(os.getenv('ML_THREADS', 4))
+worker_class = 'gthread'
+preload_app = True
+timeout = int(os.getenv('ML_WORKER_TIMEOUT', 120))
+graceful_timeout = int(os.getenv('ML_GRACEFUL_TIMEOUT', 30))
+keepalive = 5
+accesslog = os.getenv('ML_ACCESS_LOG', '-') or None
+errorlog = '-'
+
+
+def when_ready(server):
+    # Models are loaded; move them out of the GC's reach so collections in the
+    # workers don't touch (and un-share) the preloaded pages
+    gc.freeze()
+    # The master serves no requests; each worker starts its own case store refresh thread
+    from utils.case_store import get_case_store
+    get_case_store().stop()
+    server.log.info(f"ML service ready: {workers} workers x {threads} threads, "
+                    f"{NATIVE_THREADS} native thread(s) and {os.environ['PROPHET_WORKERS']} "
+                    f"Prophet process(es) per worker")
+    if PROPHET_OVERSUBSCRIBED:
+        server.log.warning(f"PROPHET_WORKERS={os.environ['PROPHET_WORKERS']} x {workers} workers "
+                           f"exceeds {CPU_COUNT} CPU cores; unset it to size the pools automatically")
+
+
+def post_fork(server, worker):
+    import app
+    app.model_watcher.start(wait_for=app.startup)
+
+
+def worker_exit(server, worker):
+    """Let in-process pools finish and close DB connections before the worker exits"""
+    import app
+    from utils.prophet_pool import get_prophet_pool
+    from config.db_connection import get_pool
+
+    app.model_watcher.stop()
+    # Don't wait for a training run (it can outlast graceful_timeout); its job is recorded as interrupted
+    app.training_jobs.shutdown(wait=False, cancel_futures=True)
+    get_prophet_pool().shutdown()
+    get_pool().close_all()
+
+
+def child_exit(server, worker):
+    """Drop a dead worker's live gauges (in-flight requests) from /metrics"""
+    try:
+        from prometheus_client import multiprocess
+    except ImportError:
+        return
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,4 @@
+"""
+Benchmarks Package
+Contains standalone scripts for measuring ML service performance
+"""
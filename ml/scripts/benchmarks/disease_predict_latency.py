@@ -0,0 +1,102 @@
+"""
+Disease Classification Latency Benchmark
+Purpose: Compare single-case model time of the pandas path (predict_batch) and
+         the dict fast path (predict_one), and check they return the same
+         predictions.
+
+Usage:
+    python scripts/benchmarks/disease_predict_latency.py
+    python scripts/benchmarks/disease_predict_latency.py --cases 2000 --repeat 5000
+
+Trains on a synthetic disease_cases-shaped frame (no database needed); the
+model file goes to a temporary MODEL_PATH. Timings are model time only, with
+no HTTP or JSON encoding.
+"""
+
+import sys
+import os
+import io
+import time
+import argparse
+import tempfile
+import contextlib
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+SPECIES = ['Dog', 'Cat', 'Rabbit', 'Bird']
+BREEDS = ['Labrador', 'Persian', 'Beagle', 'Siamese', 'Mixed', 'Poodle', 'Holland Lop', 'Budgie']
+SEVERITIES = ['mild', 'moderate', 'severe', 'critical']
+CATEGORIES = ['infectious', 'parasitic', 'respiratory', 'digestive', 'skin', 'chronic']
+
+
+def synthetic_cases(n, seed=42):
+    """Random cases with the columns DiseasePredictionModel.train reads"""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'case_id': np.arange(1, n + 1),
+        'species': rng.choice(SPECIES, n),
+        'breed': rng.choice(BREEDS, n),
+        'age_at_diagnosis': rng.integers(1, 180, n),
+        'severity': rng.choice(SEVERITIES, n),
+        'treatment_duration_days': rng.integers(1, 60, n),
+        'is_contagious': rng.random(n) < 0.4,
+        'disease_category': rng.choice(CATEGORIES, n),
+        'disease_name': 'synthetic',
+    })
+
+
+def percentiles(samples):
+    samples = np.asarray(samples) * 1e6
+    return {p: round(float(np.percentile(samples, p)), 1) for p in (50, 90, 99)}
+
+
+def bench(fn, cases, repeat):
+    samples = []
+    for i in range(repeat):
+        case = cases[i % len(cases)]
+        start = time.perf_counter()
+        fn(case)
+        samples.append(time.perf_counter() - start)
+    return percentiles(samples)
+
+
+def run(n_cases, repeat):
+    os.environ['MODEL_PATH'] = tempfile.mkdtemp(prefix='disease_bench_')
+    from scripts.disease_prediction import DiseasePredictionModel
+
+    model = DiseasePredictionModel()
+    with contextlib.redirect_stdout(io.StringIO()):
+        model.train(synthetic_cases(n_cases))
+
+    probes = synthetic_cases(500, seed=7).drop(columns=['case_id', 'disease_category', 'disease_name'])
+    probes = probes.astype(object).to_dict('records')
+
+    mismatches = 0
+    for case in probes:
+        slow = model.predict_batch(case)['predictions'][0]
+        fast = model.predict_one(case)
+        if slow != fast:
+            mismatches += 1
+
+    pandas_path = bench(lambda case: model.predict_batch(case), probes, repeat)
+    fast_path = bench(model.predict_one, probes, repeat)
+
+    n_trees = len(model.classification_model.estimators_)
+    print(f"\nDisease classification latency ({n_cases} training cases, {n_trees} trees, {repeat} calls)")
+    print(f"   {'path':<22} {'p50 µs':>10} {'p90 µs':>10} {'p99 µs':>10}")
+    for name, result in (('predict_batch (pandas)', pandas_path), ('predict_one (dict)', fast_path)):
+        print(f"   {name:<22} {result[50]:>10} {result[90]:>10} {result[99]:>10}")
+    print(f"   Speedup at p50: {pandas_path[50] / fast_path[50]:.1f}x")
+    print(f"   Prediction mismatches: {mismatches}/{len(probes)}")
+    return mismatches == 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark single-case disease classification latency')
+    parser.add_argument('--cases', type=int, default=1000, help='Synthetic training cases')
+    parser.add_argument('--repeat', type=int, default=2000, help='Timed calls per path')
+    args = parser.parse_args()
+    sys.exit(0 if run(args.cases, args.repeat) else 1)
@@ -0,0 +1,173 @@
+"""
+Fetch Engine Benchmark
+Purpose: Compare rows/sec and peak RSS of the RealDictCursor path, the streaming
+         server-side cursor and the COPY ... TO STDOUT engine on a synthetic
+         disease_cases-shaped table.
+
+Usage:
+    python scripts/benchmarks/fetch_engines.py
+    python scripts/benchmarks/fetch_engines.py --sizes 10000 1000000 10000000 --keep
+
+Each measurement runs in a fresh process so peak RSS is not polluted by
+earlier runs. The synthetic table is UNLOGGED and dropped afterwards unless
+--keep is given.
+"""
+
+import sys
+import os
+import time
+import argparse
+import resource
+import multiprocessing as mp
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+BENCH_TABLE = 'ml_bench_disease_cases'
+ENGINES = ['realdict', 'stream', 'copy']
+
+BENCH_DTYPES = {
+    'case_id': 'int64', 'age_at_diagnosis': 'float64', 'is_contagious': 'boolean',
+    'diagnosis_date': 'datetime64[ns]', 'treatment_duration_days': 'float64'
+}
+
+
+def _peak_rss_mb():
+    """Peak resident set size of the current process in MB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KB on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def create_bench_table(rows):
+    """Create (or extend) the synthetic table so it holds at least `rows` rows"""
+    from config.db_connection import pooled_connection
+
+    with pooled_connection(statement_timeout_ms=0) as conn:
+        cur = conn.cursor()
+        cur.execute(f"""
+            CREATE UNLOGGED TABLE IF NOT EXISTS {BENCH_TABLE} (
+                case_id                 INTEGER PRIMARY KEY,
+                species                 VARCHAR(50),
+                breed                   VARCHAR(50),
+                age_at_diagnosis        INTEGER,
+                disease_name            VARCHAR(100),
+                disease_category        VARCHAR(50),
+                severity                VARCHAR(20),
+                is_contagious           BOOLEAN,
+                diagnosis_date          DATE,
+                treatment_duration_days INTEGER,
+                symptoms                TEXT,
+                region                  VARCHAR(50)
+            )
+        """)
+        cur.execute(f"SELECT COALESCE(MAX(case_id), 0) FROM {BENCH_TABLE}")
+        existing = cur.fetchone()[0]
+        if existing < rows:
+            cur.execute(f"""
+                INSERT INTO {BENCH_TABLE}
+                SELECT
+                    g,
+                    (ARRAY['Dog','Cat','Rabbit','Bird'])[1 + g % 4],
+                    'Breed ' || (g % 40),
+                    g % 180,
+                    'Disease ' || (g % 60),
+                    (ARRAY['infectious','parasitic','metabolic','genetic',
+                           'immune_mediated','neoplastic','traumatic','nutritional'])[1 + g % 8],
+                    (ARRAY['mild','moderate','severe','critical'])[1 + g % 4],
+                    g % 3 = 0,
+                    DATE '2015-01-01' + (g % 3650),
+                    g % 30,
+                    'fever, lethargy, reduced appetite',
+                    'Region ' || (g % 12)
+                FROM generate_series(%s, %s) AS g
+            """, (existing + 1, rows))
+        conn.commit()
+        cur.close()
+
+
+def drop_bench_table():
+    from config.db_connection import pooled_connection
+
+    with pooled_connection() as conn:
+        cur = conn.cursor()
+        cur.execute(f"DROP TABLE IF EXISTS {BENCH_TABLE}")
+        conn.commit()
+        cur.close()
+
+
+def _run_engine(engine, rows, queue):
+    """Child process: fetch `rows` rows with one engine and report timing and RSS"""
+    import pandas as pd
+    from config.db_connection import get_db_connection
+    from utils.copy_fetch import copy_frame
+    from utils.frame_stream import FrameStream, apply_dtypes
+
+    query = f"SELECT * FROM {BENCH_TABLE} WHERE case_id <= %s ORDER BY case_id"
+    baseline = _peak_rss_mb()
+    start = time.perf_counter()
+
+    if engine == 'realdict':
+        with get_db_connection() as db:
+            df = pd.DataFrame(db.execute_query(query, (rows,)))
+        apply_dtypes(df, BENCH_DTYPES)
+    elif engine == 'stream':
+        df = FrameStream(query, (rows,), itersize=10000, dtypes=BENCH_DTYPES).to_frame()
+    else:
+        db = get_db_connection()
+        with db:
+            with db.connection.cursor() as cursor:
+                df = copy_frame(cursor, query, (rows,), BENCH_DTYPES)
+
+    elapsed = time.perf_counter() - start
+    queue.put({
+        'engine': engine,
+        'rows': len(df),
+        'seconds': elapsed,
+        'rows_per_sec': len(df) / elapsed if elapsed > 0 else 0.0,
+        'peak_rss_mb': _peak_rss_mb(),
+        'delta_rss_mb': _peak_rss_mb() - baseline,
+    })
+
+
+def run_benchmark(sizes, engines):
+    ctx = mp.get_context('spawn')
+    results = []
+    for rows in sizes:
+        for engine in engines:
+            queue = ctx.Queue()
+            proc = ctx.Process(target=_run_engine, args=(engine, rows, queue))
+            proc.start()
+            proc.join()
+            if proc.exitcode != 0:
+                print(f"   ⚠ {engine} failed at {rows:,} rows (exit code {proc.exitcode})")
+                continue
+            result = queue.get()
+            results.append(result)
+            print(f"   {rows:>12,} rows  {engine:<9} {result['seconds']:>8.2f}s  "
+                  f"{result['rows_per_sec']:>12,.0f} rows/s  "
+                  f"peak RSS {result['peak_rss_mb']:>8.1f} MB (+{result['delta_rss_mb']:.1f} MB)")
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark DataLoader fetch engines')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 1_000_000, 10_000_000])
+    parser.add_argument('--engines', nargs='+', choices=ENGINES, default=ENGINES)
+    parser.add_argument('--keep', action='store_true', help='Keep the synthetic table after the run')
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("  Fetch Engine Benchmark")
+    print("=" * 70)
+
+    print(f"\n📊 Preparing {BENCH_TABLE} with {max(args.sizes):,} rows...")
+    create_bench_table(max(args.sizes))
+
+    try:
+        print("\n⏱  Running...")
+        run_benchmark(sorted(args.sizes), args.engines)
+    finally:
+        if not args.keep:
+            drop_bench_table()
+
+    print("\nDone.")
@@ -0,0 +1,137 @@
+"""
+Model Load Memory Benchmark
+Purpose: Load the same model in N concurrent worker processes from a legacy
+         joblib pickle and from a memory-mapped artifact, and report resident
+         memory (RSS, PSS, shared) per worker after the load.
+
+Usage:
+    python scripts/benchmarks/model_memory.py
+    python scripts/benchmarks/model_memory.py --workers 4 --cases 20000
+    python scripts/benchmarks/model_memory.py --model-file models/sales_forecasting_20250101.pkl
+
+Without --model-file a disease model is trained on synthetic cases; set
+DISEASE_PREDICTION_GRID=true to include the prediction grid. Disease models
+are restored with their fast-path tables as the app does, from a legacy pickle
+(tables built per worker) and from an artifact (tables memory-mapped). PSS
+divides shared pages between the workers mapping them, so the PSS total is
+their combined footprint. scikit-learn copies tree node arrays into its own
+buffers when a tree is unpickled, so the estimators themselves are private to
+each worker in both formats.
+"""
+
+import sys
+import os
+import io
+import time
+import argparse
+import tempfile
+import contextlib
+import multiprocessing as mp
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+
+def restore(model_data):
+    """Rebuild a disease model's serving tables as app.load_disease_model does"""
+    components = model_data.get('model', model_data)
+    if not isinstance(components, dict) or 'classification_model' not in components:
+        return model_data
+    from scripts.disease_prediction import DiseasePredictionModel
+    model = DiseasePredictionModel()
+    model.model = components
+    model.classification_model = components['classification_model']
+    model.label_encoders = components.get('label_encoders', {})
+    model.scaler = components.get('scaler')
+    model.prepare_fast_path()
+    return model
+
+
+def load_and_report(path, loader, ready, release):
+    """Worker: load the model, report memory, then hold it until every worker has reported"""
+    from utils.model_artifacts import load_artifact
+    from utils.process_memory import memory_usage
+    import joblib
+    import sklearn.ensemble, sklearn.cluster, pandas  # noqa: F401 - keep import cost out of the numbers
+    import scripts.disease_prediction  # noqa: F401
+
+    before = memory_usage()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        model = restore(joblib.load(path) if loader == 'joblib' else load_artifact(path))
+    seconds = time.perf_counter() - start
+    ready.put({'seconds': seconds, 'before': before})
+    release.wait()
+    ready.put(memory_usage())
+    del model
+
+
+def measure(path, loader, workers):
+    ctx = mp.get_context('spawn')
+    ready, release = ctx.Queue(), ctx.Event()
+    procs = [ctx.Process(target=load_and_report, args=(path, loader, ready, release)) for _ in range(workers)]
+    for p in procs:
+        p.start()
+    loads = [ready.get() for _ in procs]
+    # Every worker holds its model now, so PSS splits shared pages across all of them
+    release.set()
+    after = [ready.get() for _ in procs]
+    for p in procs:
+        p.join()
+    before = sum(l['before']['rss_mb'] for l in loads) / workers
+    return [dict(after[i], seconds=loads[i]['seconds'], rss_before=before) for i in range(workers)]
+
+
+def summarize(name, results):
+    n = len(results)
+    added = sum(r['rss_mb'] for r in results) / n - results[0]['rss_before']
+    pss = [r['pss_mb'] for r in results if r['pss_mb'] is not None]
+    shared = [r['shared_mb'] for r in results if r['shared_mb'] is not None]
+    load = sorted(r['seconds'] for r in results)
+    print(f"   {name:<10} {added:>12.1f} {sum(shared) / max(1, len(shared)):>10.1f} "
+          f"{sum(pss) / max(1, len(pss)):>9.1f} {sum(pss):>10.1f} {load[n // 2] * 1000:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare per-worker memory of joblib vs memory-mapped model loads')
+    parser.add_argument('--workers', type=int, default=4, help='Concurrent loading processes')
+    parser.add_argument('--cases', type=int, default=20000, help='Synthetic training cases (without --model-file)')
+    parser.add_argument('--model-file', default=None, help='Existing model file to convert and load')
+    args = parser.parse_args()
+
+    import joblib
+    from utils.model_artifacts import save_artifact, load_artifact
+
+    workdir = tempfile.mkdtemp(prefix='model_memory_')
+    if args.model_file:
+        model_data = load_artifact(args.model_file, mmap_mode='none')
+    else:
+        sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+        from disease_predict_latency import synthetic_cases
+        os.environ['MODEL_PATH'] = workdir
+        from scripts.disease_prediction import DiseasePredictionModel
+        model = DiseasePredictionModel()
+        with contextlib.redirect_stdout(io.StringIO()):
+            model.train(synthetic_cases(args.cases))
+        model_data = {'model': model.model}
+        print(f"Trained on {args.cases} synthetic cases")
+
+    legacy = os.path.join(workdir, 'legacy.pkl')
+    artifact = os.path.join(workdir, 'artifact.pkl')
+    # The legacy pickle is what save_model wrote before: no flattened forest or grid
+    components = model_data.get('model')
+    legacy_data = dict(model_data)
+    if isinstance(components, dict):
+        legacy_data['model'] = {k: v for k, v in components.items() if k not in ('forest_arrays', 'prediction_grid')}
+    joblib.dump(legacy_data, legacy)
+    stored = save_artifact(model_data, artifact)
+
+    print(f"\nModel load memory, {args.workers} concurrent workers "
+          f"(artifact: {stored['arrays']} arrays, {stored['array_bytes'] / 1e6:.1f} MB memory-mapped; "
+          f"pickle {os.path.getsize(legacy) / 1e6:.1f} MB)")
+    print(f"   {'format':<10} {'+RSS MB/w':>12} {'shared MB':>10} {'PSS MB/w':>9} {'PSS total':>10} {'load ms':>9}")
+    summarize('joblib', measure(legacy, 'joblib', args.workers))
+    summarize('mmap', measure(artifact, 'mmap', args.workers))
+
+
+if __name__ == '__main__':
+    main()
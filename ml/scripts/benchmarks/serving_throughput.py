@@ -0,0 +1,142 @@
+"""
+Serving Throughput Load Test
+Purpose: Start the service under gunicorn with 1, 2, 4... workers and measure
+         requests per second and latency against one endpoint, to show how
+         throughput scales with the worker count.
+
+Usage:
+    python scripts/benchmarks/serving_throughput.py
+    python scripts/benchmarks/serving_throughput.py --workers 1 2 4 8 --clients 16 --duration 20
+    python scripts/benchmarks/serving_throughput.py --path /api/ml/health --method GET
+
+The default target is POST /api/ml/disease/predict, so a trained disease model
+must be in models/. Clients run in separate processes (keep-alive HTTP/1.1)
+so the load generator itself is not GIL-bound; on a machine with few cores
+the client processes compete with the workers, so expect scaling to flatten
+at roughly the core count.
+"""
+
+import sys
+import os
+import json
+import time
+import signal
+import argparse
+import subprocess
+import http.client
+import multiprocessing as mp
+
+import numpy as np
+
+ML_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DEFAULT_BODY = {
+    'species': 'Dog',
+    'breed': 'Labrador',
+    'age_at_diagnosis': 36,
+    'severity': 'moderate',
+    'is_contagious': False,
+}
+
+
+def client(port, method, path, body, duration, results):
+    """Send requests back to back on one keep-alive connection for duration seconds"""
+    payload = json.dumps(body) if body is not None else None
+    headers = {'Content-Type': 'application/json'} if payload else {}
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    latencies, errors = [], 0
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            conn.request(method, path, body=payload, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                errors += 1
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            conn.close()
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+            continue
+        latencies.append(time.perf_counter() - start)
+    conn.close()
+    results.put((latencies, errors))
+
+
+def wait_ready(port, timeout=120):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=2)
+            conn.request('GET', '/api/ml/ready')
+            if conn.getresponse().status == 200:
+                return True
+        except OSError:
+            pass
+        time.sleep(0.2)
+    return False
+
+
+def run_level(workers, threads, clients, duration, port, method, path, body):
+    env = dict(os.environ, ML_WORKERS=str(workers), ML_THREADS=str(threads),
+               FLASK_PORT=str(port), ML_ACCESS_LOG='', FLASK_DEBUG='False')
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'app:app'],
+        cwd=ML_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        if not wait_ready(port):
+            raise RuntimeError(f'Service did not become ready on port {port}')
+
+        ctx = mp.get_context('spawn')
+        results = ctx.Queue()
+        procs = [ctx.Process(target=client, args=(port, method, path, body, duration, results))
+                 for _ in range(clients)]
+        for p in procs:
+            p.start()
+        latencies, errors = [], 0
+        for _ in procs:
+            lat, err = results.get()
+            latencies.extend(lat)
+            errors += err
+        for p in procs:
+            p.join()
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=60)
+
+    latencies = np.asarray(latencies) * 1000
+    return {
+        'workers': workers,
+        'requests': len(latencies),
+        'errors': errors,
+        'rps': round(len(latencies) / duration, 1),
+        'p50_ms': round(float(np.percentile(latencies, 50)), 2) if len(latencies) else None,
+        'p99_ms': round(float(np.percentile(latencies, 99)), 2) if len(latencies) else None,
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Measure ML service throughput by gunicorn worker count')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4], help='Worker counts to test')
+    parser.add_argument('--threads', type=int, default=4, help='Threads per worker')
+    parser.add_argument('--clients', type=int, default=8, help='Concurrent client processes')
+    parser.add_argument('--duration', type=float, default=10, help='Seconds per worker count')
+    parser.add_argument('--port', type=int, default=5099)
+    parser.add_argument('--method', default='POST')
+    parser.add_argument('--path', default='/api/ml/disease/predict')
+    args = parser.parse_args()
+
+    body = DEFAULT_BODY if args.method == 'POST' else None
+    print(f"\n{args.method} {args.path}: {args.clients} clients, {args.threads} threads/worker, "
+          f"{args.duration}s per level, {os.cpu_count()} CPUs")
+    print(f"   {'workers':>7} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7} {'scaling':>8}")
+    baseline = None
+    for workers in args.workers:
+        result = run_level(workers, args.threads, args.clients, args.duration,
+                           args.port, args.method, args.path, body)
+        baseline = baseline or result['rps']
+        scaling = f"{result['rps'] / baseline:.2f}x" if baseline else '-'
+        print(f"   {workers:>7} {result['rps']:>9} {result['p50_ms']:>8} {result['p99_ms']:>8} "
+              f"{result['errors']:>7} {scaling:>8}")
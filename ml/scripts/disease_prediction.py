@@ -15,6 +15,7 @@ Algorithms used (optimized for small datasets):
 import sys
 import os
 import pickle
+import time
 import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
@@ -32,7 +33,13 @@ sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 from utils.model_base import BaseMLModel
 from utils.data_loader import DataLoader
-from config.db_connection import get_raw_db_connection as get_db_connection
+from utils.case_store import get_case_store
+from utils.outbreak_index import get_outbreak_index
+from utils.forecast_cache import get_forecast_cache, frame_fingerprint
+from utils.prophet_pool import get_prophet_pool
+from utils.prediction_cache import PredictionCache
+from utils.metrics import observe_prophet
+from config.db_connection import pooled_connection
 
 class DiseasePredictionModel(BaseMLModel):
     """
@@ -47,10 +54,31 @@ class DiseasePredictionModel(BaseMLModel):
     
     # Risk levels
     RISK_LEVELS = ['low', 'medium', 'high', 'critical']
+    # Minimum score per level — critical requires a genuine multi-factor outbreak signal
+    RISK_LEVEL_THRESHOLDS = [(8, 'critical'), (5, 'high'), (3, 'medium')]
     
     # Contagious disease multiplier for outbreak risk
     CONTAGIOUS_MULTIPLIER = 2.5
     
+    # Columns each analysis reads from the case store
+    FEATURE_COLUMNS = [
+        'case_id', 'species', 'breed', 'age_at_diagnosis', 'severity',
+        'treatment_duration_days', 'is_contagious', 'disease_category', 'disease_name'
+    ]
+    TREND_COLUMNS = [
+        'species', 'disease_category', 'disease_name', 'is_contagious',
+        'age_at_diagnosis', 'severity', 'diagnosis_date'
+    ]
+    GEOGRAPHIC_COLUMNS = ['region', 'disease_category', 'is_contagious', 'species']
+    
+    # Classifier inputs, in feature-vector order after the categorical codes
+    CATEGORICAL_FEATURES = ['species', 'severity', 'breed']
+    NUMERIC_FEATURES = ['age_at_diagnosis', 'treatment_duration_days']
+    
+    # Prediction grid ranges; ages/durations past the end fall in the last bucket
+    GRID_AGE_MAX_MONTHS = 240
+    GRID_TREATMENT_MAX_DAYS = 84
+    
     def __init__(self, model_name='disease_prediction'):
         """Initialize disease prediction model"""
         super().__init__(model_name)
@@ -61,6 +89,9 @@ class DiseasePredictionModel(BaseMLModel):
         self.scaler = StandardScaler()
         
         self.data_loader = DataLoader()
+        # Serving-path reads come from the shared in-memory snapshot
+        self.case_store = get_case_store()
+        self.outbreak_index = get_outbreak_index()
         
         # Store training metadata
         self.training_date = None
@@ -68,6 +99,17 @@ class DiseasePredictionModel(BaseMLModel):
         self.species_distribution = {}
         self.category_distribution = {}
         
+        # Decoded class labels in predict_proba column order, per fitted classifier
+        self._class_label_array = None
+        self._labels_model = None
+        # Pandas-free single-case inference tables (see prepare_fast_path)
+        self._fast_path = None
+        # Memoized single-case predictions and the optional precomputed grid
+        self.prediction_cache = PredictionCache()
+        self.grid_enabled = os.getenv('DISEASE_PREDICTION_GRID', 'false').lower() == 'true'
+        self._prediction_grid = None
+        self._grid_lookups = 0
+        
     def get_model_confidence(self):
         """
         Calculate model confidence based on data size
@@ -119,20 +161,19 @@ class DiseasePredictionModel(BaseMLModel):
         feature_names = []
 
         # Encode categorical variables (disease_category is the target, not a feature)
-        for col in ['species', 'severity', 'breed']:
+        for col in self.CATEGORICAL_FEATURES:
             if col not in self.label_encoders:
                 self.label_encoders[col] = LabelEncoder()
                 self.label_encoders[col].fit(df[col].fillna('unknown') if col in df.columns else pd.Series(['unknown']))
 
             val = df[col].fillna('unknown') if col in df.columns else pd.Series(['unknown'] * len(df))
-            known = set(self.label_encoders[col].classes_)
-            val = val.map(lambda v: v if v in known else 'unknown')
+            val = val.where(val.isin(self.label_encoders[col].classes_), 'unknown')
             encoded = self.label_encoders[col].transform(val)
             features.append(encoded.reshape(-1, 1))
             feature_names.append(col)
 
         # Numerical features — always included with default 0 for consistency
-        for col in ['age_at_diagnosis', 'treatment_duration_days']:
+        for col in self.NUMERIC_FEATURES:
             val = df[col].fillna(0) if col in df.columns else pd.Series([0] * len(df))
             features.append(val.values.reshape(-1, 1))
             feature_names.append(col)
@@ -171,6 +212,7 @@ class DiseasePredictionModel(BaseMLModel):
         print()
         
         # Load data if not provided
+        self.report_stage('loading_data')
         if data is None:
             print("📊 Loading disease cases from database...")
             data = self.data_loader.load_disease_data()
@@ -221,6 +263,7 @@ class DiseasePredictionModel(BaseMLModel):
         # Train classification model (if enough diverse data)
         if len(df['disease_category'].unique()) >= 3 and self.data_size >= 30:
             print("🤖 Training Classification Model (Random Forest)...")
+            self.report_stage('training_classifier')
 
             # Scale features
             X_scaled = self.scaler.fit_transform(X)
@@ -261,6 +304,7 @@ class DiseasePredictionModel(BaseMLModel):
         # Train clustering model (for pattern recognition)
         if self.data_size >= 20:
             print("\n🔍 Training Clustering Model (K-Means)...")
+            self.report_stage('training_clustering')
             
             # Scale features
             X_scaled = self.scaler.fit_transform(X)
@@ -299,6 +343,7 @@ class DiseasePredictionModel(BaseMLModel):
         
         # Save model
         print(f"\n💾 Saving model...")
+        self.report_stage('saving')
         
         # Package all models and metadata
         self.model = {
@@ -313,7 +358,17 @@ class DiseasePredictionModel(BaseMLModel):
             'confidence': confidence
         }
         
-        model_path = self.save_model()
+        # Flattened forest and (if enabled) prediction grid are saved with the
+        # model so serving workers memory-map them instead of rebuilding them
+        self.prepare_fast_path()
+        self.model['forest_arrays'] = self._fast_path['forest'] if self._fast_path else None
+        self.model['prediction_grid'] = self._prediction_grid
+        
+        model_path = self.save_model(metrics={
+            key: results[key]
+            for key in ('classification_accuracy', 'cv_accuracy', 'cv_folds', 'silhouette_score', 'clusters', 'data_size')
+            if key in results
+        })
         results['model_path'] = model_path
         print(f"   ✓ Model saved to: {model_path}")
 
@@ -334,23 +389,20 @@ class DiseasePredictionModel(BaseMLModel):
     def _update_model_metadata(self, record_count, accuracy=None, cv_accuracy=None):
         """Write training stats to model_metadata table."""
         try:
-            conn = get_db_connection()
-            if not conn:
-                return
-            cur = conn.cursor()
-            cur.execute("""
-                UPDATE model_metadata
-                SET last_trained_at      = NOW(),
-                    records_at_last_train = %s,
-                    current_accuracy     = %s,
-                    cv_accuracy          = %s,
-                    model_version        = model_version + 1,
-                    updated_at           = NOW()
-                WHERE model_name = 'disease_prediction'
-            """, (record_count, accuracy, cv_accuracy))
-            conn.commit()
-            cur.close()
-            conn.close()
+            with pooled_connection() as conn:
+                cur = conn.cursor()
+                cur.execute("""
+                    UPDATE model_metadata
+                    SET last_trained_at      = NOW(),
+                        records_at_last_train = %s,
+                        current_accuracy     = %s,
+                        cv_accuracy          = %s,
+                        model_version        = model_version + 1,
+                        updated_at           = NOW()
+                    WHERE model_name = 'disease_prediction'
+                """, (record_count, accuracy, cv_accuracy))
+                conn.commit()
+                cur.close()
             print("   ✓ model_metadata updated")
         except Exception as e:
             print(f"   ⚠ Could not update model_metadata: {e}")
@@ -370,6 +422,254 @@ class DiseasePredictionModel(BaseMLModel):
         Returns:
             dict: Prediction results with disease category and confidence
         """
+        if isinstance(data, dict) and self.classification_model:
+            return {
+                'status': 'success',
+                'predictions': [self.predict_one(data)],
+                'model_confidence': self.get_model_confidence()
+            }
+        return self.predict_batch(data)
+    
+    def prepare_fast_path(self):
+        """
+        Precompute the tables predict_one uses: category -> code dicts, the
+        scaler's mean/scale and the forest flattened into contiguous node
+        arrays plus one array of leaf class probabilities.
+        
+        Called after training and after loading; predict_one rebuilds the
+        tables itself if the classifier has changed since. Either way the
+        prediction cache is cleared and, with DISEASE_PREDICTION_GRID=true,
+        the prediction grid is rebuilt. The flattened forest and grid saved
+        with the model are reused when they match, so workers share them
+        through the memory-mapped artifact instead of each building a copy.
+        """
+        model = self.classification_model
+        self.prediction_cache.clear()
+        self._prediction_grid = None
+        if model is None:
+            self._fast_path = None
+            return None
+        
+        codes = {
+            col: {label: code for code, label in enumerate(self.label_encoders[col].classes_)}
+            for col in self.CATEGORICAL_FEATURES
+        }
+        saved = self.model if isinstance(self.model, dict) else {}
+        forest = saved.get('forest_arrays')
+        if forest is None or len(forest['roots']) != len(model.estimators_) \
+                or len(forest['left']) != sum(e.tree_.node_count for e in model.estimators_):
+            forest = self._flatten_forest()
+        
+        self._fast_path = {
+            'model': model,
+            'codes': codes,
+            'mean': self.scaler.mean_,
+            'scale': self.scaler.scale_,
+            'forest': forest,
+            'labels': self._class_labels().tolist(),
+        }
+        if self.grid_enabled:
+            grid = saved.get('prediction_grid')
+            if grid is None or grid['age_bucket'] != int(os.getenv('DISEASE_PREDICTION_GRID_AGE_BUCKET', 12)) \
+                    or grid['treatment_bucket'] != int(os.getenv('DISEASE_PREDICTION_GRID_TREATMENT_BUCKET', 14)):
+                grid = self._build_prediction_grid()
+            self._prediction_grid = grid
+        return self._fast_path
+    
+    def _flatten_forest(self):
+        """
+        Concatenate every tree's node arrays, with child indices offset into
+        the combined arrays
+        
+        Returns:
+            dict: roots, left, right, feature, threshold and leaf_values arrays
+        """
+        model = self.classification_model
+        roots, lefts, rights, features, thresholds, values, offset = [], [], [], [], [], [], 0
+        for estimator in model.estimators_:
+            tree = estimator.tree_
+            roots.append(offset)
+            lefts.append(np.where(tree.children_left == -1, -1, tree.children_left + offset))
+            rights.append(np.where(tree.children_right == -1, -1, tree.children_right + offset))
+            features.append(tree.feature)
+            thresholds.append(tree.threshold)
+            # Class fractions per node (scikit-learn >= 1.4), as DecisionTreeClassifier.predict_proba returns
+            values.append(tree.value[:, 0, :model.n_classes_])
+            offset += tree.node_count
+        return {
+            'roots': np.array(roots, dtype=np.int64),
+            'left': np.concatenate(lefts).astype(np.int64),
+            'right': np.concatenate(rights).astype(np.int64),
+            'feature': np.concatenate(features).astype(np.int64),
+            'threshold': np.concatenate(thresholds),
+            'leaf_values': np.vstack(values),
+        }
+    
+    def _build_prediction_grid(self):
+        """
+        Predict every species x severity x breed x age bucket x treatment bucket
+        x is_contagious combination in one predict_proba call.
+        
+        Each bucket is represented by its lower edge, so grid answers are exact
+        for inputs on a bucket boundary (e.g. the default treatment of 0 days)
+        and approximate inside a bucket.
+        
+        Returns:
+            dict: Probability array indexed like the feature vector, bucket widths;
+                None if the grid would exceed DISEASE_PREDICTION_GRID_MAX_ROWS
+        """
+        age_bucket = int(os.getenv('DISEASE_PREDICTION_GRID_AGE_BUCKET', 12))
+        treatment_bucket = int(os.getenv('DISEASE_PREDICTION_GRID_TREATMENT_BUCKET', 14))
+        max_rows = int(os.getenv('DISEASE_PREDICTION_GRID_MAX_ROWS', 500000))
+        
+        ages = np.arange(0, self.GRID_AGE_MAX_MONTHS + 1, age_bucket, dtype=np.float64)
+        durations = np.arange(0, self.GRID_TREATMENT_MAX_DAYS + 1, treatment_bucket, dtype=np.float64)
+        shape = [len(self._fast_path['codes'][col]) for col in self.CATEGORICAL_FEATURES] + [len(ages), len(durations), 2]
+        rows = int(np.prod(shape))
+        if rows > max_rows:
+            print(f"   ⚠ Prediction grid skipped: {rows} combinations > DISEASE_PREDICTION_GRID_MAX_ROWS={max_rows}")
+            return None
+        
+        start = time.perf_counter()
+        index = np.indices(shape).reshape(len(shape), -1)
+        X = np.column_stack([index[0], index[1], index[2], ages[index[3]], durations[index[4]], index[5]]).astype(np.float64)
+        probabilities = self.classification_model.predict_proba(self.scaler.transform(X))
+        grid = {
+            'probabilities': probabilities.reshape(shape + [probabilities.shape[1]]),
+            'age_bucket': age_bucket,
+            'treatment_bucket': treatment_bucket,
+            'rows': rows,
+            'build_seconds': round(time.perf_counter() - start, 3),
+        }
+        print(f"   ✓ Prediction grid built: {rows} combinations in {grid['build_seconds']}s")
+        return grid
+    
+    def _encode_case(self, case, fast):
+        """Feature vector of one dict case, before scaling, in prepare_features order"""
+        features = []
+        for col in self.CATEGORICAL_FEATURES:
+            codes = fast['codes'][col]
+            value = case.get(col)
+            code = codes.get(value if value is not None and value == value else 'unknown')
+            if code is None:
+                code = codes.get('unknown')
+                if code is None:
+                    raise ValueError("y contains previously unseen labels: 'unknown'")
+            features.append(code)
+        for col in self.NUMERIC_FEATURES:
+            value = case.get(col)
+            features.append(float(value) if value is not None and value == value else 0.0)
+        features.append(int(case.get('is_contagious', 0)))
+        return features
+    
+    def _grid_probabilities(self, features):
+        grid = self._prediction_grid
+        probabilities = grid['probabilities']
+        age = min(max(int(features[3] // grid['age_bucket']), 0), probabilities.shape[3] - 1)
+        duration = min(max(int(features[4] // grid['treatment_bucket']), 0), probabilities.shape[4] - 1)
+        self._grid_lookups += 1
+        return probabilities[features[0], features[1], features[2], age, duration, 1 if features[5] else 0]
+    
+    def _tree_probabilities(self, features, fast):
+        # StandardScaler.transform, then the float32 cast trees compare against
+        x = ((np.array(features, dtype=np.float64) - fast['mean']) / fast['scale']).astype(np.float32)
+        
+        # Walk all trees at once, one level per iteration, until every tree is at a leaf
+        forest = fast['forest']
+        nodes = forest['roots']
+        while True:
+            left = forest['left'][nodes]
+            internal = left != -1
+            if not internal.any():
+                break
+            go_left = x[forest['feature'][nodes]] <= forest['threshold'][nodes]
+            nodes = np.where(internal, np.where(go_left, left, forest['right'][nodes]), nodes)
+        return forest['leaf_values'][nodes].sum(axis=0) / len(nodes)
+    
+    def predict_one(self, case):
+        """
+        Classify a single case without pandas
+        
+        Builds the feature vector straight from the dict and walks the
+        flattened forest; results match predict_batch for the same case.
+        Results are memoized by encoded feature vector, and with
+        DISEASE_PREDICTION_GRID=true they come from the precomputed grid.
+        
+        Args:
+            case (dict): One case with the predict() features
+            
+        Returns:
+            dict: predicted_category, confidence, confidence_level, all_probabilities
+        """
+        fast = self._fast_path
+        if fast is None or fast['model'] is not self.classification_model:
+            fast = self.prepare_fast_path()
+        
+        features = self._encode_case(case, fast)
+        if self._prediction_grid is not None:
+            probabilities = self._grid_probabilities(features)
+        else:
+            key = tuple(features)
+            cached = self.prediction_cache.get(key)
+            if cached is not None:
+                return dict(cached)
+            probabilities = self._tree_probabilities(features, fast)
+        
+        best = int(probabilities.argmax())
+        confidence = float(probabilities[best])
+        result = {
+            'predicted_category': fast['labels'][best],
+            'confidence': confidence,
+            'confidence_level': 'high' if confidence > 0.7 else 'medium' if confidence > 0.5 else 'low',
+            'all_probabilities': dict(zip(fast['labels'], probabilities.tolist()))
+        }
+        if self._prediction_grid is None:
+            self.prediction_cache.put(key, result)
+            return dict(result)
+        return result
+    
+    def get_prediction_cache_stats(self):
+        """
+        Get single-case prediction cache and grid statistics
+        
+        Returns:
+            dict: LRU cache counters and hit ratio, grid size and lookups
+        """
+        grid = self._prediction_grid
+        return {
+            'cache': self.prediction_cache.get_stats(),
+            'grid': {
+                'enabled': self.grid_enabled,
+                'built': grid is not None,
+                'rows': grid['rows'] if grid else 0,
+                'build_seconds': grid['build_seconds'] if grid else None,
+                'lookups': self._grid_lookups,
+            }
+        }
+    
+    def _class_labels(self):
+        """Class labels in predict_proba column order, decoded once per fitted classifier"""
+        model = self.classification_model
+        if self._labels_model is not model:
+            encoder = self.label_encoders.get('disease_category')
+            classes = model.classes_
+            self._class_label_array = encoder.inverse_transform(classes) if encoder is not None else classes
+            self._labels_model = model
+        return self._class_label_array
+    
+    def predict_batch(self, data, top_k=None, id_field=None):
+        """
+        Classify many cases with one prepare_features / predict_proba pass
+        
+        Args:
+            data (list, dict or DataFrame): Cases with the predict() features
+            top_k (int, optional): Return only the k most likely categories per case
+                (top_probabilities) instead of every class (all_probabilities)
+            id_field (str, optional): Input field echoed back on each prediction (e.g. pet_id)
+                
+        Returns:
+            dict: Predictions in input order, with category, confidence and probabilities
+        """
         if not self.classification_model:
             return {
                 'status': 'model_not_trained',
@@ -381,34 +681,47 @@ class DiseasePredictionModel(BaseMLModel):
             df = pd.DataFrame([data])
         else:
             df = pd.DataFrame(data) if not isinstance(data, pd.DataFrame) else data
+        if df.empty:
+            return {'status': 'success', 'predictions': [], 'model_confidence': self.get_model_confidence()}
         
-        # Prepare features
         X, _, _ = self.prepare_features(df)
-        X_scaled = self.scaler.transform(X)
-        
-        # Predict
-        predictions = self.classification_model.predict(X_scaled)
-        probabilities = self.classification_model.predict_proba(X_scaled)
-        
-        # Decode predictions
-        if 'disease_category' in self.label_encoders:
-            predicted_categories = self.label_encoders['disease_category'].inverse_transform(predictions)
+        probabilities = self.classification_model.predict_proba(self.scaler.transform(X))
+        labels = self._class_labels()
+        
+        rows = np.arange(len(probabilities))
+        best = probabilities.argmax(axis=1)
+        confidence = probabilities[rows, best]
+        levels = np.where(confidence > 0.7, 'high', np.where(confidence > 0.5, 'medium', 'low'))
+        predicted = labels[best].tolist()
+        confidence, levels = confidence.tolist(), levels.tolist()
+        
+        if top_k:
+            k = min(int(top_k), probabilities.shape[1])
+            order = np.argsort(-probabilities, axis=1, kind='stable')[:, :k]
+            top_labels = labels[order].tolist()
+            top_probs = probabilities[rows[:, None], order].tolist()
         else:
-            predicted_categories = predictions
+            label_list = labels.tolist()
+            prob_rows = probabilities.tolist()
+        
+        ids = df[id_field].tolist() if id_field and id_field in df.columns else None
         
         results = []
-        for i, pred in enumerate(predicted_categories):
-            confidence = max(probabilities[i]) if len(probabilities) > i else 0.0
-            
-            results.append({
-                'predicted_category': pred,
-                'confidence': float(confidence),
-                'confidence_level': 'high' if confidence > 0.7 else 'medium' if confidence > 0.5 else 'low',
-                'all_probabilities': {
-                    self.label_encoders['disease_category'].inverse_transform([j])[0]: float(probabilities[i][j])
-                    for j in range(len(probabilities[i]))
-                } if 'disease_category' in self.label_encoders else {}
-            })
+        for i in range(len(predicted)):
+            result = {
+                'predicted_category': predicted[i],
+                'confidence': confidence[i],
+                'confidence_level': levels[i],
+            }
+            if top_k:
+                result['top_probabilities'] = [
+                    {'category': c, 'probability': p} for c, p in zip(top_labels[i], top_probs[i])
+                ]
+            else:
+                result['all_probabilities'] = dict(zip(label_list, prob_rows[i]))
+            if ids is not None:
+                result[id_field] = ids[i]
+            results.append(result)
         
         return {
             'status': 'success',
@@ -429,129 +742,251 @@ class DiseasePredictionModel(BaseMLModel):
         Returns:
             dict: Outbreak risk assessment
         """
-        # Load recent disease cases
-        data = self.data_loader.load_disease_data()
-        
-        # Handle both DataFrame and dict/list returns
-        if isinstance(data, pd.DataFrame):
-            df = data
-        else:
-            df = pd.DataFrame(data) if data else pd.DataFrame()
+        # Window counts come from the prefix-sum index over the case store
+        stats = self.outbreak_index.window_stats(
+            species=species or None,
+            disease_category=disease_category or None,
+            region=region or None,
+            days_lookback=days_lookback
+        )
         
-        if df.empty:
+        if stats is None:
             return {
                 'risk_level': 'unknown',
                 'reason': 'No disease data available',
                 'confidence': 'very_low'
             }
         
-        # Filter by date
-        cutoff_date = datetime.now().date() - timedelta(days=days_lookback)
-        df['diagnosis_date'] = pd.to_datetime(df['diagnosis_date'])
-        recent_cases = df[df['diagnosis_date'].dt.date >= cutoff_date]
-        
-        # Apply filters
-        if species:
-            recent_cases = recent_cases[recent_cases['species'] == species]
-        if disease_category:
-            recent_cases = recent_cases[recent_cases['disease_category'] == disease_category]
-        if region:
-            recent_cases = recent_cases[recent_cases['region'] == region]
-        
-        # Calculate risk score (max 10) — calibrated for a small suburban clinic
-        risk_score = 0
-        reasons = []
+        risk_score, risk_level, reasons = self._score_outbreak(stats, days_lookback)
+        case_count = stats['case_count']
+        contagious_count = stats['contagious_count']
+        
+        # Get confidence
+        confidence = self.get_model_confidence()
+        
+        return {
+            'risk_level': risk_level,
+            'risk_score': min(risk_score, 10),
+            'case_count': case_count,
+            'contagious_cases': int(contagious_count),
+            'days_analyzed': days_lookback,
+            'reasons': reasons,
+            'confidence': confidence['level'],
+            'filters': {
+                'species': species,
+                'disease_category': disease_category,
+                'region': region
+            },
+            'recommendation': self._get_risk_recommendation(risk_level, reasons)
+        }
+    
+    def predict_outbreak_risk_batch(self, lookbacks=(30,), include_combinations=False, limit=None):
+        """
+        Score outbreak risk for every species, disease category and region at once
+        
+        Args:
+            lookbacks (list): Window lengths in days to score
+            include_combinations (bool): Also score species x category x region combinations
+            limit (int, optional): Keep only the top N rows of the ranking
+            
+        Returns:
+            dict: Ranked risk table (highest risk first)
+        """
+        batch = self.outbreak_index.batch_window_stats(lookbacks, include_combinations=include_combinations)
+        if not batch:
+            return {
+                'risk_level': 'unknown',
+                'reason': 'No disease data available',
+                'confidence': 'very_low',
+                'results': []
+            }
+        
+        dims = ('species', 'disease_category', 'region')
+        results = []
+        for key, days_lookback, stats in batch:
+            risk_score, risk_level, reasons = self._score_outbreak(stats, days_lookback)
+            scope = [d for d, v in zip(dims, key) if v is not None]
+            results.append({
+                'scope': ' x '.join(scope) if scope else 'overall',
+                'species': key[0],
+                'disease_category': key[1],
+                'region': key[2],
+                'days_analyzed': days_lookback,
+                'risk_level': risk_level,
+                'risk_score': risk_score,
+                'case_count': stats['case_count'],
+                'contagious_cases': stats['contagious_count'],
+                'severe_cases': stats['severe_count'],
+                'reasons': reasons
+            })
+        
+        results.sort(key=lambda r: (-r['risk_score'], -r['case_count'], r['days_analyzed']))
+        total_scored = len(results)
+        if limit:
+            results = results[:limit]
+        
+        return {
+            'results': results,
+            'total_scored': total_scored,
+            'lookbacks': list(lookbacks),
+            'include_combinations': include_combinations,
+            'confidence': self.get_model_confidence()['level'],
+            'recommendations': {
+                level: self._get_risk_recommendation(level, [])
+                for level in self.RISK_LEVELS
+            }
+        }
+    
+    def replay_outbreak_risk(self, species=None, disease_category=None, region=None,
+                             days_lookback=30, start_date=None, end_date=None):
+        """
+        Historical as-of outbreak risk series, one row per day
+        
+        Uses the same factor rules as predict_outbreak_risk, evaluated for every
+        day at once from rolling-window counts, for backtesting the thresholds.
+        
+        Args:
+            species (str, optional): Filter by species
+            disease_category (str, optional): Filter by disease category
+            region (str, optional): Filter by region
+            days_lookback (int): Window length in days
+            start_date (date, optional): First as-of day (default: first case)
+            end_date (date, optional): Last as-of day (default: today)
+            
+        Returns:
+            pd.DataFrame: date, counts, points per factor, risk_score and risk_level
+        """
+        counts = self.outbreak_index.replay_window_counts(
+            species=species, disease_category=disease_category, region=region,
+            days_lookback=days_lookback, start_date=start_date, end_date=end_date
+        )
+        if counts is None:
+            return pd.DataFrame()
+        
+        points = self._outbreak_points(
+            counts['case_count'], counts['contagious_count'], counts['severe_count'],
+            counts['first_half'], counts['second_half'], counts['has_cluster'], days_lookback
+        )
+        risk_score = np.minimum(sum(points.values()), 10)
+        risk_level = np.select(
+            [risk_score >= threshold for threshold, _ in self.RISK_LEVEL_THRESHOLDS],
+            [level for _, level in self.RISK_LEVEL_THRESHOLDS],
+            'low'
+        )
+        
+        series = pd.DataFrame({
+            'date': counts['dates'].astype('datetime64[ns]'),
+            'case_count': counts['case_count'],
+            'contagious_cases': counts['contagious_count'],
+            'severe_cases': counts['severe_count']
+        })
+        for factor, p in points.items():
+            series[f'{factor}_points'] = p
+        series['risk_score'] = risk_score
+        series['risk_level'] = risk_level
+        return series
+    
+    @staticmethod
+    def _outbreak_points(case_count, contagious_count, severe_count,
+                         first_half, second_half, has_cluster, days_lookback):
+        """
+        Points per outbreak risk factor; works on scalars or NumPy arrays
+        (one element per window) so live scoring and replays share the rules
+
+        Returns:
+            dict: factor name -> points (np.ndarray)
+        """
+        case_count = np.asarray(case_count)
+        contagious_count = np.asarray(contagious_count)
+        severe_count = np.asarray(severe_count)
+        first_half = np.asarray(first_half)
+        second_half = np.asarray(second_half)
 
         # Factor 1: Case volume relative to expected for a small clinic
         # Normal monthly load ~15-20 cases; flag only unusually high volumes
-        case_count = len(recent_cases)
         expected = max(1, days_lookback * 0.6)  # ~0.6 cases/day baseline
-        if case_count >= expected * 2.5:
-            risk_score += 2
-            reasons.append(f"{case_count} cases in {days_lookback} days (unusually high)")
-        elif case_count >= expected * 1.5:
-            risk_score += 1
-            reasons.append(f"{case_count} cases in {days_lookback} days (above average)")
+        volume = np.where(case_count >= expected * 2.5, 2,
+                          np.where(case_count >= expected * 1.5, 1, 0))
 
         # Factor 2: Contagious disease rate (proportion-based, not count-based)
         # A handful of contagious cases is routine — focus on the percentage
-        contagious_count = int(recent_cases['is_contagious'].sum()) if 'is_contagious' in recent_cases.columns else 0
-        if case_count > 0:
-            contagious_pct = contagious_count / case_count
-            if contagious_pct >= 0.50 and contagious_count >= 5:
-                risk_score += 3
-                reasons.append(f"{contagious_count} contagious cases ({round(contagious_pct*100)}% of total)")
-            elif contagious_pct >= 0.35 and contagious_count >= 3:
-                risk_score += 2
-                reasons.append(f"{contagious_count} contagious cases ({round(contagious_pct*100)}% of total)")
-            elif contagious_pct >= 0.20 and contagious_count >= 2:
-                risk_score += 1
-                reasons.append(f"{contagious_count} contagious cases detected")
+        has_cases = case_count > 0
+        contagious_pct = np.divide(contagious_count, case_count,
+                                   out=np.zeros(case_count.shape), where=has_cases)
+        contagious = np.where(has_cases & (contagious_pct >= 0.50) & (contagious_count >= 5), 3,
+                              np.where(has_cases & (contagious_pct >= 0.35) & (contagious_count >= 3), 2,
+                                       np.where(has_cases & (contagious_pct >= 0.20) & (contagious_count >= 2), 1, 0)))
 
         # Factor 3: Severity — scaled by period length (expected ~1 severe case per 30 days)
-        severe_count = recent_cases[recent_cases['severity'].isin(['severe', 'critical'])].shape[0]
         period_months = days_lookback / 30
         severe_high_threshold = max(4, round(4 * period_months))
         severe_low_threshold = max(2, round(2 * period_months))
-        if severe_count >= severe_high_threshold:
-            risk_score += 2
-            reasons.append(f"{severe_count} severe/critical cases")
-        elif severe_count >= severe_low_threshold:
-            risk_score += 1
-            reasons.append(f"{severe_count} severe/critical cases")
+        severity = np.where(severe_count >= severe_high_threshold, 2,
+                            np.where(severe_count >= severe_low_threshold, 1, 0))
 
         # Factor 4: Same contagious disease cluster — threshold scales with period
         # A cluster of 3 in 30 days is notable; needs proportionally more in longer windows
-        if not recent_cases.empty:
-            contagious_cases = recent_cases[recent_cases['is_contagious'] == True] if 'is_contagious' in recent_cases.columns else recent_cases
-            if not contagious_cases.empty:
-                min_cluster_size = max(3, days_lookback // 12)
-                disease_counts = contagious_cases['disease_name'].value_counts()
-                clustered = disease_counts[disease_counts >= min_cluster_size]
-                if len(clustered) > 0:
-                    risk_score += 2
-                    reasons.append(f"Disease cluster: {', '.join(clustered.index[:2])}")
+        cluster = np.where(has_cluster, 2, 0)
 
         # Factor 5: Accelerating trend in second half of the period
-        if len(recent_cases) >= 8:
-            halfway = datetime.now().date() - timedelta(days=days_lookback//2)
-            first_half = recent_cases[recent_cases['diagnosis_date'].dt.date < halfway]
-            second_half = recent_cases[recent_cases['diagnosis_date'].dt.date >= halfway]
-            if len(first_half) > 0 and len(second_half) > len(first_half) * 2.0:
-                risk_score += 1
-                reasons.append("Rapid increase in cases detected")
+        trend = np.where((case_count >= 8) & (first_half > 0) & (second_half > first_half * 2.0), 1, 0)
 
-        # Cap at 10
-        risk_score = min(risk_score, 10)
-
-        # Determine risk level — critical requires a genuine multi-factor outbreak signal
-        if risk_score >= 8:
-            risk_level = 'critical'
-        elif risk_score >= 5:
-            risk_level = 'high'
-        elif risk_score >= 3:
-            risk_level = 'medium'
-        else:
-            risk_level = 'low'
-        
-        # Get confidence
-        confidence = self.get_model_confidence()
-        
         return {
-            'risk_level': risk_level,
-            'risk_score': min(risk_score, 10),
-            'case_count': case_count,
-            'contagious_cases': int(contagious_count),
-            'days_analyzed': days_lookback,
-            'reasons': reasons,
-            'confidence': confidence['level'],
-            'filters': {
-                'species': species,
-                'disease_category': disease_category,
-                'region': region
-            },
-            'recommendation': self._get_risk_recommendation(risk_level, reasons)
+            'volume': volume,
+            'contagious': contagious,
+            'severity': severity,
+            'cluster': cluster,
+            'trend': trend
         }
+
+    @classmethod
+    def _risk_level(cls, risk_score):
+        """Map a risk score to its risk level"""
+        for threshold, level in cls.RISK_LEVEL_THRESHOLDS:
+            if risk_score >= threshold:
+                return level
+        return 'low'
+
+    @classmethod
+    def _score_outbreak(cls, stats, days_lookback):
+        """
+        Five-factor outbreak risk scoring for one window
+
+        Args:
+            stats (dict): Window counts from OutbreakRiskIndex.window_stats
+            days_lookback (int): Window length in days
+
+        Returns:
+            tuple: (risk_score, risk_level, reasons)
+        """
+        case_count = stats['case_count']
+        contagious_count = stats['contagious_count']
+        severe_count = stats['severe_count']
+        points = cls._outbreak_points(
+            case_count, contagious_count, severe_count,
+            stats['first_half'], stats['second_half'], bool(stats['clusters']), days_lookback
+        )
+        points = {factor: int(p) for factor, p in points.items()}
+
+        reasons = []
+        if points['volume'] == 2:
+            reasons.append(f"{case_count} cases in {days_lookback} days (unusually high)")
+        elif points['volume'] == 1:
+            reasons.append(f"{case_count} cases in {days_lookback} days (above average)")
+        if points['contagious'] >= 2:
+            reasons.append(f"{contagious_count} contagious cases ({round(contagious_count / case_count * 100)}% of total)")
+        elif points['contagious'] == 1:
+            reasons.append(f"{contagious_count} contagious cases detected")
+        if points['severity']:
+            reasons.append(f"{severe_count} severe/critical cases")
+        if points['cluster']:
+            reasons.append(f"Disease cluster: {', '.join(stats['clusters'][:2])}")
+        if points['trend']:
+            reasons.append("Rapid increase in cases detected")
+
+        # Cap at 10
+        risk_score = min(sum(points.values()), 10)
+        return risk_score, cls._risk_level(risk_score), reasons
     
     def _get_risk_recommendation(self, risk_level, reasons):
         """Get recommendation based on risk level"""
@@ -577,7 +1012,7 @@ class DiseasePredictionModel(BaseMLModel):
             }
         
         # Load data
-        data = self.data_loader.load_disease_data()
+        data = self.case_store.query(columns=self.FEATURE_COLUMNS)
         
         # Handle both DataFrame and dict/list returns
         if isinstance(data, pd.DataFrame):
@@ -630,7 +1065,7 @@ class DiseasePredictionModel(BaseMLModel):
         Returns:
             dict: Species-specific disease trends
         """
-        data = self.data_loader.load_disease_data()
+        data = self.case_store.query(species=species or None, columns=self.TREND_COLUMNS)
         
         # Handle both DataFrame and dict/list returns
         if isinstance(data, pd.DataFrame):
@@ -638,9 +1073,6 @@ class DiseasePredictionModel(BaseMLModel):
         else:
             df = pd.DataFrame(data) if data else pd.DataFrame()
         
-        if species:
-            df = df[df['species'] == species]
-        
         if df.empty:
             return {'status': 'no_data', 'species': species}
         
@@ -670,7 +1102,7 @@ class DiseasePredictionModel(BaseMLModel):
         Returns:
             dict: Geographic disease distribution
         """
-        data = self.data_loader.load_disease_data()
+        data = self.case_store.query(columns=self.GEOGRAPHIC_COLUMNS)
         
         # Handle both DataFrame and dict/list returns
         if isinstance(data, pd.DataFrame):
@@ -712,108 +1144,36 @@ class DiseasePredictionModel(BaseMLModel):
         and pet demographics.
         """
         try:
-            from prophet import Prophet
-
-            conn = get_db_connection()
-            cur = conn.cursor()
-
-            # --- 1. Monthly disease case data ---
-            disease_q = """
-                SELECT
-                    DATE_TRUNC('month', diagnosis_date)::date AS month,
-                    COUNT(*) AS disease_cases,
-                    SUM(CASE WHEN is_contagious THEN 1 ELSE 0 END) AS contagious_cases,
-                    COUNT(DISTINCT species) AS species_diversity,
-                    SUM(CASE WHEN severity IN ('severe','critical') THEN 1 ELSE 0 END) AS severe_cases,
-                    COUNT(DISTINCT disease_name) AS unique_diseases
-                FROM disease_cases
-                WHERE diagnosis_date IS NOT NULL
-            """
-            params = []
-            if species:
-                disease_q += " AND species = %s"
-                params.append(species)
-            if disease_category:
-                disease_q += " AND disease_category = %s"
-                params.append(disease_category)
-            disease_q += " GROUP BY DATE_TRUNC('month', diagnosis_date)::date ORDER BY month"
-            cur.execute(disease_q, params)
-            disease_rows = cur.fetchall()
-
-            # --- 2. Monthly appointment data ---
-            cur.execute("""
-                SELECT
-                    DATE_TRUNC('month', appointment_date)::date AS month,
-                    COUNT(*) AS appointment_count,
-                    COUNT(DISTINCT pet_id) AS unique_pets_seen
-                FROM appointments
-                WHERE status NOT IN ('cancelled')
-                GROUP BY DATE_TRUNC('month', appointment_date)::date
-                ORDER BY month
-            """)
-            appt_rows = cur.fetchall()
-
-            # --- 3. Monthly medical records data ---
-            cur.execute("""
-                SELECT
-                    DATE_TRUNC('month', visit_date)::date AS month,
-                    COUNT(*) AS record_count,
-                    SUM(CASE WHEN follow_up_required THEN 1 ELSE 0 END) AS follow_ups
-                FROM medical_records
-                GROUP BY DATE_TRUNC('month', visit_date)::date
-                ORDER BY month
-            """)
-            record_rows = cur.fetchall()
-
-            # --- 4. Active pet demographics snapshot ---
-            cur.execute("""
-                SELECT
-                    species,
-                    COUNT(*) AS count,
-                    AVG(
-                        EXTRACT(YEAR FROM AGE(CURRENT_DATE, date_of_birth)) * 12 +
-                        EXTRACT(MONTH FROM AGE(CURRENT_DATE, date_of_birth))
-                    ) AS avg_age_months
-                FROM pets
-                WHERE is_active = true AND date_of_birth IS NOT NULL
-                GROUP BY species
-                ORDER BY count DESC
-                LIMIT 10
-            """)
-            demo_rows = cur.fetchall()
-
-            cur.close()
-            conn.close()
-
-            if not disease_rows or len(disease_rows) < 3:
-                return {'error': 'Insufficient disease case data for forecasting'}
-
-            # --- Build DataFrames ---
-            disease_df = pd.DataFrame(disease_rows, columns=['ds', 'disease_cases', 'contagious_cases', 'species_diversity', 'severe_cases', 'unique_diseases'])
-            disease_df['ds'] = pd.to_datetime(disease_df['ds'])
-
-            appt_df = pd.DataFrame(appt_rows, columns=['ds', 'appointment_count', 'unique_pets_seen']) if appt_rows else pd.DataFrame(columns=['ds', 'appointment_count', 'unique_pets_seen'])
-            appt_df['ds'] = pd.to_datetime(appt_df['ds'])
+            # Disease months joined to appointment / medical-record months, category
+            # months and pet demographics — one round trip, one snapshot
+            aggregates = self.data_loader.load_disease_forecast_aggregates(
+                species=species, disease_category=disease_category
+            )
+            merged = aggregates['monthly']
 
-            record_df = pd.DataFrame(record_rows, columns=['ds', 'record_count', 'follow_ups']) if record_rows else pd.DataFrame(columns=['ds', 'record_count', 'follow_ups'])
-            record_df['ds'] = pd.to_datetime(record_df['ds'])
+            if len(merged) < 3:
+                return {'error': 'Insufficient disease case data for forecasting'}
 
-            merged = disease_df.merge(appt_df, on='ds', how='left').merge(record_df, on='ds', how='left').fillna(0)
             merged['contagious_rate'] = merged['contagious_cases'] / merged['disease_cases'].replace(0, 1)
             last_date = merged['ds'].max()
 
-            # ============================================================
-            # FORECAST 1: Disease case volume (Prophet + appointment regressor)
-            # ============================================================
-            has_appt = len(appt_df) >= 3
-            model = Prophet(yearly_seasonality=True, weekly_seasonality=False, daily_seasonality=False, uncertainty_samples=500)
-            if has_appt:
-                model.add_regressor('appointment_count')
+            category_months = aggregates['category_months']
+            demo_df = aggregates['demographics']
 
-            train_df = merged[['ds', 'disease_cases', 'appointment_count']].rename(columns={'disease_cases': 'y'})
-            model.fit(train_df)
+            # Reuse the finished forecast while the monthly inputs are unchanged
+            cache = get_forecast_cache()
+            cache_key = ('forecast', species, disease_category, periods_months)
+            fingerprint = frame_fingerprint(merged, category_months, demo_df.astype(str))
+            cached = cache.get(cache_key, fingerprint)
+            if cached is not None:
+                return dict(cached, confidence=self.get_model_confidence()['level'], cached=True)
 
-            future = model.make_future_dataframe(periods=periods_months, freq='MS')
+            # ============================================================
+            # Prophet jobs: volume, activity and top-5 categories are independent
+            # fits, so they are submitted together and run in parallel
+            # ============================================================
+            has_appt = aggregates['appointment_months'] >= 3
+            future = self._future_frame(merged['ds'], periods_months)
             if has_appt:
                 last_appt = float(merged['appointment_count'].tail(3).mean())
                 appt_trend = float((merged['appointment_count'].tail(3).mean() - merged['appointment_count'].head(3).mean()) / max(len(merged) - 3, 1))
@@ -828,7 +1188,46 @@ class DiseasePredictionModel(BaseMLModel):
                         future_idx += 1
                 future['appointment_count'] = future_appt_vals
 
-            forecast = model.predict(future)
+            # Activity level per month
+            # Factors: contagious rate, species diversity, severity ratio, disease variety
+            max_diversity = float(merged['species_diversity'].max()) or 1.0
+            merged['activity_score'] = (
+                merged['contagious_rate'] * 40 +
+                (merged['species_diversity'] / max_diversity) * 20 +
+                (merged['severe_cases'] / merged['disease_cases'].replace(0, 1)) * 20 +
+                (merged['unique_diseases'] / merged['disease_cases'].replace(0, 1)).clip(0, 1) * 20
+            ).clip(0, 100).round(1)
+
+            tasks = [
+                self._prophet_task(
+                    ('volume', species, disease_category, has_appt), 'volume',
+                    merged[['ds', 'disease_cases', 'appointment_count']].rename(columns={'disease_cases': 'y'}),
+                    future, uncertainty_samples=500, regressors=['appointment_count'] if has_appt else []
+                ),
+                self._prophet_task(
+                    ('activity', species, disease_category), 'activity',
+                    merged[['ds', 'activity_score']].rename(columns={'activity_score': 'y'}),
+                    self._future_frame(merged['ds'], periods_months)
+                )
+            ]
+            if not category_months.empty:
+                totals = category_months.groupby('disease_category', sort=False)['y'].sum()
+                for cat in totals.sort_values(ascending=False, kind='stable').head(5).index.tolist():
+                    cat_data = category_months[category_months['disease_category'] == cat][['ds', 'y']].reset_index(drop=True)
+                    if len(cat_data) >= 3:
+                        tasks.append(self._prophet_task(
+                            ('category', cat), f'category:{cat}', cat_data,
+                            self._future_frame(cat_data['ds'], periods_months)
+                        ))
+
+            fit_start = time.perf_counter()
+            forecasts, fit_timings = self._run_prophet(tasks)
+            fit_wall_seconds = round(time.perf_counter() - fit_start, 3)
+
+            # ============================================================
+            # FORECAST 1: Disease case volume (Prophet + appointment regressor)
+            # ============================================================
+            forecast = self._require_forecast(forecasts, fit_timings, tasks[0])
             future_fc = forecast[forecast['ds'] > last_date].copy()
 
             predictions = []
@@ -848,20 +1247,8 @@ class DiseasePredictionModel(BaseMLModel):
 
             # ============================================================
             # FORECAST 2: Disease activity level per month
-            # Factors: contagious rate, species diversity, severity ratio, disease variety
             # ============================================================
-            max_diversity = float(merged['species_diversity'].max()) or 1.0
-            merged['activity_score'] = (
-                merged['contagious_rate'] * 40 +
-                (merged['species_diversity'] / max_diversity) * 20 +
-                (merged['severe_cases'] / merged['disease_cases'].replace(0, 1)) * 20 +
-                (merged['unique_diseases'] / merged['disease_cases'].replace(0, 1)).clip(0, 1) * 20
-            ).clip(0, 100).round(1)
-
-            ob_model = Prophet(yearly_seasonality=True, weekly_seasonality=False, daily_seasonality=False, uncertainty_samples=0)
-            ob_model.fit(merged[['ds', 'activity_score']].rename(columns={'activity_score': 'y'}))
-            ob_future = ob_model.make_future_dataframe(periods=periods_months, freq='MS')
-            ob_fc = ob_model.predict(ob_future)
+            ob_fc = self._require_forecast(forecasts, fit_timings, tasks[1])
             ob_future_fc = ob_fc[ob_fc['ds'] > last_date]
 
             activity_forecast = []
@@ -891,36 +1278,27 @@ class DiseasePredictionModel(BaseMLModel):
             # ============================================================
             # FORECAST 4: Category-level forecasts (top 5 disease categories)
             # ============================================================
+            # A failed category fit only drops that category
             category_trend = {}
-            try:
-                data = self.data_loader.load_disease_data()
-                df_full = data if isinstance(data, pd.DataFrame) else (pd.DataFrame(data) if data else pd.DataFrame())
-                if not df_full.empty and 'disease_category' in df_full.columns:
-                    df_full['month'] = pd.to_datetime(df_full['diagnosis_date']).dt.to_period('M').dt.to_timestamp()
-                    for cat in df_full['disease_category'].value_counts().head(5).index.tolist():
-                        cat_data = df_full[df_full['disease_category'] == cat].groupby('month').size().reset_index(name='y').rename(columns={'month': 'ds'})
-                        if len(cat_data) >= 3:
-                            cm = Prophet(yearly_seasonality=True, weekly_seasonality=False, daily_seasonality=False, uncertainty_samples=0)
-                            cm.fit(cat_data)
-                            cp = cm.predict(cm.make_future_dataframe(periods=periods_months, freq='MS'))
-                            category_trend[cat] = [
-                                {'month': r['ds'].strftime('%Y-%m'), 'predicted': max(0, round(float(r['yhat'])))}
-                                for _, r in cp[cp['ds'] > last_date].iterrows()
-                            ]
-            except Exception:
-                pass
+            for task in tasks[2:]:
+                cp = forecasts.get(task['key'])
+                if cp is None:
+                    continue
+                category_trend[task['key'][1]] = [
+                    {'month': r['ds'].strftime('%Y-%m'), 'predicted': max(0, round(float(r['yhat'])))}
+                    for _, r in cp[cp['ds'] > last_date].iterrows()
+                ]
 
             # Pet demographics
             demographics = {}
-            if demo_rows:
-                demo_df = pd.DataFrame(demo_rows, columns=['species', 'count', 'avg_age_months'])
+            if not demo_df.empty:
                 for _, row in demo_df.iterrows():
                     demographics[row['species']] = {
                         'count': int(row['count']),
                         'avg_age_months': round(float(row['avg_age_months']), 1) if row['avg_age_months'] else None
                     }
 
-            return {
+            result = {
                 'predictions': predictions,
                 'activity_forecast': activity_forecast,
                 'pandemic_risk': {
@@ -936,19 +1314,121 @@ class DiseasePredictionModel(BaseMLModel):
                 'periods_months': periods_months,
                 'category_trend': category_trend,
                 'pet_demographics': demographics,
+                'fit_timings': fit_timings,
+                'fit_wall_seconds': fit_wall_seconds,
                 'data_sources': {
-                    'disease_case_months': len(disease_df),
-                    'appointment_months': len(appt_df),
-                    'medical_record_months': len(record_df),
+                    'disease_case_months': len(merged),
+                    'appointment_months': aggregates['appointment_months'],
+                    'medical_record_months': aggregates['record_months'],
                     'active_pets': sum(d['count'] for d in demographics.values()) if demographics else 0
                 },
                 'confidence': self.get_model_confidence()['level'],
                 'filters': {'species': species, 'disease_category': disease_category}
             }
+            cache.put(cache_key, fingerprint, result)
+            return dict(result, cached=False)
 
         except Exception as e:
             return {'error': f'Forecast failed: {str(e)}'}
 
+    @staticmethod
+    def _future_frame(history_ds, periods_months):
+        """History dates plus `periods_months` month starts (Prophet make_future_dataframe)"""
+        history_ds = pd.Series(history_ds).drop_duplicates().sort_values().reset_index(drop=True)
+        last = history_ds.max()
+        dates = pd.date_range(start=last, periods=periods_months + 1, freq='MS')
+        dates = dates[dates > last][:periods_months]
+        return pd.DataFrame({'ds': pd.concat([history_ds, pd.Series(dates)], ignore_index=True)})
+
+    @staticmethod
+    def _prophet_task(key, series, train_df, future, uncertainty_samples=0, regressors=()):
+        """Describe one yearly-seasonal Prophet fit + predict job for _run_prophet"""
+        return {
+            'key': key,
+            'series': series,
+            'train': train_df,
+            'future': future,
+            'prophet_kwargs': {
+                'yearly_seasonality': True,
+                'weekly_seasonality': False,
+                'daily_seasonality': False,
+                'uncertainty_samples': uncertainty_samples
+            },
+            'regressors': list(regressors)
+        }
+
+    def _run_prophet(self, tasks):
+        """
+        Produce forecasts for Prophet jobs
+
+        Series whose training frame is unchanged reuse the cached fit and only
+        predict; the rest are fitted in the Prophet process pool.
+
+        Args:
+            tasks (list): Jobs from _prophet_task
+
+        Returns:
+            tuple: (key -> forecast frame, per-series timing list)
+        """
+        cache = get_forecast_cache()
+        forecasts, timings, pending = {}, [], []
+        for task in tasks:
+            fingerprint = frame_fingerprint(task['train'])
+            model = cache.get(('fit',) + tuple(task['key']), fingerprint)
+            if model is None:
+                pending.append((task, fingerprint))
+                continue
+            start = time.perf_counter()
+            forecasts[task['key']] = model.predict(task['future'])[['ds', 'yhat', 'yhat_lower', 'yhat_upper']]
+            predict_seconds = time.perf_counter() - start
+            observe_prophet('disease', 'predict', predict_seconds)
+            timings.append({'series': task['series'], 'cached_fit': True, 'fit_seconds': 0.0,
+                            'predict_seconds': round(predict_seconds, 3)})
+
+        results = get_prophet_pool().run([task for task, _ in pending])
+        for (task, fingerprint), result in zip(pending, results):
+            if 'error' in result:
+                timings.append({'series': task['series'], 'error': result['error']})
+                continue
+            cache.put(('fit',) + tuple(task['key']), fingerprint, result['model'])
+            observe_prophet('disease', 'fit', result['fit_seconds'])
+            observe_prophet('disease', 'predict', result['predict_seconds'])
+            forecasts[task['key']] = result['forecast']
+            timings.append({'series': task['series'], 'cached_fit': False,
+                            'fit_seconds': result['fit_seconds'],
+                            'predict_seconds': result['predict_seconds'],
+                            'worker_pid': result['worker_pid']})
+        return forecasts, timings
+
+    @staticmethod
+    def _require_forecast(forecasts, fit_timings, task):
+        """Forecast frame of a job that must have succeeded"""
+        if task['key'] not in forecasts:
+            error = next((t.get('error') for t in fit_timings if t['series'] == task['series']), 'unknown error')
+            raise RuntimeError(f"Prophet fit for {task['series']} failed: {error}")
+        return forecasts[task['key']]
+
+    def precompute_forecasts(self, periods=None):
+        """
+        Warm the forecast cache for the default (unfiltered) forecasting views
+
+        Args:
+            periods (list): Horizons in months (default: DISEASE_FORECAST_PRECOMPUTE_PERIODS)
+
+        Returns:
+            dict: Horizon -> seconds taken (or the error message)
+        """
+        if periods is None:
+            periods = [int(p) for p in os.getenv('DISEASE_FORECAST_PRECOMPUTE_PERIODS', '6,12,24,36,60').split(',') if p.strip()]
+
+        timings = {}
+        for periods_months in periods:
+            start = time.perf_counter()
+            result = self.forecast_disease_trends(periods_months=periods_months)
+            timings[periods_months] = result['error'] if 'error' in result else round(time.perf_counter() - start, 3)
+        print(f"✓ Disease forecasts precomputed: {timings}")
+        return timings
+
 
 if __name__ == "__main__":
     print("\n" + "=" * 70)
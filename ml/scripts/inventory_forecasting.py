@@ -29,8 +29,10 @@ from sklearn.metrics import mean_absolute_error, r2_score
 import joblib
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from config.db_connection import get_raw_db_connection as get_db_connection
+from config.db_connection import get_raw_db_connection as get_db_connection, pooled_connection
 from utils.model_base import BaseMLModel
+from utils.copy_fetch import fetch_frame
+from utils.metrics import timed_query
 
 
 class InventoryForecastingModel(BaseMLModel):
@@ -56,8 +58,24 @@ class InventoryForecastingModel(BaseMLModel):
     # Data Loading
     # -------------------------------------------------------------------------
 
-    def load_inventory_data(self):
-        """Load inventory and consumption data from PostgreSQL."""
+    # Column dtypes for the COPY fetch engine
+    CONSUMPTION_DTYPES = {
+        'item_id': 'int64', 'usage_date': 'datetime64[ns]', 'quantity_used': 'float64',
+        'revenue_generated': 'float64', 'transaction_count': 'int64'
+    }
+    CATEGORY_DTYPES = {
+        'year': 'int64', 'month': 'int64', 'total_quantity': 'float64',
+        'total_revenue': 'float64', 'unique_items': 'int64'
+    }
+
+    @timed_query
+    def load_inventory_data(self, engine=None):
+        """
+        Load inventory and consumption data from PostgreSQL.
+        engine: 'cursor' or 'copy' (COPY ... TO STDOUT) for the consumption and
+        category extractions; defaults to ML_FETCH_ENGINE. The per-item inventory
+        snapshot is small and always uses the cursor.
+        """
         conn = get_db_connection()
         if not conn:
             raise ConnectionError("Could not connect to PostgreSQL database.")
@@ -98,8 +116,12 @@ class InventoryForecastingModel(BaseMLModel):
             cursor.execute("SELECT COUNT(*) FROM inventory_transactions WHERE transaction_type = 'dispensed'")
             tx_count = cursor.fetchone()[0]
 
+            consumption_columns = [
+                'item_id', 'item_name', 'item_type', 'usage_date',
+                'quantity_used', 'revenue_generated', 'transaction_count'
+            ]
             if tx_count > 0:
-                cursor.execute("""
+                consumption_df = fetch_frame(cursor, """
                     SELECT
                         it.item_id,
                         i.item_name,
@@ -113,10 +135,10 @@ class InventoryForecastingModel(BaseMLModel):
                     WHERE it.transaction_type = 'dispensed'
                     GROUP BY it.item_id, i.item_name, i.category, DATE(it.transaction_date)
                     ORDER BY it.item_id, usage_date
-                """)
+                """, consumption_columns, dtypes=self.CONSUMPTION_DTYPES, engine=engine)
                 print("   Using inventory_transactions for consumption data")
             else:
-                cursor.execute("""
+                consumption_df = fetch_frame(cursor, """
                     SELECT
                         bi.item_id,
                         bi.item_name,
@@ -132,17 +154,11 @@ class InventoryForecastingModel(BaseMLModel):
                       AND b.bill_date IS NOT NULL
                     GROUP BY bi.item_id, bi.item_name, bi.item_type, DATE(b.bill_date)
                     ORDER BY bi.item_id, usage_date
-                """)
+                """, consumption_columns, dtypes=self.CONSUMPTION_DTYPES, engine=engine)
                 print("   Using billing_items as consumption proxy (no dispensing records yet)")
 
-            usage_rows = cursor.fetchall()
-            consumption_df = pd.DataFrame(usage_rows, columns=[
-                'item_id', 'item_name', 'item_type', 'usage_date',
-                'quantity_used', 'revenue_generated', 'transaction_count'
-            ])
-
             # Monthly consumption by category
-            cursor.execute("""
+            category_df = fetch_frame(cursor, """
                 SELECT
                     bi.item_type AS category,
                     EXTRACT(YEAR FROM b.bill_date)::int AS year,
@@ -156,11 +172,9 @@ class InventoryForecastingModel(BaseMLModel):
                   AND b.bill_date IS NOT NULL
                 GROUP BY bi.item_type, EXTRACT(YEAR FROM b.bill_date), EXTRACT(MONTH FROM b.bill_date)
                 ORDER BY year, month, category
-            """)
-            cat_rows = cursor.fetchall()
-            category_df = pd.DataFrame(cat_rows, columns=[
+            """, [
                 'category', 'year', 'month', 'total_quantity', 'total_revenue', 'unique_items'
-            ])
+            ], dtypes=self.CATEGORY_DTYPES, engine=engine)
 
             cursor.close()
             conn.close()
@@ -349,10 +363,17 @@ class InventoryForecastingModel(BaseMLModel):
 
         return model, metrics
 
-    def train(self):
-        """Full training pipeline."""
-        print("Loading inventory and consumption data...")
-        inventory_df, consumption_df, category_df = self.load_inventory_data()
+    def train(self, data=None):
+        """
+        Full training pipeline.
+        data: optional (inventory_df, consumption_df, category_df) already extracted,
+        e.g. from the shared train-all snapshot; loaded from PostgreSQL when None.
+        """
+        self.report_stage('loading_data')
+        if data is None:
+            print("Loading inventory and consumption data...")
+            data = self.load_inventory_data()
+        inventory_df, consumption_df, category_df = data
 
         if inventory_df.empty:
             return {'status': 'error', 'message': 'No inventory data found'}
@@ -361,6 +382,7 @@ class InventoryForecastingModel(BaseMLModel):
 
         # Compute item statistics
         print("Computing item demand statistics...")
+        self.report_stage('computing_item_stats')
         self.item_stats = self.compute_item_statistics(inventory_df, consumption_df)
 
         # Build training dataset
@@ -375,6 +397,7 @@ class InventoryForecastingModel(BaseMLModel):
 
         # Train demand predictor
         print("Training demand prediction model...")
+        self.report_stage('training_demand_model')
         demand_model, demand_metrics = self.train_demand_predictor(training_df)
         self.demand_model = demand_model
 
@@ -397,7 +420,8 @@ class InventoryForecastingModel(BaseMLModel):
                 'items_with_history': len(training_df)
             }
         }
-        self.save_model()
+        self.report_stage('saving')
+        self.save_model(metrics=self.metrics)
 
         self._update_model_metadata(
             inventory_items=len(inventory_df),
@@ -419,27 +443,24 @@ class InventoryForecastingModel(BaseMLModel):
     def _update_model_metadata(self, inventory_items, consumption_records, cv_mae=None):
         """Write training stats to model_metadata table."""
         try:
-            conn = get_db_connection()
-            if not conn:
-                return
-            cur = conn.cursor()
-            cur.execute("""
-                UPDATE model_metadata
-                SET last_trained_at       = NOW(),
-                    records_at_last_train  = %s,
-                    cv_accuracy            = %s,
-                    model_version          = model_version + 1,
-                    notes                  = %s,
-                    updated_at             = NOW()
-                WHERE model_name = 'inventory_forecasting'
-            """, (
-                consumption_records,
-                cv_mae,
-                f"{inventory_items} items, {consumption_records} consumption records"
-            ))
-            conn.commit()
-            cur.close()
-            conn.close()
+            with pooled_connection() as conn:
+                cur = conn.cursor()
+                cur.execute("""
+                    UPDATE model_metadata
+                    SET last_trained_at       = NOW(),
+                        records_at_last_train  = %s,
+                        cv_accuracy            = %s,
+                        model_version          = model_version + 1,
+                        notes                  = %s,
+                        updated_at             = NOW()
+                    WHERE model_name = 'inventory_forecasting'
+                """, (
+                    consumption_records,
+                    cv_mae,
+                    f"{inventory_items} items, {consumption_records} consumption records"
+                ))
+                conn.commit()
+                cur.close()
             print("   ✓ model_metadata updated")
         except Exception as e:
             print(f"   ⚠ Could not update model_metadata: {e}")
@@ -12,7 +12,7 @@ import pandas as pd
 from datetime import datetime, timedelta
 
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
-from config.db_connection import get_raw_db_connection as get_db_connection
+from utils.case_store import get_case_store
 
 
 # ── Breed cancer predisposition tables (veterinary literature baseline) ──────
@@ -57,34 +57,11 @@ def _age_cancer_multiplier(species, age_months):
 class PetHealthPredictor:
 
     def __init__(self):
-        self._cache = None
-        self._cached_at = None
+        self.case_store = get_case_store()
 
     def _load(self):
-        now = datetime.now()
-        if self._cache is not None and self._cached_at and (now - self._cached_at).seconds < 300:
-            return self._cache
-        conn = get_db_connection()
-        try:
-            cur = conn.cursor()
-            cur.execute("""
-                SELECT case_id, pet_id, disease_name, disease_category,
-                       diagnosis_date, species, breed, age_at_diagnosis,
-                       severity, outcome, is_contagious, transmission_method, region
-                FROM disease_cases ORDER BY diagnosis_date ASC
-            """)
-            rows = cur.fetchall()
-            cols = [d[0] for d in cur.description]
-            df = pd.DataFrame(rows, columns=cols)
-            if not df.empty:
-                df['diagnosis_date'] = pd.to_datetime(df['diagnosis_date'])
-                df['age_at_diagnosis'] = pd.to_numeric(df['age_at_diagnosis'], errors='coerce')
-            cur.close()
-            self._cache = df
-            self._cached_at = now
-            return df
-        finally:
-            conn.close()
+        # Shared snapshot, refreshed incrementally by the store; treat as read-only
+        return self.case_store.frame()
 
     # ── 1. Individual Pet Disease Risk ────────────────────────────────────────
 
@@ -16,6 +16,7 @@ Data sources:
 import sys
 import os
 import json
+import time
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -31,8 +32,10 @@ import joblib
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from config.db_connection import get_raw_db_connection as get_db_connection
+from config.db_connection import get_raw_db_connection as get_db_connection, pooled_connection
 from utils.model_base import BaseMLModel
+from utils.copy_fetch import fetch_frame
+from utils.metrics import timed_query, observe_prophet
 
 try:
     from prophet import Prophet
@@ -64,8 +67,25 @@ class SalesForecastingModel(BaseMLModel):
     # Data Loading
     # -------------------------------------------------------------------------
 
-    def load_data(self):
-        """Load billing and sales data from PostgreSQL."""
+    # Column dtypes for the COPY fetch engine
+    BILLING_DTYPES = {
+        'sale_date': 'datetime64[ns]', 'daily_revenue': 'float64', 'daily_subtotal': 'float64',
+        'transaction_count': 'int64', 'avg_transaction_value': 'float64',
+        'cash_revenue': 'float64', 'card_revenue': 'float64', 'bank_revenue': 'float64'
+    }
+    ITEMS_DTYPES = {
+        'sale_date': 'datetime64[ns]', 'category_revenue': 'float64', 'item_count': 'int64'
+    }
+    APPOINTMENT_DTYPES = {
+        'sale_date': 'datetime64[ns]', 'type_revenue': 'float64', 'appointment_count': 'int64'
+    }
+
+    @timed_query
+    def load_data(self, engine=None):
+        """
+        Load billing and sales data from PostgreSQL.
+        engine: 'cursor' or 'copy' (COPY ... TO STDOUT); defaults to ML_FETCH_ENGINE
+        """
         conn = get_db_connection()
         if not conn:
             raise ConnectionError("Could not connect to PostgreSQL database.")
@@ -74,7 +94,7 @@ class SalesForecastingModel(BaseMLModel):
             cursor = conn.cursor()
 
             # --- Billing summary by date ---
-            cursor.execute("""
+            billing_df = fetch_frame(cursor, """
                 SELECT
                     DATE(b.bill_date) AS sale_date,
                     SUM(b.total_amount) AS daily_revenue,
@@ -89,16 +109,13 @@ class SalesForecastingModel(BaseMLModel):
                   AND b.bill_date IS NOT NULL
                 GROUP BY DATE(b.bill_date)
                 ORDER BY sale_date
-            """)
-            daily_rows = cursor.fetchall()
-
-            billing_df = pd.DataFrame(daily_rows, columns=[
+            """, [
                 'sale_date', 'daily_revenue', 'daily_subtotal', 'transaction_count',
                 'avg_transaction_value', 'cash_revenue', 'card_revenue', 'bank_revenue'
-            ])
+            ], dtypes=self.BILLING_DTYPES, engine=engine)
 
             # --- Billing items breakdown (service vs product) ---
-            cursor.execute("""
+            items_df = fetch_frame(cursor, """
                 SELECT
                     DATE(b.bill_date) AS sale_date,
                     bi.item_type,
@@ -110,15 +127,12 @@ class SalesForecastingModel(BaseMLModel):
                   AND b.bill_date IS NOT NULL
                 GROUP BY DATE(b.bill_date), bi.item_type
                 ORDER BY sale_date, bi.item_type
-            """)
-            item_rows = cursor.fetchall()
-
-            items_df = pd.DataFrame(item_rows, columns=[
+            """, [
                 'sale_date', 'item_type', 'category_revenue', 'item_count'
-            ])
+            ], dtypes=self.ITEMS_DTYPES, engine=engine)
 
             # --- Appointment-based revenue ---
-            cursor.execute("""
+            appointment_df = fetch_frame(cursor, """
                 SELECT
                     DATE(b.bill_date) AS sale_date,
                     a.appointment_type,
@@ -130,12 +144,9 @@ class SalesForecastingModel(BaseMLModel):
                   AND b.bill_date IS NOT NULL
                 GROUP BY DATE(b.bill_date), a.appointment_type
                 ORDER BY sale_date
-            """)
-            appt_rows = cursor.fetchall()
-
-            appointment_df = pd.DataFrame(appt_rows, columns=[
+            """, [
                 'sale_date', 'appointment_type', 'type_revenue', 'appointment_count'
-            ])
+            ], dtypes=self.APPOINTMENT_DTYPES, engine=engine)
 
             cursor.close()
             conn.close()
@@ -277,7 +288,9 @@ class SalesForecastingModel(BaseMLModel):
         # Add custom seasonality for veterinary patterns
         model.add_seasonality(name='monthly', period=30.5, fourier_order=5)
 
+        start = time.perf_counter()
         model.fit(prophet_df)
+        observe_prophet('sales', 'fit', time.perf_counter() - start)
 
         # In-sample evaluation (last 30 days as pseudo-test)
         cutoff_date = prophet_df['ds'].max() - pd.Timedelta(days=30)
@@ -362,10 +375,17 @@ class SalesForecastingModel(BaseMLModel):
 
         return model, metrics
 
-    def train(self):
-        """Full training pipeline."""
-        print("Loading sales data...")
-        billing_df, items_df, appointment_df = self.load_data()
+    def train(self, data=None):
+        """
+        Full training pipeline.
+        data: optional (billing_df, items_df, appointment_df) already extracted,
+        e.g. from the shared train-all snapshot; loaded from PostgreSQL when None.
+        """
+        self.report_stage('loading_data')
+        if data is None:
+            print("Loading sales data...")
+            data = self.load_data()
+        billing_df, items_df, appointment_df = data
 
         if billing_df.empty:
             return {
@@ -376,6 +396,7 @@ class SalesForecastingModel(BaseMLModel):
         print(f"Loaded {len(billing_df)} daily sales records")
 
         # Populate daily_sales_summary table
+        self.report_stage('populating_summary')
         populated = self.populate_daily_sales_summary(billing_df)
         print(f"Populated {populated} daily_sales_summary records")
 
@@ -385,11 +406,13 @@ class SalesForecastingModel(BaseMLModel):
 
         # Train Prophet
         print("Training Prophet time-series model...")
+        self.report_stage('training_prophet')
         prophet_model, prophet_metrics = self.train_prophet_model(prophet_df)
         self.prophet_model = prophet_model
 
         # Train demand model
         print("Training Random Forest demand model...")
+        self.report_stage('training_demand_model')
         demand_model, demand_metrics = self.train_demand_model(monthly_df)
         self.demand_model = demand_model
 
@@ -398,8 +421,8 @@ class SalesForecastingModel(BaseMLModel):
             'daily_records': len(billing_df),
             'monthly_records': len(monthly_df),
             'date_range': {
-                'start': str(billing_df['sale_date'].min()),
-                'end': str(billing_df['sale_date'].max())
+                'start': str(pd.to_datetime(billing_df['sale_date'].min()).date()),
+                'end': str(pd.to_datetime(billing_df['sale_date'].max()).date())
             },
             'total_revenue_trained': float(billing_df['daily_revenue'].sum()),
             'categories': items_df['item_type'].unique().tolist() if not items_df.empty else []
@@ -420,7 +443,8 @@ class SalesForecastingModel(BaseMLModel):
             'monthly_summary': self.monthly_summary.to_dict(orient='records') if self.monthly_summary is not None else [],
             'training_data': self.training_data
         }
-        self.save_model()
+        self.report_stage('saving')
+        self.save_model(metrics=self.metrics)
 
         self._update_model_metadata(
             record_count=self.training_data.get('daily_records', 0),
@@ -437,22 +461,19 @@ class SalesForecastingModel(BaseMLModel):
     def _update_model_metadata(self, record_count, cv_mae=None):
         """Write training stats to model_metadata table."""
         try:
-            conn = get_db_connection()
-            if not conn:
-                return
-            cur = conn.cursor()
-            cur.execute("""
-                UPDATE model_metadata
-                SET last_trained_at       = NOW(),
-                    records_at_last_train  = %s,
-                    cv_accuracy            = %s,
-                    model_version          = model_version + 1,
-                    updated_at             = NOW()
-                WHERE model_name = 'sales_forecasting'
-            """, (record_count, cv_mae))
-            conn.commit()
-            cur.close()
-            conn.close()
+            with pooled_connection() as conn:
+                cur = conn.cursor()
+                cur.execute("""
+                    UPDATE model_metadata
+                    SET last_trained_at       = NOW(),
+                        records_at_last_train  = %s,
+                        cv_accuracy            = %s,
+                        model_version          = model_version + 1,
+                        updated_at             = NOW()
+                    WHERE model_name = 'sales_forecasting'
+                """, (record_count, cv_mae))
+                conn.commit()
+                cur.close()
             print("   ✓ model_metadata updated")
         except Exception as e:
             print(f"   ⚠ Could not update model_metadata: {e}")
@@ -492,8 +513,10 @@ class SalesForecastingModel(BaseMLModel):
             return self._fallback_forecast(periods)
 
         try:
+            start = time.perf_counter()
             future = self.prophet_model.make_future_dataframe(periods=periods, freq=freq)
             forecast = self.prophet_model.predict(future)
+            observe_prophet('sales', 'predict', time.perf_counter() - start)
 
             # Get only future dates (after the last training date)
             last_train_date = self.prophet_model.history['ds'].max()
@@ -0,0 +1,226 @@
+"""
+Train-All Pipeline
+Purpose: Retrain the disease, sales and inventory models together. Every source
+         table is extracted once into a shared TrainingSnapshot, then the three
+         models are fitted in parallel worker processes.
+
+Usage:
+    python scripts/train_all.py
+    python scripts/train_all.py --workers 3 --engine copy --compare
+
+The report gives wall-clock seconds per stage (extract, prepare, fit) and the
+time the same work would take one model after another. --compare also runs
+the three standalone trainings sequentially, each with its own extraction, and
+reports the measured speedup.
+"""
+
+import sys
+import os
+import time
+import argparse
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.training_snapshot import TrainingSnapshot
+from utils.training_jobs import model_class
+from utils.prophet_pool import _init_worker
+
+MODEL_KEYS = ('disease', 'sales', 'inventory')
+
+
+def fit_model(model_key, data):
+    """
+    Train one model on pre-extracted data (runs in a worker process)
+
+    Args:
+        model_key (str): 'disease', 'sales' or 'inventory'
+        data: Training data accepted by that model's train(data)
+
+    Returns:
+        dict: Training results or error, fit seconds and worker pid
+    """
+    start = time.perf_counter()
+    try:
+        results = model_class(model_key)().train(data)
+        error = results.get('message') if isinstance(results, dict) and results.get('status') == 'error' else None
+    except Exception as e:
+        results, error = None, str(e)
+    outcome = {
+        'status': 'error' if error else 'success',
+        'fit_seconds': round(time.perf_counter() - start, 3),
+        'worker_pid': os.getpid(),
+    }
+    if error:
+        outcome['error'] = error
+    else:
+        outcome['results'] = results
+    return outcome
+
+
+class TrainAllPipeline:
+    """
+    Extract once, fit the three models in parallel.
+
+    Exposes train() and progress_callback like the model classes, so the
+    background training job queue can run it as the 'all' job.
+    """
+
+    def __init__(self, workers=None, engine=None, compare=False):
+        """
+        Args:
+            workers (int): Parallel fit processes (TRAIN_ALL_WORKERS, default min(3, CPUs));
+                1 fits inline
+            engine (str): Fetch engine, 'cursor' or 'copy' (default: ML_FETCH_ENGINE)
+            compare (bool): Also time the standalone trainings run one after another
+        """
+        if workers is None:
+            workers = int(os.getenv('TRAIN_ALL_WORKERS', min(len(MODEL_KEYS), os.cpu_count() or 1)))
+        self.workers = max(1, min(workers, len(MODEL_KEYS)))
+        self.engine = engine
+        self.compare = compare
+        self.progress_callback = None
+
+    def report_stage(self, stage):
+        if self.progress_callback is not None:
+            self.progress_callback(stage)
+
+    def _fit_all(self, datasets):
+        fits = {}
+        if self.workers == 1:
+            for key, data in datasets.items():
+                self.report_stage(f'fitting_{key}')
+                fits[key] = fit_model(key, data)
+            return fits
+
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=mp.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(int(os.getenv('PROPHET_STAN_THREADS', 1)),)
+        ) as executor:
+            futures = {executor.submit(fit_model, key, data): key for key, data in datasets.items()}
+            for future in as_completed(futures):
+                key = futures[future]
+                fits[key] = future.result()
+                self.report_stage(f'fitted_{key}')
+        return {key: fits[key] for key in datasets}
+
+    def _run_sequential(self):
+        """Standalone trainings one after another, each extracting its own data"""
+        from utils.data_loader import DataLoader
+
+        loaders = {
+            'disease': lambda model: DataLoader().load_disease_data(engine=self.engine),
+            'sales': lambda model: model.load_data(engine=self.engine),
+            'inventory': lambda model: model.load_inventory_data(engine=self.engine),
+        }
+        timings = {'extract': {}, 'fit': {}}
+        wall_start = time.perf_counter()
+        for key in MODEL_KEYS:
+            model = model_class(key)()
+            start = time.perf_counter()
+            data = loaders[key](model)
+            extracted = time.perf_counter()
+            model.train(data)
+            timings['extract'][key] = round(extracted - start, 3)
+            timings['fit'][key] = round(time.perf_counter() - extracted, 3)
+        timings['wall_seconds'] = round(time.perf_counter() - wall_start, 3)
+        return timings
+
+    def train(self, data=None):
+        """
+        Run the pipeline
+
+        Args:
+            data (TrainingSnapshot, optional): Snapshot to train on; extracted when None
+
+        Returns:
+            dict: Per-model results, per-stage wall-clock timings and snapshot row counts
+        """
+        wall_start = time.perf_counter()
+
+        self.report_stage('extracting_snapshot')
+        start = time.perf_counter()
+        snapshot = data if data is not None else TrainingSnapshot.extract(engine=self.engine)
+        extract_seconds = round(time.perf_counter() - start, 3)
+
+        self.report_stage('preparing_frames')
+        datasets, prepare = {}, {}
+        for key in MODEL_KEYS:
+            start = time.perf_counter()
+            datasets[key] = snapshot.training_data(key)
+            prepare[key] = round(time.perf_counter() - start, 3)
+
+        self.report_stage('fitting_models')
+        start = time.perf_counter()
+        fits = self._fit_all(datasets)
+        fit_wall = round(time.perf_counter() - start, 3)
+        wall = round(time.perf_counter() - wall_start, 3)
+
+        fit_seconds = {key: fit['fit_seconds'] for key, fit in fits.items()}
+        sequential = round(extract_seconds + sum(prepare.values()) + sum(fit_seconds.values()), 3)
+        timings = {
+            'extract_seconds': extract_seconds,
+            'extract_by_source': snapshot.get_stats()['extract_seconds'],
+            'prepare_seconds': prepare,
+            'fit_seconds': fit_seconds,
+            'fit_wall_seconds': fit_wall,
+            'wall_seconds': wall,
+            'sequential_estimate_seconds': sequential,
+            'speedup_vs_sequential_estimate': round(sequential / wall, 2) if wall else None,
+            'workers': self.workers,
+        }
+
+        failed = [key for key, fit in fits.items() if fit['status'] == 'error']
+        results = {
+            'status': 'error' if len(failed) == len(fits) else ('partial' if failed else 'success'),
+            'models': fits,
+            'timings': timings,
+            'snapshot_rows': snapshot.get_stats()['rows'],
+        }
+        if failed:
+            results['message'] = '; '.join(f"{key}: {fits[key]['error']}" for key in failed)
+
+        if self.compare:
+            self.report_stage('sequential_baseline')
+            baseline = self._run_sequential()
+            timings['sequential_baseline'] = baseline
+            timings['speedup_vs_sequential'] = round(baseline['wall_seconds'] / wall, 2) if wall else None
+
+        return results
+
+
+def print_report(results):
+    timings = results['timings']
+    print("\n📊 Train-all report")
+    print(f"   Snapshot rows: {results['snapshot_rows']}")
+    print(f"   Extract (once): {timings['extract_seconds']}s {timings['extract_by_source']}")
+    print(f"   Prepare frames: {timings['prepare_seconds']}")
+    for key, fit in results['models'].items():
+        status = '✓' if fit['status'] == 'success' else f"❌ {fit['error']}"
+        print(f"   Fit {key:<10} {fit['fit_seconds']:>8.3f}s  pid {fit['worker_pid']}  {status}")
+    print(f"   Fit wall ({timings['workers']} workers): {timings['fit_wall_seconds']}s")
+    print(f"   Pipeline wall: {timings['wall_seconds']}s vs "
+          f"{timings['sequential_estimate_seconds']}s one after another "
+          f"({timings['speedup_vs_sequential_estimate']}x)")
+    if 'sequential_baseline' in timings:
+        baseline = timings['sequential_baseline']
+        print(f"   Measured standalone trainings: {baseline['wall_seconds']}s "
+              f"(extract {baseline['extract']}, fit {baseline['fit']}) "
+              f"-> {timings['speedup_vs_sequential']}x")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Train the disease, sales and inventory models from one shared extraction')
+    parser.add_argument('--workers', type=int, default=None, help='Parallel fit processes (default: TRAIN_ALL_WORKERS)')
+    parser.add_argument('--engine', choices=['cursor', 'copy'], default=None, help='Fetch engine (default: ML_FETCH_ENGINE)')
+    parser.add_argument('--compare', action='store_true', help='Also time the standalone trainings run sequentially')
+    args = parser.parse_args()
+
+    pipeline = TrainAllPipeline(workers=args.workers, engine=args.engine, compare=args.compare)
+    pipeline.progress_callback = lambda stage: print(f"\n▶ {stage}")
+    results = pipeline.train()
+    print_report(results)
+    sys.exit(0 if results['status'] != 'error' else 1)
@@ -24,6 +24,11 @@ if [ ! -f ".env" ]; then
     echo "Created .env from .env.example. Please update with your database credentials."
 fi
 
-# Start Flask server
-echo "Starting Flask ML API server..."
-python app.py
+# Start the server (ML_SERVER=gunicorn for the production multi-worker server)
+if [ "$ML_SERVER" = "gunicorn" ]; then
+    echo "Starting ML API server under gunicorn..."
+    exec gunicorn -c gunicorn.conf.py app:app
+else
+    echo "Starting Flask ML API server..."
+    python app.py
+fi
@@ -1,6 +1,21 @@
 """Utilities package for ML services"""
 
-from .data_loader import DataLoader
-from .model_base import BaseMLModel
+import importlib
 
-__all__ = ['DataLoader', 'BaseMLModel']
+# Exports are resolved on first access so importing a light utility (e.g.
+# utils.startup) does not pull in pandas through data_loader
+_EXPORTS = {
+    'DataLoader': '.data_loader',
+    'FrameStream': '.frame_stream',
+    'BaseMLModel': '.model_base',
+}
+
+__all__ = ['DataLoader', 'FrameStream', 'BaseMLModel']
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,415 @@
+"""
+In-Memory Disease Case Store for Serving
+Keeps a columnar snapshot of disease_cases that loads once and then refreshes
+incrementally by case_id / updated_at watermark in a background thread
+"""
+
+import os
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from config.db_connection import pooled_connection
+from utils.copy_fetch import fetch_frame
+from utils.frame_stream import apply_dtypes
+from utils.metrics import timed_query
+
+
+class DiseaseCaseStore:
+    """
+    Shared, read-mostly snapshot of disease cases sorted by diagnosis_date.
+
+    Readers get copies of (filtered) slices, so the snapshot itself is never
+    mutated; a refresh builds a new frame and swaps the reference atomically.
+    Refreshes run on a per-process background thread, off the request path.
+    """
+
+    COLUMNS = [
+        'case_id', 'pet_id', 'species', 'breed', 'age_at_diagnosis',
+        'disease_name', 'disease_category', 'severity', 'is_contagious',
+        'transmission_method', 'outcome', 'diagnosis_date',
+        'treatment_duration_days', 'region', 'updated_at'
+    ]
+    DTYPES = {
+        'case_id': 'int64', 'age_at_diagnosis': 'float64', 'is_contagious': 'boolean',
+        'diagnosis_date': 'datetime64[ns]', 'treatment_duration_days': 'float64',
+        'updated_at': 'datetime64[ns]'
+    }
+
+    def __init__(self, refresh_interval=None, overlap=None):
+        """
+        Args:
+            refresh_interval (int): Seconds between background refreshes
+                (DISEASE_STORE_REFRESH_SECONDS, default 30; 0 = refresh on every read)
+            overlap (int): Seconds of updated_at re-read before the watermark, so rows
+                committed late with an older timestamp are still picked up
+                (DISEASE_STORE_REFRESH_OVERLAP_SECONDS, default 300)
+        """
+        if refresh_interval is None:
+            refresh_interval = int(os.getenv('DISEASE_STORE_REFRESH_SECONDS', 30))
+        if overlap is None:
+            overlap = int(os.getenv('DISEASE_STORE_REFRESH_OVERLAP_SECONDS', 300))
+        self.refresh_interval = refresh_interval
+        self.overlap = pd.Timedelta(seconds=max(0, overlap))
+
+        self._frame = None
+        self._id_index = None
+        self._id_sum = 0
+        self._last_refresh = 0.0
+        self._max_case_id = 0
+        self._max_updated_at = None
+        self._lock = threading.Lock()
+        self._lock_pid = os.getpid()
+        self._listeners = []
+        self._refresher = None
+        self._refresher_pid = None
+        self._stop = threading.Event()
+        self._stats = {
+            'full_loads': 0,
+            'deletion_reloads': 0,
+            'incremental_refreshes': 0,
+            'rows_applied': 0,
+            'overlap_rows_skipped': 0,
+            'appends': 0,
+            'merges': 0,
+            'refresh_errors': 0,
+            'last_refreshed_at': None,
+        }
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    @timed_query
+    def _select(self, source='disease_cases', params=None, count=False):
+        """
+        Returns:
+            tuple: (cases from source sorted by diagnosis_date, case_id;
+                (row count, SUM(case_id)) of disease_cases read in the same
+                snapshot, or None)
+        """
+        query = f"""
+            SELECT {', '.join(self.COLUMNS)}
+            FROM {source}
+            ORDER BY diagnosis_date, case_id
+        """
+        checksum = None
+        with pooled_connection() as conn:
+            cursor = conn.cursor()
+            # Delta and count must see the same rows, or a concurrent insert looks like a deletion
+            cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY")
+            df = fetch_frame(cursor, query, self.COLUMNS, params=params, dtypes=self.DTYPES)
+            if count:
+                cursor.execute("SELECT COUNT(*), COALESCE(SUM(case_id), 0) FROM disease_cases")
+                checksum = tuple(int(v) for v in cursor.fetchone())
+            cursor.close()
+            conn.rollback()
+        return apply_dtypes(df, self.DTYPES), checksum
+
+    def _set_watermarks(self, df):
+        if df.empty:
+            return
+        self._max_case_id = max(self._max_case_id, int(df['case_id'].max()))
+        updated = df['updated_at'].max()
+        if pd.notna(updated) and (self._max_updated_at is None or updated > self._max_updated_at):
+            self._max_updated_at = updated
+
+    @staticmethod
+    def _build_id_index(frame):
+        ids = frame['case_id'].to_numpy()
+        order = np.argsort(ids, kind='stable')
+        return ids[order], order
+
+    def _locate(self, case_ids):
+        """Snapshot positions of case_ids; -1 where the case is not in the snapshot"""
+        sorted_ids, order = self._id_index
+        if len(sorted_ids) == 0:
+            return np.full(len(case_ids), -1)
+        idx = np.minimum(np.searchsorted(sorted_ids, case_ids), len(sorted_ids) - 1)
+        return np.where(sorted_ids[idx] == case_ids, order[idx], -1)
+
+    def _full_load(self):
+        df, _ = self._select()
+        self._max_case_id = 0
+        self._max_updated_at = None
+        self._set_watermarks(df)
+        self._frame = df.reset_index(drop=True)
+        self._id_index = self._build_id_index(self._frame)
+        self._id_sum = int(self._frame['case_id'].sum())
+        self._stats['full_loads'] += 1
+        self._notify(None)
+        return df
+
+    def _incremental(self):
+        """
+        Apply cases inserted or updated since the last refresh.
+
+        Deletions leave no watermark, so the snapshot's row count and
+        SUM(case_id) are compared with the table's, read in the same
+        snapshot as the delta; any mismatch triggers a full reload. Inserted
+        ids come from the sequence and exceed every id held, so a delete and
+        an insert in the same interval change the sum even though the count
+        matches. Blind spot: deletes exactly offset by inserts with
+        explicitly chosen (or late-committed lower) ids of the same total
+        go unnoticed until the next full reload (process restart).
+        """
+        # Two index-friendly halves instead of one OR predicate (idx on updated_at, PK on case_id)
+        since = self._max_updated_at - self.overlap if self._max_updated_at is not None else pd.Timestamp(1970, 1, 1)
+        delta, (total, id_sum) = self._select(
+            f"""(
+                SELECT {', '.join(self.COLUMNS)} FROM disease_cases WHERE case_id > %s
+                UNION
+                SELECT {', '.join(self.COLUMNS)} FROM disease_cases WHERE updated_at >= %s
+            ) AS delta""",
+            (self._max_case_id, since.to_pydatetime()),
+            count=True
+        )
+        current = self._frame
+
+        # The overlap re-reads cases already applied; keep new cases and real updates only
+        positions = self._locate(delta['case_id'].to_numpy())
+        known = positions >= 0
+        unchanged = np.zeros(len(delta), dtype=bool)
+        unchanged[known] = current['updated_at'].to_numpy()[positions[known]] == delta['updated_at'].to_numpy()[known]
+        if unchanged.any():
+            self._stats['overlap_rows_skipped'] += int(unchanged.sum())
+            delta = delta[~unchanged].reset_index(drop=True)
+            positions = positions[~unchanged]
+
+        # Deletions are invisible to watermarks; fall back to a full reload
+        new_ids = delta['case_id'].to_numpy()[positions < 0]
+        if len(current) + len(new_ids) != total or self._id_sum + int(new_ids.sum()) != id_sum:
+            self._stats['deletion_reloads'] += 1
+            self._full_load()
+            return
+
+        self._stats['incremental_refreshes'] += 1
+        if delta.empty:
+            return
+        self._frame = self._merge(current, delta, positions[positions >= 0])
+        self._id_sum += int(new_ids.sum())
+        self._set_watermarks(delta)
+        self._stats['rows_applied'] += len(delta)
+        self._notify(delta)
+
+    def _merge(self, current, delta, replaced):
+        """
+        New snapshot with delta (sorted by diagnosis_date, case_id) merged in
+        and the rows at `replaced` (older versions of updated cases) dropped.
+        Delta rows are inserted at their sorted position, so the snapshot is
+        never re-sorted.
+        """
+        kept = current.drop(index=current.index[replaced]) if len(replaced) else current
+        kept = kept.reset_index(drop=True)
+        dates = kept['diagnosis_date'].to_numpy()
+        ids = kept['case_id'].to_numpy()
+        new_dates = delta['diagnosis_date'].to_numpy()
+        new_ids = delta['case_id'].to_numpy()
+
+        appended = not len(replaced) and (kept.empty or (new_dates[0], new_ids[0]) > (dates[-1], ids[-1]))
+        if appended:
+            # New cases dated after everything held (the usual case): plain append
+            merged = pd.concat([kept, delta], ignore_index=True)
+            sorted_ids, order = self._id_index
+            new_order = np.argsort(new_ids, kind='stable')
+            if len(sorted_ids) == 0 or new_ids[new_order[0]] > sorted_ids[-1]:
+                self._id_index = (np.concatenate([sorted_ids, new_ids[new_order]]),
+                                  np.concatenate([order, new_order + len(kept)]))
+            else:
+                self._id_index = self._build_id_index(merged)
+            self._stats['appends'] += 1
+            return merged
+
+        lo = np.searchsorted(dates, new_dates, 'left')
+        hi = np.searchsorted(dates, new_dates, 'right')
+        at = np.array([l + np.searchsorted(ids[l:h], i) for l, h, i in zip(lo, hi, new_ids)], dtype='int64')
+        perm = np.insert(np.arange(len(kept)), at, np.arange(len(kept), len(kept) + len(delta)))
+        merged = pd.concat([kept, delta], ignore_index=True).take(perm).reset_index(drop=True)
+        self._id_index = self._build_id_index(merged)
+        self._stats['merges'] += 1
+        return merged
+
+    def add_listener(self, callback):
+        """
+        Register a callback invoked after the snapshot changes
+
+        Args:
+            callback (callable): fn(frame, delta) where frame is the new snapshot and
+                delta the new/updated cases, or None after a full reload
+        """
+        self._listeners.append(callback)
+
+    def _notify(self, delta):
+        for callback in list(self._listeners):
+            try:
+                callback(self._frame, delta)
+            except Exception as e:
+                print(f"   ⚠ Disease case store listener failed: {e}")
+
+    def refresh(self, force=False):
+        """
+        Bring the snapshot up to date
+
+        Args:
+            force (bool): Ignore the refresh interval
+        """
+        if self._frame is not None and not force and \
+                (time.monotonic() - self._last_refresh) < self.refresh_interval:
+            return
+
+        # First load blocks every reader; later refreshes are skipped if one is already running
+        blocking = self._frame is None or force
+        if not self._lock.acquire(blocking=blocking):
+            return
+        try:
+            if self._frame is not None and not force and \
+                    (time.monotonic() - self._last_refresh) < self.refresh_interval:
+                return
+            try:
+                if self._frame is None:
+                    self._full_load()
+                else:
+                    self._incremental()
+                self._stats['last_refreshed_at'] = datetime.now().isoformat()
+            except Exception as e:
+                self._stats['refresh_errors'] += 1
+                if self._frame is None:
+                    raise
+                print(f"   ⚠ Disease case store refresh failed, serving previous snapshot: {e}")
+            self._last_refresh = time.monotonic()
+        finally:
+            self._lock.release()
+
+    # ------------------------------------------------------------------
+    # Background refresh
+    # ------------------------------------------------------------------
+
+    def _ensure_refresher(self):
+        """Start this process's refresh thread (threads do not survive fork)"""
+        if self.refresh_interval <= 0 or self._refresher_pid == os.getpid():
+            return
+        with _store_lock:
+            if self._refresher_pid == os.getpid():
+                return
+            if self._lock_pid != os.getpid():
+                # Forked: the parent's lock may have been held by its refresh thread
+                self._lock = threading.Lock()
+                self._lock_pid = os.getpid()
+            self._stop = threading.Event()
+            self._refresher = threading.Thread(target=self._run_refresher, args=(self._stop,),
+                                               name='disease-case-store-refresh', daemon=True)
+            self._refresher_pid = os.getpid()
+            self._refresher.start()
+
+    def _run_refresher(self, stop):
+        while not stop.wait(self.refresh_interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"   ⚠ Disease case store refresh failed: {e}")
+
+    def stop(self):
+        """Stop the refresh thread; the next read in this process starts a new one"""
+        self._stop.set()
+        self._refresher_pid = None
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def frame(self):
+        """
+        Current snapshot. Treat as read-only.
+
+        Only the first read loads from the database; after that a background
+        thread refreshes the snapshot every refresh_interval seconds, so reads
+        never wait on a query.
+
+        Returns:
+            pd.DataFrame: All cases sorted by diagnosis_date
+        """
+        if self._frame is None or self.refresh_interval <= 0:
+            self.refresh()
+        self._ensure_refresher()
+        return self._frame
+
+    @property
+    def size(self):
+        """Number of cases in the snapshot"""
+        return len(self.frame())
+
+    def query(self, start_date=None, end_date=None, species=None,
+              disease_category=None, region=None, columns=None):
+        """
+        Filter the snapshot; mirrors DataLoader.load_disease_data
+
+        The date range is resolved with a binary search on the sorted
+        diagnosis_date column, so windowed reads cost O(window), not O(table).
+
+        Args:
+            start_date (str/date): Inclusive lower bound on diagnosis_date
+            end_date (str/date): Inclusive upper bound on diagnosis_date
+            species (str or list): Only cases for these species
+            disease_category (str or list): Only cases in these categories
+            region (str or list): Only cases in these regions
+            columns (list): Columns to return (default: all)
+
+        Returns:
+            pd.DataFrame: Independent copy of the matching cases
+        """
+        df = self.frame()
+
+        if start_date is not None or end_date is not None:
+            dates = df['diagnosis_date'].to_numpy()
+            lo = np.searchsorted(dates, pd.Timestamp(start_date).to_datetime64(), 'left') if start_date is not None else 0
+            hi = np.searchsorted(dates, pd.Timestamp(end_date).to_datetime64(), 'right') if end_date is not None else len(df)
+            df = df.iloc[lo:hi]
+
+        mask = None
+        for col, value in (('species', species), ('disease_category', disease_category), ('region', region)):
+            if value is None:
+                continue
+            m = df[col].isin(list(value)) if isinstance(value, (list, tuple, set)) else (df[col] == value)
+            mask = m if mask is None else (mask & m)
+        if mask is not None:
+            df = df[mask]
+
+        if columns:
+            df = df[list(columns)]
+        return df.reset_index(drop=True).copy()
+
+    def get_stats(self):
+        """
+        Get store statistics
+
+        Returns:
+            dict: Row count, watermarks and refresh counters
+        """
+        stats = dict(self._stats)
+        stats.update({
+            'rows': len(self._frame) if self._frame is not None else 0,
+            'loaded': self._frame is not None,
+            'refresh_interval_seconds': self.refresh_interval,
+            'refresh_overlap_seconds': int(self.overlap.total_seconds()),
+            'background_refresh': self._refresher_pid == os.getpid() and self._refresher.is_alive(),
+            'max_case_id': self._max_case_id,
+            'max_updated_at': self._max_updated_at.isoformat() if self._max_updated_at is not None else None,
+        })
+        return stats
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_case_store():
+    """Returns the process-wide DiseaseCaseStore, creating it on first use"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = DiseaseCaseStore()
+    return _store
@@ -0,0 +1,85 @@
+"""
+COPY-based Bulk Extraction for ML Training Data
+Runs COPY (SELECT ...) TO STDOUT and parses the CSV stream straight into typed
+NumPy-backed DataFrame columns, skipping per-row Python tuples/dicts
+"""
+
+import io
+import os
+
+import pandas as pd
+
+FETCH_ENGINES = ('cursor', 'copy')
+
+
+def resolve_engine(engine=None):
+    """
+    Resolve the fetch engine for a call
+
+    Args:
+        engine (str, optional): 'cursor' or 'copy'. Falls back to ML_FETCH_ENGINE, then 'cursor'
+
+    Returns:
+        str: Engine name
+    """
+    engine = (engine or os.getenv('ML_FETCH_ENGINE', 'cursor')).lower()
+    if engine not in FETCH_ENGINES:
+        raise ValueError(f"Unknown fetch engine '{engine}' (expected one of {', '.join(FETCH_ENGINES)})")
+    return engine
+
+
+def copy_frame(cursor, query, params=None, dtypes=None):
+    """
+    Execute a SELECT through COPY ... TO STDOUT (CSV) and parse it into a DataFrame
+
+    Args:
+        cursor: psycopg2 cursor
+        query (str): SELECT statement (may contain %s placeholders)
+        params (tuple): Query parameters, inlined client-side with mogrify
+        dtypes (dict): Column name -> dtype. 'datetime64[ns]' columns are parsed
+            as dates, 'boolean'/'bool' columns map Postgres t/f
+
+    Returns:
+        pd.DataFrame: Query result with typed columns
+    """
+    sql = cursor.mogrify(query, params).decode() if params else query
+    buf = io.BytesIO()
+    cursor.copy_expert(f"COPY ({sql.strip().rstrip(';')}) TO STDOUT WITH (FORMAT csv, HEADER true)", buf)
+    buf.seek(0)
+
+    dtypes = dtypes or {}
+    date_cols = [c for c, t in dtypes.items() if t.startswith('datetime64')]
+    read_dtypes = {c: t for c, t in dtypes.items() if c not in date_cols}
+
+    df = pd.read_csv(
+        buf,
+        dtype=read_dtypes or None,
+        parse_dates=date_cols or False,
+        true_values=['t'],
+        false_values=['f'],
+        keep_default_na=False,
+        na_values=[''],
+    )
+    buf.close()
+    return df
+
+
+def fetch_frame(cursor, query, columns, params=None, dtypes=None, engine=None):
+    """
+    Run a SELECT on a raw cursor with the selected fetch engine
+
+    Args:
+        cursor: psycopg2 cursor
+        query (str): SELECT statement
+        columns (list): Column names for the cursor engine's DataFrame
+        params (tuple): Query parameters
+        dtypes (dict): Column dtypes used by the COPY engine
+        engine (str, optional): 'cursor' or 'copy' (default: ML_FETCH_ENGINE)
+
+    Returns:
+        pd.DataFrame: Query result
+    """
+    if resolve_engine(engine) == 'copy':
+        return copy_frame(cursor, query, params, dtypes)
+    cursor.execute(query, params)
+    return pd.DataFrame(cursor.fetchall(), columns=columns)
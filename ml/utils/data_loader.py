@@ -3,27 +3,91 @@ Data Loader Utility for ML Models
 Extracts and prepares data from PostgreSQL database
 """
 
+import os
 import pandas as pd
 from datetime import datetime, timedelta
 from config.db_connection import get_db_connection
+from utils.frame_stream import FrameStream
+from utils.copy_fetch import copy_frame, resolve_engine
+from utils.metrics import timed_query
 
 
 class DataLoader:
     """Loads and prepares data for ML models"""
+
+    # Column dtypes applied to streamed chunks (keeps chunks compact and concat-stable)
+    SALES_DTYPES = {
+        'date': 'datetime64[ns]', 'transaction_count': 'int64',
+        'total_revenue': 'float64', 'total_tax': 'float64', 'avg_transaction': 'float64'
+    }
+    INVENTORY_DTYPES = {
+        'item_id': 'int64', 'date': 'datetime64[ns]',
+        'quantity_used': 'float64', 'revenue': 'float64'
+    }
+    DISEASE_DTYPES = {
+        'case_id': 'int64', 'age_at_diagnosis': 'float64',
+        'is_contagious': 'boolean', 'diagnosis_date': 'datetime64[ns]',
+        'treatment_duration_days': 'float64'
+    }
+    MEDICAL_RECORD_DTYPES = {
+        'record_id': 'int64', 'visit_date': 'datetime64[ns]',
+        'weight': 'float64', 'temperature': 'float64'
+    }
+    APPOINTMENT_DTYPES = {
+        'appointment_date': 'datetime64[ns]',
+        'duration_minutes': 'float64', 'estimated_cost': 'float64'
+    }
+    STOCK_DTYPES = {
+        'item_id': 'int64', 'quantity': 'int64', 'reorder_level': 'Int64',
+        'unit_cost': 'float64', 'selling_price': 'float64', 'expiry_date': 'datetime64[ns]'
+    }
     
     def __init__(self):
         self.db = get_db_connection()
+        self.itersize = int(os.getenv('DATALOADER_ITERSIZE', 5000))
+
+    def _fetch(self, query, params=None, stream=False, itersize=None, dtypes=None, engine=None,
+               columns=None):
+        """
+        Run a query either eagerly (DataFrame) or as a chunked stream
+
+        Args:
+            query (str): SQL query
+            params (tuple): Query parameters
+            stream (bool): Return a FrameStream backed by a server-side cursor
+            itersize (int): Rows per streamed chunk (defaults to DATALOADER_ITERSIZE)
+            dtypes (dict): Column dtypes applied to streamed chunks and COPY results
+            engine (str): 'cursor' (RealDictCursor) or 'copy' (COPY ... TO STDOUT);
+                defaults to ML_FETCH_ENGINE. Ignored when streaming
+            columns (list): Expected column names, so empty results keep their schema
+
+        Returns:
+            pd.DataFrame or FrameStream
+        """
+        if stream:
+            return FrameStream(query, params, itersize or self.itersize, dtypes)
+
+        with self.db as db:
+            if resolve_engine(engine) == 'copy':
+                with db.connection.cursor() as cursor:
+                    return copy_frame(cursor, query, params, dtypes)
+            results = db.execute_query(query, params)
+            return pd.DataFrame(results, columns=columns)
     
-    def load_sales_data(self, start_date=None, end_date=None):
+    @timed_query
+    def load_sales_data(self, start_date=None, end_date=None, stream=False, itersize=None, engine=None):
         """
         Load sales/billing data for forecasting
         
         Args:
             start_date (str): Start date for data extraction (YYYY-MM-DD)
             end_date (str): End date for data extraction (YYYY-MM-DD)
+            stream (bool): Yield DataFrame chunks from a server-side cursor
+            itersize (int): Rows per chunk when streaming
+            engine (str): Fetch engine, 'cursor' or 'copy' (default: ML_FETCH_ENGINE)
             
         Returns:
-            pd.DataFrame: Sales data with date, amount, and related fields
+            pd.DataFrame or FrameStream: Sales data with date, amount, and related fields
         """
         query = """
             SELECT 
@@ -47,16 +111,21 @@ class DataLoader:
         
         query += " GROUP BY b.bill_date::date ORDER BY date"
         
-        with self.db as db:
-            results = db.execute_query(query, tuple(params) if params else None)
-            return pd.DataFrame(results)
+        return self._fetch(query, tuple(params) if params else None,
+                           stream, itersize, self.SALES_DTYPES, engine)
     
-    def load_inventory_data(self):
+    @timed_query
+    def load_inventory_data(self, stream=False, itersize=None, engine=None):
         """
         Load inventory transaction data for demand forecasting
         
+        Args:
+            stream (bool): Yield DataFrame chunks from a server-side cursor
+            itersize (int): Rows per chunk when streaming
+            engine (str): Fetch engine, 'cursor' or 'copy' (default: ML_FETCH_ENGINE)
+            
         Returns:
-            pd.DataFrame: Inventory usage data
+            pd.DataFrame or FrameStream: Inventory usage data
         """
         query = """
             SELECT 
@@ -74,42 +143,81 @@ class DataLoader:
             ORDER BY date, bi.item_id
         """
         
-        with self.db as db:
-            results = db.execute_query(query)
-            return pd.DataFrame(results)
+        return self._fetch(query, None, stream, itersize, self.INVENTORY_DTYPES, engine)
     
-    def load_disease_data(self, start_date=None, end_date=None):
+    # Selectable disease case columns -> SQL expression (customer_city needs the customer join)
+    DISEASE_COLUMNS = {
+        'case_id': 'dc.case_id',
+        'pet_id': 'dc.pet_id',
+        'species': 'dc.species',
+        'breed': 'dc.breed',
+        'age_at_diagnosis': 'dc.age_at_diagnosis',
+        'disease_name': 'dc.disease_name',
+        'disease_category': 'dc.disease_category',
+        'severity': 'dc.severity',
+        'is_contagious': 'dc.is_contagious',
+        'transmission_method': 'dc.transmission_method',
+        'outcome': 'dc.outcome',
+        'diagnosis_date': 'dc.diagnosis_date',
+        'treatment_duration_days': 'dc.treatment_duration_days',
+        'symptoms': 'dc.symptoms',
+        'region': 'dc.region',
+        'customer_city': 'c.city',
+    }
+
+    @staticmethod
+    def _add_predicate(query, params, column, value):
+        """Append an equality (scalar) or membership (list) filter on column"""
+        if value is None:
+            return query
+        if isinstance(value, (list, tuple, set)):
+            params.append(list(value))
+            return query + f" AND {column} = ANY(%s)"
+        params.append(value)
+        return query + f" AND {column} = %s"
+
+    @timed_query
+    def load_disease_data(self, start_date=None, end_date=None, species=None,
+                          disease_category=None, region=None, columns=None,
+                          stream=False, itersize=None, engine=None):
         """
         Load disease case data for outbreak prediction
         
+        Filters and the column list are pushed into SQL, so callers only read
+        the rows and columns they use.
+        
         Args:
             start_date (str): Start date for data extraction
             end_date (str): End date for data extraction
+            species (str or list): Only cases for these species
+            disease_category (str or list): Only cases in these categories
+            region (str or list): Only cases in these regions
+            columns (list): Columns to select (default: all of DISEASE_COLUMNS)
+            stream (bool): Yield DataFrame chunks from a server-side cursor
+            itersize (int): Rows per chunk when streaming
+            engine (str): Fetch engine, 'cursor' or 'copy' (default: ML_FETCH_ENGINE)
             
         Returns:
-            pd.DataFrame: Disease case records
+            pd.DataFrame or FrameStream: Disease case records
         """
-        query = """
+        columns = list(columns) if columns else list(self.DISEASE_COLUMNS)
+        unknown = [c for c in columns if c not in self.DISEASE_COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown disease case columns: {', '.join(unknown)}")
+
+        select_list = ',\n                '.join(
+            f"{self.DISEASE_COLUMNS[c]} AS {c}" if self.DISEASE_COLUMNS[c] != f"dc.{c}" else self.DISEASE_COLUMNS[c]
+            for c in columns
+        )
+        query = f"""
             SELECT 
-                dc.case_id,
-                dc.pet_id,
-                dc.species,
-                dc.breed,
-                dc.age_at_diagnosis,
-                dc.disease_name,
-                dc.disease_category,
-                dc.severity,
-                dc.is_contagious,
-                dc.transmission_method,
-                dc.outcome,
-                dc.diagnosis_date,
-                dc.treatment_duration_days,
-                dc.symptoms,
-                dc.region,
-                c.city as customer_city
-            FROM disease_cases dc
+                {select_list}
+            FROM disease_cases dc"""
+        if 'customer_city' in columns:
+            query += """
             JOIN pets p ON dc.pet_id = p.pet_id
-            JOIN customers c ON p.customer_id = c.customer_id
+            JOIN customers c ON p.customer_id = c.customer_id"""
+        query += """
             WHERE 1=1
         """
         
@@ -120,23 +228,30 @@ class DataLoader:
         if end_date:
             query += " AND dc.diagnosis_date <= %s"
             params.append(end_date)
+        query = self._add_predicate(query, params, 'dc.species', species)
+        query = self._add_predicate(query, params, 'dc.disease_category', disease_category)
+        query = self._add_predicate(query, params, 'dc.region', region)
         
         query += " ORDER BY dc.diagnosis_date"
         
-        with self.db as db:
-            results = db.execute_query(query, tuple(params) if params else None)
-            return pd.DataFrame(results)
-    
-    def load_medical_records(self, start_date=None, end_date=None):
+        dtypes = {c: t for c, t in self.DISEASE_DTYPES.items() if c in columns}
+        return self._fetch(query, tuple(params) if params else None,
+                           stream, itersize, dtypes, engine, columns)
+
+    @timed_query
+    def load_medical_records(self, start_date=None, end_date=None, stream=False, itersize=None, engine=None):
         """
         Load medical records for analysis
         
         Args:
             start_date (str): Start date
             end_date (str): End date
+            stream (bool): Yield DataFrame chunks from a server-side cursor
+            itersize (int): Rows per chunk when streaming
+            engine (str): Fetch engine, 'cursor' or 'copy' (default: ML_FETCH_ENGINE)
             
         Returns:
-            pd.DataFrame: Medical records
+            pd.DataFrame or FrameStream: Medical records
         """
         query = """
             SELECT 
@@ -168,16 +283,23 @@ class DataLoader:
         
         query += " ORDER BY mr.visit_date"
         
-        with self.db as db:
-            results = db.execute_query(query, tuple(params) if params else None)
-            return pd.DataFrame(results)
+        return self._fetch(query, tuple(params) if params else None,
+                           stream, itersize, self.MEDICAL_RECORD_DTYPES, engine)
     
-    def load_appointment_data(self, start_date=None, end_date=None):
+    @timed_query
+    def load_appointment_data(self, start_date=None, end_date=None, stream=False, itersize=None, engine=None):
         """
         Load appointment data for analysis
         
+        Args:
+            start_date (str): Start date
+            end_date (str): End date
+            stream (bool): Yield DataFrame chunks from a server-side cursor
+            itersize (int): Rows per chunk when streaming
+            engine (str): Fetch engine, 'cursor' or 'copy' (default: ML_FETCH_ENGINE)
+            
         Returns:
-            pd.DataFrame: Appointment records
+            pd.DataFrame or FrameStream: Appointment records
         """
         query = """
             SELECT 
@@ -204,16 +326,21 @@ class DataLoader:
         
         query += " ORDER BY a.appointment_date"
         
-        with self.db as db:
-            results = db.execute_query(query, tuple(params) if params else None)
-            return pd.DataFrame(results)
+        return self._fetch(query, tuple(params) if params else None,
+                           stream, itersize, self.APPOINTMENT_DTYPES, engine)
     
-    def get_inventory_current_stock(self):
+    @timed_query
+    def get_inventory_current_stock(self, stream=False, itersize=None, engine=None):
         """
         Get current inventory stock levels
         
+        Args:
+            stream (bool): Yield DataFrame chunks from a server-side cursor
+            itersize (int): Rows per chunk when streaming
+            engine (str): Fetch engine, 'cursor' or 'copy' (default: ML_FETCH_ENGINE)
+            
         Returns:
-            pd.DataFrame: Current inventory status
+            pd.DataFrame or FrameStream: Current inventory status
         """
         query = """
             SELECT 
@@ -229,6 +356,139 @@ class DataLoader:
             ORDER BY item_name
         """
         
+        return self._fetch(query, None, stream, itersize, self.STOCK_DTYPES, engine)
+
+    @timed_query
+    def load_disease_forecast_aggregates(self, species=None, disease_category=None):
+        """
+        Load every monthly aggregate the disease forecast needs in one round trip
+
+        One CTE statement returns a single row: the disease months (filtered by
+        species / category) already joined to appointment and medical-record
+        months, plus the unfiltered per-category monthly counts and the
+        active-pet demographics, each as one JSON aggregate from the same
+        snapshot.
+
+        Args:
+            species (str): Only count disease cases for this species
+            disease_category (str): Only count disease cases in this category
+
+        Returns:
+            dict: 'monthly' (pd.DataFrame keyed by ds), 'appointment_months',
+                'record_months', 'category_months' (disease_category, ds, y in
+                category first-appearance order) and 'demographics' (pd.DataFrame)
+        """
+        disease_filters = ""
+        params = []
+        if species:
+            disease_filters += " AND species = %s"
+            params.append(species)
+        if disease_category:
+            disease_filters += " AND disease_category = %s"
+            params.append(disease_category)
+
+        query = f"""
+            WITH disease AS (
+                SELECT
+                    DATE_TRUNC('month', diagnosis_date)::date AS month,
+                    COUNT(*) AS disease_cases,
+                    SUM(CASE WHEN is_contagious THEN 1 ELSE 0 END) AS contagious_cases,
+                    COUNT(DISTINCT species) AS species_diversity,
+                    SUM(CASE WHEN severity IN ('severe','critical') THEN 1 ELSE 0 END) AS severe_cases,
+                    COUNT(DISTINCT disease_name) AS unique_diseases
+                FROM disease_cases
+                WHERE diagnosis_date IS NOT NULL{disease_filters}
+                GROUP BY 1
+            ),
+            appts AS (
+                SELECT
+                    DATE_TRUNC('month', appointment_date)::date AS month,
+                    COUNT(*) AS appointment_count,
+                    COUNT(DISTINCT pet_id) AS unique_pets_seen
+                FROM appointments
+                WHERE status NOT IN ('cancelled')
+                GROUP BY 1
+            ),
+            records AS (
+                SELECT
+                    DATE_TRUNC('month', visit_date)::date AS month,
+                    COUNT(*) AS record_count,
+                    SUM(CASE WHEN follow_up_required THEN 1 ELSE 0 END) AS follow_ups
+                FROM medical_records
+                GROUP BY 1
+            ),
+            category_first AS (
+                SELECT DISTINCT ON (disease_category)
+                    disease_category, diagnosis_date AS first_date, case_id AS first_case
+                FROM disease_cases
+                WHERE diagnosis_date IS NOT NULL AND disease_category IS NOT NULL
+                ORDER BY disease_category, diagnosis_date, case_id
+            ),
+            category_months AS (
+                SELECT
+                    disease_category,
+                    DATE_TRUNC('month', diagnosis_date)::date AS month,
+                    COUNT(*) AS cases
+                FROM disease_cases
+                WHERE diagnosis_date IS NOT NULL AND disease_category IS NOT NULL
+                GROUP BY 1, 2
+            ),
+            demographics AS (
+                SELECT
+                    species,
+                    COUNT(*) AS count,
+                    AVG(
+                        EXTRACT(YEAR FROM AGE(CURRENT_DATE, date_of_birth)) * 12 +
+                        EXTRACT(MONTH FROM AGE(CURRENT_DATE, date_of_birth))
+                    ) AS avg_age_months
+                FROM pets
+                WHERE is_active = true AND date_of_birth IS NOT NULL
+                GROUP BY species
+                ORDER BY count DESC
+                LIMIT 10
+            )
+            -- One row: each aggregate is serialized once, whether or not the filters match any case
+            SELECT
+                (SELECT json_agg(json_build_array(
+                            d.month, d.disease_cases, d.contagious_cases, d.species_diversity,
+                            d.severe_cases, d.unique_diseases,
+                            COALESCE(a.appointment_count, 0), COALESCE(a.unique_pets_seen, 0),
+                            COALESCE(r.record_count, 0), COALESCE(r.follow_ups, 0))
+                        ORDER BY d.month)
+                 FROM disease d
+                 LEFT JOIN appts a ON a.month = d.month
+                 LEFT JOIN records r ON r.month = d.month) AS monthly,
+                (SELECT COUNT(*) FROM appts) AS appointment_months,
+                (SELECT COUNT(*) FROM records) AS record_months,
+                (SELECT json_agg(json_build_array(cm.disease_category, cm.month, cm.cases)
+                                 ORDER BY cf.first_date, cf.first_case, cm.month)
+                 FROM category_months cm JOIN category_first cf USING (disease_category)) AS category_months,
+                (SELECT json_agg(json_build_array(species, count, avg_age_months) ORDER BY count DESC)
+                 FROM demographics) AS demographics
+        """
+
         with self.db as db:
-            results = db.execute_query(query)
-            return pd.DataFrame(results)
+            row = db.execute_query(query, tuple(params) if params else None)[0]
+
+        monthly_columns = [
+            'ds', 'disease_cases', 'contagious_cases', 'species_diversity', 'severe_cases',
+            'unique_diseases', 'appointment_count', 'unique_pets_seen', 'record_count', 'follow_ups'
+        ]
+        monthly = pd.DataFrame(row['monthly'] or [], columns=monthly_columns)
+        monthly['ds'] = pd.to_datetime(monthly['ds'])
+        for col in monthly_columns[1:]:
+            monthly[col] = pd.to_numeric(monthly[col])
+
+        category_months = pd.DataFrame(row['category_months'] or [], columns=['disease_category', 'ds', 'y'])
+        category_months['ds'] = pd.to_datetime(category_months['ds'])
+        category_months['y'] = category_months['y'].astype('int64')
+
+        demographics = pd.DataFrame(row['demographics'] or [], columns=['species', 'count', 'avg_age_months'])
+
+        return {
+            'monthly': monthly,
+            'appointment_months': int(row['appointment_months']),
+            'record_months': int(row['record_months']),
+            'category_months': category_months,
+            'demographics': demographics,
+        }
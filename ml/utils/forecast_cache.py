@@ -0,0 +1,119 @@
+"""
+Forecast Cache for Prophet Models
+Keeps fitted Prophet models and finished forecasts keyed by scope, valid for as
+long as the fingerprint of the monthly input data is unchanged
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from utils.metrics import cache_lookup
+
+
+def frame_fingerprint(*frames):
+    """
+    Content hash of one or more DataFrames (column names and values)
+
+    Returns:
+        str: Hex digest; equal frames give equal fingerprints
+    """
+    digest = hashlib.sha1()
+    for frame in frames:
+        digest.update('|'.join(map(str, frame.columns)).encode())
+        digest.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+class ForecastCache:
+    """
+    Thread-safe LRU map of key -> (fingerprint, value).
+
+    A lookup only hits when the stored fingerprint matches the caller's, so a
+    change in the underlying monthly data invalidates the entry on next use.
+    """
+
+    def __init__(self, max_entries=None):
+        """
+        Args:
+            max_entries (int): Entries kept before the least recently used is evicted
+        """
+        if max_entries is None:
+            max_entries = int(os.getenv('DISEASE_FORECAST_CACHE_SIZE', 64))
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'invalidations': 0, 'evictions': 0}
+
+    def get(self, key, fingerprint):
+        """
+        Args:
+            key (tuple): Cache key
+            fingerprint (str): Fingerprint of the data the value must be built from
+
+        Returns:
+            Cached value, or None on a miss or stale entry
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == fingerprint:
+                self._entries.move_to_end(key)
+                self._stats['hits'] += 1
+                value = entry[1]
+            else:
+                if entry is not None:
+                    del self._entries[key]
+                    self._stats['invalidations'] += 1
+                self._stats['misses'] += 1
+                value = None
+        # key[0] is the entry kind: 'forecast' (finished forecast) or 'fit' (fitted Prophet model)
+        cache_lookup(f'disease_{key[0]}', value is not None)
+        return value
+
+    def put(self, key, fingerprint, value):
+        with self._lock:
+            self._entries[key] = (fingerprint, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self):
+        """
+        Get cache statistics
+
+        Returns:
+            dict: Hit/miss/invalidation counters, hit ratio and entry counts by kind
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            kinds = {}
+            for key in self._entries:
+                kinds[key[0]] = kinds.get(key[0], 0) + 1
+            stats['entries'] = len(self._entries)
+            stats['entries_by_kind'] = kinds
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_ratio'] = round(stats['hits'] / lookups, 4) if lookups else None
+        stats['max_entries'] = self.max_entries
+        return stats
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_forecast_cache():
+    """Returns the process-wide ForecastCache, creating it on first use"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ForecastCache()
+    return _cache
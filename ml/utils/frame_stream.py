@@ -0,0 +1,87 @@
+"""
+Chunked DataFrame Streams for ML Data Loading
+Reads query results through a server-side cursor in bounded memory
+"""
+
+import pandas as pd
+from config.db_connection import get_db_connection
+
+
+def apply_dtypes(df, dtypes):
+    """
+    Coerce DataFrame columns to the given dtypes in place
+
+    Args:
+        df (pd.DataFrame): Frame to convert
+        dtypes (dict): Column name -> pandas dtype string
+
+    Returns:
+        pd.DataFrame: The same frame, converted
+    """
+    for col, dtype in (dtypes or {}).items():
+        if col not in df.columns:
+            continue
+        if dtype.startswith('datetime64'):
+            df[col] = pd.to_datetime(df[col])
+        elif dtype == 'float64':
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype('float64')
+        else:
+            df[col] = df[col].astype(dtype)
+    return df
+
+
+class FrameStream:
+    """
+    Lazily executed query whose results arrive as DataFrame chunks.
+
+    Iterating opens a pooled connection, declares a named server-side cursor and
+    yields one typed DataFrame per `itersize` rows, so peak memory is bounded by
+    the chunk size rather than the table size. Each iteration re-runs the query.
+    """
+
+    def __init__(self, query, params=None, itersize=5000, dtypes=None):
+        """
+        Args:
+            query (str): SQL query to execute
+            params (tuple): Query parameters
+            itersize (int): Rows per chunk
+            dtypes (dict): Column name -> dtype applied to every chunk
+        """
+        self.query = query
+        self.params = params
+        self.itersize = itersize
+        self.dtypes = dtypes or {}
+        self.columns = None
+
+    def __iter__(self):
+        db = get_db_connection()
+        with db:
+            for columns, rows in db.stream_query(self.query, self.params, self.itersize):
+                self.columns = columns
+                if not rows:
+                    continue
+                yield apply_dtypes(pd.DataFrame.from_records(rows, columns=columns), self.dtypes)
+
+    def iter_columns(self):
+        """
+        Yield each chunk as a dict of NumPy column arrays
+
+        Yields:
+            dict: Column name -> np.ndarray
+        """
+        for chunk in self:
+            yield {col: chunk[col].to_numpy() for col in chunk.columns}
+
+    def to_frame(self):
+        """
+        Concatenate all chunks into a single typed DataFrame
+
+        Returns:
+            pd.DataFrame: Full result set
+        """
+        chunks = list(self)
+        if not chunks:
+            return apply_dtypes(pd.DataFrame(columns=self.columns or []), self.dtypes)
+        if len(chunks) == 1:
+            return chunks[0]
+        return pd.concat(chunks, ignore_index=True)
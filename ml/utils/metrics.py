@@ -0,0 +1,261 @@
+"""
+Prometheus Metrics for the ML Service
+Request latency, database, model inference, Prophet, cache and model load
+metrics exposed at /metrics; every helper is a no-op without prometheus_client
+"""
+
+import functools
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import prometheus_client
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    prometheus_client = None
+    PROMETHEUS_AVAILABLE = False
+    print("Warning: prometheus_client not available. /metrics is disabled.")
+
+# Seconds; from sub-millisecond single-case predictions to multi-minute fits
+FAST_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+SLOW_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+_metrics = None
+_metrics_lock = threading.Lock()
+
+
+def _build():
+    """Create the metric objects once per process (they register themselves)"""
+    from prometheus_client import Counter, Gauge, Histogram
+    return {
+        'request_seconds': Histogram(
+            'ml_http_request_duration_seconds', 'Request latency by route',
+            ['method', 'route', 'status']),
+        'in_flight': Gauge(
+            'ml_http_requests_in_flight', 'Requests being served by route',
+            ['method', 'route'], multiprocess_mode='livesum'),
+        'request_errors': Counter(
+            'ml_http_request_errors_total', 'Responses with a 4xx/5xx status or an unhandled exception',
+            ['method', 'route', 'status']),
+        'db_seconds': Histogram(
+            'ml_db_query_duration_seconds', 'Database query time by loader method',
+            ['method'], buckets=SLOW_BUCKETS),
+        'db_rows': Counter(
+            'ml_db_rows_total', 'Rows returned by loader method', ['method']),
+        'db_errors': Counter(
+            'ml_db_query_errors_total', 'Failed queries by loader method', ['method']),
+        'inference_seconds': Histogram(
+            'ml_model_inference_duration_seconds', 'Model inference time',
+            ['model', 'operation'], buckets=FAST_BUCKETS + SLOW_BUCKETS[-6:]),
+        'prophet_seconds': Histogram(
+            'ml_prophet_duration_seconds', 'Prophet fit and predict time',
+            ['model', 'phase'], buckets=SLOW_BUCKETS),
+        'cache_requests': Counter(
+            'ml_cache_requests_total', 'Cache lookups by cache and result (hit/miss)',
+            ['cache', 'result']),
+        'model_load_seconds': Histogram(
+            'ml_model_load_duration_seconds', 'Model artifact load time',
+            ['model'], buckets=SLOW_BUCKETS),
+    }
+
+
+def _get():
+    global _metrics
+    if not PROMETHEUS_AVAILABLE:
+        return None
+    if _metrics is None:
+        with _metrics_lock:
+            if _metrics is None:
+                _metrics = _build()
+    return _metrics
+
+
+def _rows(result):
+    """Row count of a loader result: a DataFrame, or a tuple/dict of them"""
+    if isinstance(result, dict):
+        result = tuple(result.values())
+    if isinstance(result, tuple):
+        return sum(_rows(part) for part in result)
+    shape = getattr(result, 'shape', None)
+    return shape[0] if shape else 0
+
+
+# ----------------------------------------------------------------------
+# Requests
+# ----------------------------------------------------------------------
+
+def track_requests(app):
+    """
+    Record latency, in-flight count and errors for every route of a Flask app
+
+    Args:
+        app (Flask): Application to instrument
+    """
+    if _get() is None:
+        return
+    from flask import g, request
+
+    def route():
+        return request.url_rule.rule if request.url_rule is not None else '<unmatched>'
+
+    @app.before_request
+    def _start_request_timer():
+        g.metrics_started = time.perf_counter()
+        g.metrics_route = route()
+        _get()['in_flight'].labels(request.method, g.metrics_route).inc()
+
+    @app.after_request
+    def _observe_request(response):
+        started = g.pop('metrics_started', None)
+        if started is not None:
+            metrics = _get()
+            status = str(response.status_code)
+            metrics['request_seconds'].labels(request.method, g.metrics_route, status).observe(
+                time.perf_counter() - started)
+            if response.status_code >= 400:
+                metrics['request_errors'].labels(request.method, g.metrics_route, status).inc()
+        return response
+
+    @app.teardown_request
+    def _finish_request(exc):
+        route_name = g.pop('metrics_route', None)
+        if route_name is None:
+            return
+        metrics = _get()
+        metrics['in_flight'].labels(request.method, route_name).dec()
+        # after_request is skipped when a view raises; count it as a 500
+        if g.pop('metrics_started', None) is not None:
+            metrics['request_errors'].labels(request.method, route_name, '500').inc()
+
+
+def render_metrics():
+    """
+    Returns:
+        tuple: (body bytes, content type), or None without prometheus_client.
+            Under gunicorn (PROMETHEUS_MULTIPROC_DIR set) the body aggregates all workers
+    """
+    if _get() is None:
+        return None
+    from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, generate_latest
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+# ----------------------------------------------------------------------
+# Database, models, caches
+# ----------------------------------------------------------------------
+
+class _TimedStream:
+    """
+    Wraps a streamed loader result (FrameStream) so its query is recorded when
+    iteration ends: time spent fetching chunks (not the caller's work between
+    them), rows yielded, and failures. Each iteration is one observation.
+    """
+
+    def __init__(self, stream, method, metrics):
+        self._stream = stream
+        self._method = method
+        self._metrics = metrics
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+    def __iter__(self):
+        chunks = iter(self._stream)
+        seconds = 0.0
+        rows = 0
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    chunk = next(chunks)
+                except StopIteration:
+                    return
+                finally:
+                    seconds += time.perf_counter() - start
+                rows += _rows(chunk)
+                yield chunk
+        except GeneratorExit:
+            chunks.close()
+            raise
+        except Exception:
+            self._metrics['db_errors'].labels(self._method).inc()
+            raise
+        finally:
+            self._metrics['db_seconds'].labels(self._method).observe(seconds)
+            self._metrics['db_rows'].labels(self._method).inc(rows)
+
+    def iter_columns(self):
+        return type(self._stream).iter_columns(self)
+
+    def to_frame(self):
+        return type(self._stream).to_frame(self)
+
+
+def timed_query(fn):
+    """
+    Decorator for data loading methods: query time, row count and failures
+    labelled <Class>.<method>. Streamed results (FrameStream) are recorded when
+    the caller finishes iterating them, since that is when their query runs.
+    """
+    @functools.wraps(fn)
+    def wrapper(self, *args, **kwargs):
+        metrics = _get()
+        if metrics is None:
+            return fn(self, *args, **kwargs)
+        method = f'{type(self).__name__}.{fn.__name__}'
+        start = time.perf_counter()
+        try:
+            result = fn(self, *args, **kwargs)
+        except Exception:
+            metrics['db_errors'].labels(method).inc()
+            raise
+        if hasattr(result, 'iter_columns'):
+            return _TimedStream(result, method, metrics)
+        if isinstance(result, (tuple, dict)) or hasattr(result, 'shape'):
+            metrics['db_seconds'].labels(method).observe(time.perf_counter() - start)
+            metrics['db_rows'].labels(method).inc(_rows(result))
+        return result
+    return wrapper
+
+
+@contextmanager
+def model_inference(model, operation):
+    """Time a model call, e.g. with model_inference('disease', 'predict'): ..."""
+    metrics = _get()
+    if metrics is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics['inference_seconds'].labels(model, operation).observe(time.perf_counter() - start)
+
+
+def observe_prophet(model, phase, seconds):
+    """Record one Prophet fit or predict ('fit' / 'predict') of the given model"""
+    metrics = _get()
+    if metrics is not None:
+        metrics['prophet_seconds'].labels(model, phase).observe(seconds)
+
+
+def cache_lookup(cache, hit):
+    """Count a cache hit or miss; hit ratio = hits / all lookups of that cache"""
+    metrics = _get()
+    if metrics is not None:
+        metrics['cache_requests'].labels(cache, 'hit' if hit else 'miss').inc()
+
+
+def observe_model_load(model, seconds):
+    """Record how long a model artifact took to load and restore"""
+    metrics = _get()
+    if metrics is not None:
+        metrics['model_load_seconds'].labels(model).observe(seconds)
@@ -0,0 +1,133 @@
+"""
+Memory-Mapped Model Artifacts
+Saves a model with its large NumPy arrays in separate .npy files so every
+worker process can load them with mmap_mode and share the pages read-only
+"""
+
+import os
+import pickle
+import shutil
+import uuid
+
+import numpy as np
+
+# First bytes of an artifact pickle; files without it are legacy joblib pickles
+ARTIFACT_MAGIC = b'VCPA1\n'
+
+
+class _ArrayPickler(pickle.Pickler):
+    """Pickler that writes large numeric arrays to <arrays_dir>/<n>.npy instead of the stream"""
+
+    def __init__(self, file, arrays_dir, min_bytes):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.arrays_dir = arrays_dir
+        self.min_bytes = min_bytes
+        self.array_count = 0
+        self.array_bytes = 0
+
+    def persistent_id(self, obj):
+        if (type(obj) is np.ndarray or isinstance(obj, np.memmap)) and not obj.dtype.hasobject \
+                and obj.nbytes >= self.min_bytes:
+            if self.array_count == 0:
+                os.makedirs(self.arrays_dir)
+            name = f'{self.array_count}.npy'
+            np.save(os.path.join(self.arrays_dir, name), np.ascontiguousarray(obj), allow_pickle=False)
+            self.array_count += 1
+            self.array_bytes += obj.nbytes
+            return os.path.basename(self.arrays_dir), name
+        return None
+
+
+class _ArrayUnpickler(pickle.Unpickler):
+
+    def __init__(self, file, base_dir, mmap_mode):
+        super().__init__(file)
+        self.base_dir = base_dir
+        self.mmap_mode = mmap_mode
+
+    def persistent_load(self, pid):
+        arrays_dir, name = pid
+        if os.sep in arrays_dir or os.sep in name or arrays_dir.startswith('..'):
+            raise pickle.UnpicklingError(f'Invalid array reference {pid!r}')
+        return np.load(os.path.join(self.base_dir, arrays_dir, name), mmap_mode=self.mmap_mode, allow_pickle=False)
+
+
+def _arrays_dirs(path):
+    prefix = os.path.basename(path) + '.'
+    directory = os.path.dirname(path) or '.'
+    return [
+        os.path.join(directory, entry) for entry in os.listdir(directory)
+        if entry.startswith(prefix) and entry.endswith('.arrays')
+    ]
+
+
+def save_artifact(obj, path, min_bytes=None):
+    """
+    Save obj to path, with every numeric array of at least min_bytes in a
+    sibling <path>.<token>.arrays/ directory
+
+    The pickle is written to a temporary file and renamed into place after its
+    arrays are on disk, so a concurrent load sees either the old or the new
+    artifact. Array directories of the replaced artifact are removed.
+
+    Args:
+        obj: Object to save (model dict, estimator, ...)
+        path (str): Artifact path, e.g. models/disease_prediction_20250101.pkl
+        min_bytes (int): Smallest array stored separately (ML_ARTIFACT_MIN_ARRAY_BYTES, default 64 KiB)
+
+    Returns:
+        dict: Separately stored array count and bytes
+    """
+    if min_bytes is None:
+        min_bytes = int(os.getenv('ML_ARTIFACT_MIN_ARRAY_BYTES', 65536))
+    stale = _arrays_dirs(path) if os.path.exists(os.path.dirname(path) or '.') else []
+    token = uuid.uuid4().hex[:8]
+    arrays_dir = f'{path}.{token}.arrays'
+    tmp = f'{path}.{token}.tmp'
+    try:
+        with open(tmp, 'wb') as f:
+            f.write(ARTIFACT_MAGIC)
+            pickler = _ArrayPickler(f, arrays_dir, min_bytes)
+            pickler.dump(obj)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        shutil.rmtree(arrays_dir, ignore_errors=True)
+        raise
+    for directory in stale:
+        shutil.rmtree(directory, ignore_errors=True)
+    return {'arrays': pickler.array_count, 'array_bytes': pickler.array_bytes}
+
+
+def load_artifact(path, mmap_mode=None):
+    """
+    Load an artifact written by save_artifact, or a legacy joblib pickle
+
+    Args:
+        path (str): Artifact path
+        mmap_mode (str): np.load mmap mode for the separate arrays
+            (ML_ARTIFACT_MMAP_MODE, default 'c' = shared pages, private copy on write;
+            'none' reads them into memory)
+
+    Returns:
+        The saved object
+    """
+    if mmap_mode is None:
+        mmap_mode = os.getenv('ML_ARTIFACT_MMAP_MODE', 'c')
+    if mmap_mode in ('', 'none'):
+        mmap_mode = None
+    with open(path, 'rb') as f:
+        if f.read(len(ARTIFACT_MAGIC)) == ARTIFACT_MAGIC:
+            return _ArrayUnpickler(f, os.path.dirname(path) or '.', mmap_mode).load()
+    import joblib
+    return joblib.load(path)
+
+
+def remove_artifact(path):
+    """Delete an artifact and its array directories"""
+    for directory in _arrays_dirs(path):
+        shutil.rmtree(directory, ignore_errors=True)
+    if os.path.exists(path):
+        os.remove(path)
+
@@ -4,10 +4,12 @@ Provides common functionality for all ML models
 """
 
 import os
-import joblib
 from datetime import datetime
 from abc import ABC, abstractmethod
 
+from utils.model_artifacts import save_artifact, load_artifact
+from utils.model_registry import get_model_registry
+
 
 class BaseMLModel(ABC):
     """Abstract base class for all ML models"""
@@ -23,6 +25,7 @@ class BaseMLModel(ABC):
         self.model = None
         self.trained_date = None
         self.model_path = os.getenv('MODEL_PATH', './models')
+        self.progress_callback = None
         
         # Create model directory if it doesn't exist
         os.makedirs(self.model_path, exist_ok=True)
@@ -50,24 +53,45 @@ class BaseMLModel(ABC):
         """
         pass
     
-    def save_model(self):
-        """Save the trained model to disk"""
+    def report_stage(self, stage):
+        """
+        Report the current training stage (used by background training jobs)
+
+        Args:
+            stage (str): Stage name, e.g. 'loading_data'
+        """
+        if self.progress_callback is not None:
+            self.progress_callback(stage)
+
+    def save_model(self, metrics=None):
+        """
+        Save the trained model to disk as the next registry version; large
+        arrays go to a sibling .arrays directory so workers can memory-map
+        them (see utils.model_artifacts)
+
+        Args:
+            metrics (dict): Training metrics recorded with the version
+
+        Returns:
+            str: Path of the saved artifact
+        """
         if self.model is None:
             raise ValueError("No model to save. Train the model first.")
         
-        model_file = os.path.join(
-            self.model_path, 
-            f"{self.model_name}_{datetime.now().strftime('%Y%m%d')}.pkl"
-        )
+        registry = get_model_registry(self.model_path)
+        version, model_file = registry.reserve(self.model_name)
         
         model_data = {
             'model': self.model,
             'trained_date': datetime.now(),
-            'model_name': self.model_name
+            'model_name': self.model_name,
+            'version': version
         }
         
-        joblib.dump(model_data, model_file)
-        print(f"Model saved to {model_file}")
+        stored = save_artifact(model_data, model_file)
+        registry.register(self.model_name, version, model_file, metrics=metrics)
+        print(f"Model saved to {model_file} (version {version}, {stored['arrays']} arrays, "
+              f"{stored['array_bytes'] / 1e6:.1f} MB memory-mappable)")
         return model_file
     
     def load_model(self, model_file=None):
@@ -75,22 +99,16 @@ class BaseMLModel(ABC):
         Load a trained model from disk
         
         Args:
-            model_file (str): Path to model file. If None, loads the latest model.
+            model_file (str): Path to model file. If None, loads the version the
+                registry serves (pinned, else newest).
         """
         if model_file is None:
-            # Find the latest model file
-            model_files = [
-                f for f in os.listdir(self.model_path) 
-                if f.startswith(self.model_name) and f.endswith('.pkl')
-            ]
-            
-            if not model_files:
+            entry = get_model_registry(self.model_path).resolve(self.model_name)
+            if entry is None:
                 raise FileNotFoundError(f"No saved models found for {self.model_name}")
-            
-            model_files.sort(reverse=True)
-            model_file = os.path.join(self.model_path, model_files[0])
+            model_file = entry['path']
         
-        model_data = joblib.load(model_file)
+        model_data = load_artifact(model_file)
         self.model = model_data['model']
         self.trained_date = model_data['trained_date']
         
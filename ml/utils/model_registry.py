@@ -0,0 +1,325 @@
+"""
+Versioned Model Registry
+Manifest-backed index of saved model artifacts with monotonically increasing
+versions, content hashes, training metrics, pinning and retention
+"""
+
+import fcntl
+import glob
+import hashlib
+import json
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+MANIFEST_NAME = 'registry.json'
+
+
+def _json_default(value):
+    # NumPy scalars in training metrics
+    return value.item() if hasattr(value, 'item') else str(value)
+
+
+class ModelRegistry:
+    """
+    Index of model versions in one models directory.
+
+    models/registry.json maps each model name to its versions (file, sha256,
+    size, created_at, metrics, last load time), the active version (newest
+    saved) and an optional pin. Lookups read the manifest, re-parsed only
+    when its mtime changes, so finding the served file is one stat() however
+    many artifacts the directory holds. Writers from any process (training
+    workers, gunicorn workers, scripts) serialize on an flock'd lock file and
+    replace the manifest atomically.
+    """
+
+    def __init__(self, models_dir, keep=None):
+        """
+        Args:
+            models_dir (str): Directory holding the artifacts and registry.json
+            keep (int): Versions kept per model by gc (ML_MODEL_KEEP_VERSIONS, default 5);
+                the active and pinned versions are always kept
+        """
+        if keep is None:
+            keep = int(os.getenv('ML_MODEL_KEEP_VERSIONS', 5))
+        self.models_dir = os.path.abspath(models_dir)
+        self.keep = max(1, keep)
+        self.manifest_path = os.path.join(self.models_dir, MANIFEST_NAME)
+        self._lock_path = os.path.join(self.models_dir, '.registry.lock')
+        self._lock = threading.Lock()
+        self._cache = None
+        self._cache_key = None
+
+    # ------------------------------------------------------------------
+    # Manifest I/O
+    # ------------------------------------------------------------------
+
+    def _read(self):
+        try:
+            stat = os.stat(self.manifest_path)
+        except FileNotFoundError:
+            return {'models': {}}
+        key = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        with self._lock:
+            if key != self._cache_key:
+                with open(self.manifest_path) as f:
+                    self._cache = json.load(f)
+                self._cache_key = key
+            return self._cache
+
+    @contextmanager
+    def _transaction(self):
+        """Exclusive read-modify-write of the manifest across processes"""
+        os.makedirs(self.models_dir, exist_ok=True)
+        with open(self._lock_path, 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                try:
+                    with open(self.manifest_path) as f:
+                        manifest = json.load(f)
+                except FileNotFoundError:
+                    manifest = {'models': {}}
+                yield manifest
+                tmp = f'{self.manifest_path}.{os.getpid()}.tmp'
+                with open(tmp, 'w') as f:
+                    json.dump(manifest, f, indent=2, default=_json_default)
+                os.replace(tmp, self.manifest_path)
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _model(manifest, name):
+        return manifest['models'].setdefault(name, {'next_version': 1, 'active': None, 'pinned': None, 'versions': {}})
+
+    # ------------------------------------------------------------------
+    # Saving
+    # ------------------------------------------------------------------
+
+    def reserve(self, name):
+        """
+        Allocate the next version number and its artifact path
+
+        Args:
+            name (str): Model name, e.g. 'disease_prediction'
+
+        Returns:
+            tuple: (version, path); the version is never handed out twice
+        """
+        self.adopt_legacy(name)
+        with self._transaction() as manifest:
+            model = self._model(manifest, name)
+            version = model['next_version']
+            model['next_version'] = version + 1
+        filename = f"{name}_v{version:04d}_{datetime.now().strftime('%Y%m%d')}.pkl"
+        return version, os.path.join(self.models_dir, filename)
+
+    def register(self, name, version, path, metrics=None, activate=True):
+        """
+        Record a saved artifact as a version, make it active and apply retention
+
+        Args:
+            name (str): Model name
+            version (int): Version from reserve()
+            path (str): Artifact path from reserve()
+            metrics (dict): Training metrics to keep with the version
+            activate (bool): Serve this version (unless the model is pinned)
+
+        Returns:
+            dict: The version entry
+        """
+        entry = {
+            'version': version,
+            'file': os.path.basename(path),
+            'sha256': self._sha256(path),
+            'size_bytes': os.path.getsize(path),
+            'created_at': datetime.now().isoformat(),
+            'metrics': metrics or {},
+            'load_seconds': None,
+            'loaded_at': None,
+        }
+        with self._transaction() as manifest:
+            model = self._model(manifest, name)
+            model['versions'][str(version)] = entry
+            if activate:
+                model['active'] = version
+            removed = self._gc(model)
+        from utils.model_artifacts import remove_artifact
+        for filename in removed:
+            remove_artifact(os.path.join(self.models_dir, filename))
+        return entry
+
+    @staticmethod
+    def _sha256(path):
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _gc(self, model):
+        # Caller holds the transaction; returns files to delete once it commits
+        protected = {model['active'], model['pinned']}
+        versions = sorted(int(v) for v in model['versions'])
+        removable = [v for v in versions[:-self.keep] if v not in protected]
+        return [model['versions'].pop(str(v))['file'] for v in removable]
+
+    def adopt_legacy(self, name):
+        """
+        One-time import of files saved before the registry (<name>_*.pkl not in
+        the manifest), oldest first, so the newest stays active
+        """
+        if name in self._read()['models']:
+            return
+        legacy = sorted(glob.glob(os.path.join(self.models_dir, f'{name}_*.pkl')))
+        with self._transaction() as manifest:
+            if name in manifest['models']:
+                return
+            model = self._model(manifest, name)
+            for path in legacy:
+                version = model['next_version']
+                model['next_version'] = version + 1
+                stat = os.stat(path)
+                model['versions'][str(version)] = {
+                    'version': version,
+                    'file': os.path.basename(path),
+                    'sha256': self._sha256(path),
+                    'size_bytes': stat.st_size,
+                    'created_at': datetime.fromtimestamp(stat.st_mtime).isoformat(),
+                    'metrics': {},
+                    'load_seconds': None,
+                    'loaded_at': None,
+                    'legacy': True,
+                }
+                model['active'] = version
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def resolve(self, name):
+        """
+        Version to serve: the pinned one, else the active (newest saved) one
+
+        Args:
+            name (str): Model name
+
+        Returns:
+            dict: Version entry plus 'path', or None if the model has no versions
+        """
+        model = self._read()['models'].get(name)
+        if model is None:
+            self.adopt_legacy(name)
+            model = self._read()['models'].get(name)
+        if model is None:
+            return None
+        version = model['pinned'] or model['active']
+        entry = model['versions'].get(str(version)) if version else None
+        if entry is None:
+            return None
+        return dict(entry, path=os.path.join(self.models_dir, entry['file']), pinned=model['pinned'] is not None)
+
+    def versions(self, name):
+        """
+        Returns:
+            dict: active/pinned version and every retained version, newest first
+        """
+        model = self._read()['models'].get(name)
+        if model is None:
+            return {'active': None, 'pinned': None, 'versions': []}
+        return {
+            'active': model['active'],
+            'pinned': model['pinned'],
+            'versions': [model['versions'][v] for v in sorted(model['versions'], key=int, reverse=True)],
+        }
+
+    def record_load(self, name, version, seconds):
+        """Store how long the latest load of a version took"""
+        try:
+            with self._transaction() as manifest:
+                entry = self._model(manifest, name)['versions'].get(str(version))
+                if entry is not None:
+                    entry['load_seconds'] = round(seconds, 3)
+                    entry['loaded_at'] = datetime.now().isoformat()
+        except OSError as e:
+            print(f"⚠️  Could not record model load time: {str(e)}")
+
+    # ------------------------------------------------------------------
+    # Pinning and rollback
+    # ------------------------------------------------------------------
+
+    def pin(self, name, version):
+        """
+        Serve a specific retained version until unpinned; new trainings are
+        registered but not served
+
+        Raises:
+            ValueError: If the version is not in the registry
+        """
+        with self._transaction() as manifest:
+            model = self._model(manifest, name)
+            if str(version) not in model['versions']:
+                raise ValueError(f"{name} has no version {version}. "
+                                 f"Retained: {', '.join(sorted(model['versions'], key=int)) or 'none'}")
+            model['pinned'] = int(version)
+
+    def unpin(self, name):
+        """Return to serving the active (newest) version"""
+        with self._transaction() as manifest:
+            self._model(manifest, name)['pinned'] = None
+
+    def rollback(self, name):
+        """
+        Pin the version before the one currently served
+
+        Returns:
+            int: The version now pinned
+
+        Raises:
+            ValueError: If there is no older retained version
+        """
+        with self._transaction() as manifest:
+            model = self._model(manifest, name)
+            current = model['pinned'] or model['active']
+            older = [int(v) for v in model['versions'] if current is None or int(v) < current]
+            if not older:
+                raise ValueError(f"{name} has no version older than {current} to roll back to")
+            model['pinned'] = max(older)
+            return model['pinned']
+
+    def get_stats(self):
+        """
+        Returns:
+            dict: Served version, pin and retained version count per model
+        """
+        models = self._read()['models']
+        return {
+            'manifest': self.manifest_path,
+            'keep_versions': self.keep,
+            'models': {
+                name: {
+                    'active': m['active'],
+                    'pinned': m['pinned'],
+                    'retained': len(m['versions']),
+                }
+                for name, m in models.items()
+            },
+        }
+
+
+_registries = {}
+_registries_lock = threading.Lock()
+
+
+def get_model_registry(models_dir=None):
+    """
+    Returns the process-wide ModelRegistry for a models directory, creating it on first use
+
+    Args:
+        models_dir (str): Models directory (default: MODEL_PATH, ./models)
+    """
+    models_dir = os.path.abspath(models_dir or os.getenv('MODEL_PATH', './models'))
+    with _registries_lock:
+        if models_dir not in _registries:
+            _registries[models_dir] = ModelRegistry(models_dir)
+        return _registries[models_dir]
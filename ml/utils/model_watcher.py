@@ -0,0 +1,245 @@
+"""
+Model Hot Reload
+Watches the model registry and reloads a model in the background when the
+served version changes, either by polling or on a Postgres NOTIFY
+"""
+
+import os
+import select
+import threading
+from datetime import datetime
+
+from utils.model_registry import get_model_registry
+
+
+class ModelWatcher:
+    """
+    Reloads models when the version the registry serves changes.
+
+    Each model is identified by the (version, path) the registry resolves
+    to: a new training, a pin or a rollback all change it.
+    A reload calls the model's loader, which restores the new model into a
+    local object and rebinds the served global only at the end, so requests
+    in flight keep the model they started with and nothing waits on the load.
+
+    Every process (each gunicorn worker) runs its own watcher. Changes are
+    picked up by polling every interval seconds, and immediately when
+    LISTEN/NOTIFY is enabled: the process that finishes a training job sends
+    NOTIFY <channel>, '<model key>' and every listening worker checks that model.
+    """
+
+    def __init__(self, models_dir, interval=None, notify=None, channel=None):
+        """
+        Args:
+            models_dir (str): Models directory (its registry.json is polled)
+            interval (float): Poll interval in seconds (ML_MODEL_RELOAD_INTERVAL,
+                default 30); 0 disables polling
+            notify (bool): Also LISTEN for reload notifications (ML_MODEL_RELOAD_NOTIFY)
+            channel (str): Postgres channel (ML_MODEL_RELOAD_CHANNEL, default ml_model_updated)
+        """
+        if interval is None:
+            interval = float(os.getenv('ML_MODEL_RELOAD_INTERVAL', 30))
+        if notify is None:
+            notify = os.getenv('ML_MODEL_RELOAD_NOTIFY', 'false').lower() == 'true'
+        self.models_dir = models_dir
+        self.registry = get_model_registry(models_dir)
+        self.interval = max(0.0, interval)
+        self.notify_enabled = notify
+        self.channel = channel or os.getenv('ML_MODEL_RELOAD_CHANNEL', 'ml_model_updated')
+        self._models = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._pid = None
+        self._wait_for = None
+        self._stats = {'checks': 0, 'reloads': 0, 'reload_failures': 0,
+                       'notifications_sent': 0, 'notifications_received': 0}
+        self._listener_error = None
+
+    def register(self, name, model_name, loader):
+        """
+        Args:
+            name (str): Model key, e.g. 'disease'
+            model_name (str): Registry model name, e.g. 'disease_prediction'
+            loader (callable): fn() -> bool that loads the served version and swaps it in
+        """
+        self._models[name] = {
+            'model_name': model_name, 'loader': loader, 'loaded': None, 'reloaded_at': None,
+            'lock': threading.Lock(),
+        }
+
+    def signature(self, name):
+        """
+        Returns:
+            tuple: (version, path) the registry serves for the model, or None
+        """
+        entry = self.registry.resolve(self._models[name]['model_name'])
+        return (entry['version'], entry['path']) if entry else None
+
+    def mark_loaded(self, name):
+        """Record the currently served version as loaded (e.g. after startup)"""
+        entry = self._models.get(name)
+        if entry is not None:
+            entry['loaded'] = self.signature(name)
+
+    def reload(self, name, force=False):
+        """
+        Reload a model if the served version differs from the loaded one
+
+        Args:
+            name (str): Model key
+            force (bool): Reload even if the version looks unchanged
+
+        Returns:
+            bool: True when a new version was loaded and swapped in
+        """
+        entry = self._models[name]
+        with entry['lock']:
+            current = self.signature(name)
+            if current is None or (not force and current == entry['loaded']):
+                return False
+            loaded = entry['loader']()
+            with self._lock:
+                self._stats['reloads' if loaded else 'reload_failures'] += 1
+            if loaded:
+                entry['loaded'] = current
+                entry['reloaded_at'] = datetime.now().isoformat()
+                print(f"✓ Hot-reloaded {name} model v{current[0]} from {os.path.basename(current[1])}")
+            else:
+                # Don't retry a broken version every poll; wait for the next one
+                entry['loaded'] = current
+            return loaded
+
+    def check_all(self):
+        """Reload every model whose served version changed"""
+        with self._lock:
+            self._stats['checks'] += 1
+        for name in self._models:
+            try:
+                self.reload(name)
+            except Exception as e:
+                print(f"❌ Error reloading {name} model: {str(e)}")
+
+    def notify(self, name):
+        """
+        Tell the other workers that a model was retrained (no-op unless NOTIFY is enabled)
+
+        Args:
+            name (str): Model key, or 'all'
+        """
+        if not self.notify_enabled:
+            return
+        from config.db_connection import pooled_connection
+        try:
+            with pooled_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT pg_notify(%s, %s)", (self.channel, name))
+                conn.commit()
+                cursor.close()
+            with self._lock:
+                self._stats['notifications_sent'] += 1
+        except Exception as e:
+            print(f"⚠️  Could not send model reload notification: {str(e)}")
+
+    def _poll_loop(self):
+        if self._wait_for is not None:
+            self._wait_for.wait()
+        while not self._stop.wait(self.interval):
+            self.check_all()
+
+    def _handle_notification(self, payload):
+        with self._lock:
+            self._stats['notifications_received'] += 1
+        names = list(self._models) if payload == 'all' else [payload]
+        for name in names:
+            if name in self._models:
+                self.reload(name)
+
+    def _listen_loop(self):
+        """Hold a dedicated connection in LISTEN; reconnect with backoff on errors"""
+        import psycopg2
+        from psycopg2 import sql
+        from config.db_connection import get_connection_params
+
+        backoff = 1
+        while not self._stop.is_set():
+            conn = None
+            try:
+                conn = psycopg2.connect(**get_connection_params())
+                conn.autocommit = True
+                cursor = conn.cursor()
+                cursor.execute(sql.SQL("LISTEN {}").format(sql.Identifier(self.channel)))
+                self._listener_error = None
+                backoff = 1
+                while not self._stop.is_set():
+                    if select.select([conn], [], [], 5)[0]:
+                        conn.poll()
+                        while conn.notifies:
+                            self._handle_notification(conn.notifies.pop(0).payload)
+            except Exception as e:
+                self._listener_error = str(e)
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 60)
+            finally:
+                if conn is not None:
+                    conn.close()
+
+    def start(self, wait_for=None):
+        """
+        Start the poll and listen threads for this process (idempotent; call
+        again after fork, since threads do not survive it)
+
+        Args:
+            wait_for: Object with wait() (e.g. the StartupTracker); polling
+                starts once it returns, so startup loads aren't repeated
+        """
+        self._wait_for = wait_for
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+        if self.interval:
+            threading.Thread(target=self._poll_loop, name='model-watcher', daemon=True).start()
+        if self.notify_enabled:
+            threading.Thread(target=self._listen_loop, name='model-listener', daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+
+    def get_stats(self):
+        """
+        Returns:
+            dict: Reload settings, counters and the loaded file per model
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        stats.update({
+            'poll_interval_seconds': self.interval,
+            'notify': self.notify_enabled,
+            'channel': self.channel,
+            'listener_error': self._listener_error,
+            'models': {
+                name: {
+                    'loaded_version': m['loaded'][0] if m['loaded'] else None,
+                    'loaded_file': os.path.basename(m['loaded'][1]) if m['loaded'] else None,
+                    'reloaded_at': m['reloaded_at'],
+                }
+                for name, m in self._models.items()
+            },
+        })
+        return stats
+
+
+_watcher = None
+_watcher_lock = threading.Lock()
+
+
+def get_model_watcher(models_dir=None):
+    """Returns the process-wide ModelWatcher, creating it on first use"""
+    global _watcher
+    if _watcher is None:
+        with _watcher_lock:
+            if _watcher is None:
+                if models_dir is None:
+                    models_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'models')
+                _watcher = ModelWatcher(models_dir)
+    return _watcher
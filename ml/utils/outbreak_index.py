@@ -0,0 +1,432 @@
+"""
+Prefix-Sum Outbreak Risk Index
+Daily case-count cube over species x disease_category x region with cumulative
+sums along the date axis, so outbreak-risk windows are answered by array lookups
+"""
+
+import threading
+from datetime import datetime
+from itertools import product
+
+import numpy as np
+import pandas as pd
+
+from utils.case_store import get_case_store
+
+DIMS = ('species', 'disease_category', 'region')
+MEASURES = ('total', 'contagious', 'severe')
+SEVERE_LEVELS = ('severe', 'critical')
+
+
+def _day(value):
+    """Coerce a date/datetime/Timestamp to days since the epoch"""
+    return int(np.datetime64(pd.Timestamp(value).date(), 'D').astype('int64'))
+
+
+def _work_frame(frame):
+    """Reduce snapshot rows to the columns the index aggregates"""
+    return pd.DataFrame({
+        'species': frame['species'],
+        'disease_category': frame['disease_category'],
+        'region': frame['region'],
+        'disease_name': frame['disease_name'],
+        'case_id': frame['case_id'].to_numpy(dtype='int64'),
+        'date': frame['diagnosis_date'].to_numpy().astype('datetime64[D]').astype('int64'),
+        'total': 1,
+        'contagious': frame['is_contagious'].fillna(False).to_numpy(dtype=bool).astype('int64'),
+        'severe': frame['severity'].isin(SEVERE_LEVELS).to_numpy().astype('int64'),
+    })
+
+
+def _scope_combinations():
+    """Every subset of DIMS; a scope key holds None for dimensions not filtered on"""
+    for fixed in product((False, True), repeat=len(DIMS)):
+        yield [d for d, f in zip(DIMS, fixed) if f]
+
+
+def _scope_keys(grouped, dims):
+    """Scope key tuples for the rows of a reset_index()ed groupby result"""
+    cols = [grouped[d].tolist() if d in dims else [None] * len(grouped) for d in DIMS]
+    return list(zip(*cols))
+
+
+class _IndexState:
+    """Immutable index contents for one snapshot of the case store"""
+
+    __slots__ = ('source', 'origin', 'n_days', 'rows', 'cum', 'names', 'max_case_id', 'case_count')
+
+    def __init__(self, source, origin, n_days, rows, cum, names, max_case_id, case_count):
+        self.source = source
+        self.origin = origin
+        self.n_days = n_days
+        self.rows = rows            # scope key -> row in cum
+        self.cum = cum              # (len(MEASURES), len(rows), n_days + 1) prefix sums
+        self.names = names          # scope key -> {disease_name: (days, case_ids)} of contagious cases
+        self.max_case_id = max_case_id
+        self.case_count = case_count
+
+
+class OutbreakRiskIndex:
+    """
+    Prefix sums of daily total / contagious / severe case counts for every
+    species x disease_category x region scope (None = all), plus sorted
+    per-disease event arrays for contagious clusters.
+
+    The index follows the shared DiseaseCaseStore: appended cases are folded in
+    incrementally, anything else (updates, deletions, full reloads) triggers a
+    rebuild on the next lookup.
+    """
+
+    def __init__(self, store=None):
+        """
+        Args:
+            store (DiseaseCaseStore): Case source (default: the shared store)
+        """
+        self.store = store or get_case_store()
+        self._state = None
+        self._lock = threading.Lock()
+        self._stats = {'builds': 0, 'incremental_updates': 0, 'lookups': 0}
+        self.store.add_listener(self._on_store_change)
+
+    # ------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _aggregate(work, origin, n_days, rows):
+        """
+        Daily counts of `work` per scope, as prefix sums aligned to `rows`
+
+        New scope keys are appended to `rows` in place.
+
+        Returns:
+            np.ndarray: (len(MEASURES), len(rows), n_days + 1) cumulative counts
+        """
+        work = work.assign(day=work['date'] - origin)
+        parts = []
+        for dims in _scope_combinations():
+            grouped = work.groupby(dims + ['day'], sort=False)[list(MEASURES)].sum().reset_index()
+            keys = _scope_keys(grouped, dims)
+            for key in keys:
+                if key not in rows:
+                    rows[key] = len(rows)
+            grouped['row'] = [rows[k] for k in keys]
+            parts.append(grouped[['row', 'day'] + list(MEASURES)])
+
+        counts = np.zeros((len(MEASURES), len(rows), n_days + 1), dtype='int64')
+        if parts:
+            merged = pd.concat(parts, ignore_index=True)
+            r = merged['row'].to_numpy()
+            d = merged['day'].to_numpy() + 1
+            for m, measure in enumerate(MEASURES):
+                np.add.at(counts[m], (r, d), merged[measure].to_numpy())
+        return np.cumsum(counts, axis=2)
+
+    @staticmethod
+    def _name_events(work, origin):
+        """
+        Sorted (day, case_id) arrays of contagious cases per scope and disease name
+
+        Returns:
+            dict: scope key -> {disease_name: (days, case_ids)}
+        """
+        sub = work[work['contagious'] == 1]
+        days = sub['date'].to_numpy() - origin
+        case_ids = sub['case_id'].to_numpy()
+        names = {}
+        for dims in _scope_combinations():
+            for group, positions in sub.groupby(dims + ['disease_name'], sort=False).indices.items():
+                group = group if isinstance(group, tuple) else (group,)
+                values = dict(zip(dims, group[:-1]))
+                key = tuple(values.get(d) for d in DIMS)
+                names.setdefault(key, {})[group[-1]] = (days[positions], case_ids[positions])
+        return names
+
+    def _build(self, frame):
+        work = _work_frame(frame)
+        rows = {}
+        if work.empty:
+            origin, n_days = _day(datetime.now()), 0
+        else:
+            origin = int(work['date'].min())
+            n_days = int(work['date'].max()) - origin + 1
+        cum = self._aggregate(work, origin, n_days, rows)
+        names = self._name_events(work, origin)
+        max_case_id = int(work['case_id'].max()) if not work.empty else 0
+        self._stats['builds'] += 1
+        return _IndexState(frame, origin, n_days, rows, cum, names, max_case_id, len(work))
+
+    def _apply(self, state, frame, delta):
+        """
+        Fold appended cases into a copy of `state`
+
+        Returns:
+            _IndexState or None: New state, or None when a rebuild is needed
+        """
+        work = _work_frame(delta)
+        if state.case_count == 0 or int(work['case_id'].min()) <= state.max_case_id \
+                or work['date'].min() < state.origin:
+            return None
+
+        n_days = max(state.n_days, int(work['date'].max()) - state.origin + 1)
+        rows = dict(state.rows)
+        added = self._aggregate(work, state.origin, n_days, rows)
+
+        # Extend the existing prefix sums to the new day span / scope set
+        cum = np.zeros_like(added)
+        cum[:, :len(state.rows), :state.n_days + 1] = state.cum
+        cum[:, :len(state.rows), state.n_days + 1:] = state.cum[:, :, -1:]
+        cum += added
+
+        names = {key: dict(events) for key, events in state.names.items()}
+        for key, new_events in self._name_events(work, state.origin).items():
+            scope = names.setdefault(key, {})
+            for name, (days, case_ids) in new_events.items():
+                if name in scope:
+                    days = np.concatenate([scope[name][0], days])
+                    case_ids = np.concatenate([scope[name][1], case_ids])
+                    order = np.lexsort((case_ids, days))
+                    days, case_ids = days[order], case_ids[order]
+                scope[name] = (days, case_ids)
+
+        self._stats['incremental_updates'] += 1
+        return _IndexState(frame, state.origin, n_days, rows, cum, names,
+                           int(work['case_id'].max()), state.case_count + len(work))
+
+    def _on_store_change(self, frame, delta):
+        with self._lock:
+            state = self._state
+            if state is None:
+                return
+            self._state = self._apply(state, frame, delta) if delta is not None else None
+
+    def _current(self):
+        # Fetch the snapshot before locking: a store refresh notifies us under its own lock
+        frame = self.store.frame()
+        state = self._state
+        if state is not None and state.source is frame:
+            return state
+        with self._lock:
+            if self._state is None or self._state.source is not frame:
+                self._state = self._build(frame)
+            return self._state
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def _offset(self, state, value):
+        """Prefix-sum column for an epoch day, clipped to the indexed span"""
+        return int(np.clip(value - state.origin, 0, state.n_days))
+
+    def window_stats(self, species=None, disease_category=None, region=None,
+                     days_lookback=30, today=None):
+        """
+        Outbreak-risk inputs for cases diagnosed on or after today - days_lookback
+
+        Args:
+            species (str, optional): Filter by species
+            disease_category (str, optional): Filter by disease category
+            region (str, optional): Filter by region
+            days_lookback (int): Window length in days
+            today (date, optional): Reference date (default: today)
+
+        Returns:
+            dict: case/contagious/severe counts, first/second half counts and
+                contagious disease clusters (ordered like value_counts), or
+                None if there are no cases at all
+        """
+        state = self._current()
+        self._stats['lookups'] += 1
+        if state.case_count == 0:
+            return None
+
+        today = _day(today or datetime.now())
+        start = self._offset(state, today - days_lookback)
+        half = self._offset(state, today - days_lookback // 2)
+        end = state.n_days
+
+        key = (species or None, disease_category or None, region or None)
+        row = state.rows.get(key)
+        if row is None:
+            totals = {m: 0 for m in MEASURES}
+            first_half = second_half = 0
+        else:
+            cum = state.cum[:, row]
+            totals = {m: int(cum[i, end] - cum[i, start]) for i, m in enumerate(MEASURES)}
+            first_half = int(cum[0, half] - cum[0, start])
+            second_half = int(cum[0, end] - cum[0, half])
+
+        return {
+            'case_count': totals['total'],
+            'contagious_count': totals['contagious'],
+            'severe_count': totals['severe'],
+            'first_half': first_half,
+            'second_half': second_half,
+            'clusters': self._clusters(state, key, start, days_lookback),
+        }
+
+    @staticmethod
+    def _clusters(state, key, start, days_lookback):
+        """Contagious diseases with >= max(3, days_lookback // 12) cases since `start`"""
+        min_cluster_size = max(3, days_lookback // 12)
+        clusters = []
+        for name, (days, case_ids) in state.names.get(key, {}).items():
+            pos = int(np.searchsorted(days, start, 'left'))
+            count = len(days) - pos
+            if count >= min_cluster_size:
+                clusters.append((-count, days[pos], case_ids[pos], name))
+        clusters.sort()
+        return [c[3] for c in clusters]
+
+    def batch_window_stats(self, lookbacks, include_combinations=False, today=None):
+        """
+        Outbreak-risk inputs for every indexed scope and lookback in one pass
+
+        Counts for all scopes of a lookback come from a single gather over the
+        prefix-sum cube.
+
+        Args:
+            lookbacks (list): Window lengths in days
+            include_combinations (bool): Also score multi-dimension scopes
+                (e.g. species x region), not just the overall and one-dimension scopes
+            today (date, optional): Reference date (default: today)
+
+        Returns:
+            list: (scope key, days_lookback, stats) tuples; empty if there are no cases
+        """
+        state = self._current()
+        self._stats['lookups'] += 1
+        if state.case_count == 0:
+            return []
+
+        keys = [k for k in state.rows
+                if include_combinations or sum(v is not None for v in k) <= 1]
+        rows = np.array([state.rows[k] for k in keys], dtype='int64')
+        today = _day(today or datetime.now())
+        end = state.n_days
+        cum = state.cum[:, rows]
+
+        results = []
+        for days_lookback in lookbacks:
+            start = self._offset(state, today - days_lookback)
+            half = self._offset(state, today - days_lookback // 2)
+            window = cum[:, :, end] - cum[:, :, start]
+            first_half = cum[0, :, half] - cum[0, :, start]
+            second_half = cum[0, :, end] - cum[0, :, half]
+            for i, key in enumerate(keys):
+                results.append((key, days_lookback, {
+                    'case_count': int(window[0, i]),
+                    'contagious_count': int(window[1, i]),
+                    'severe_count': int(window[2, i]),
+                    'first_half': int(first_half[i]),
+                    'second_half': int(second_half[i]),
+                    'clusters': self._clusters(state, key, start, days_lookback),
+                }))
+        return results
+
+    def replay_window_counts(self, species=None, disease_category=None, region=None,
+                             days_lookback=30, start_date=None, end_date=None):
+        """
+        As-of outbreak-risk inputs for every day in [start_date, end_date]
+
+        Each day's window covers cases diagnosed from day - days_lookback up to and
+        including that day, so later cases never leak into earlier scores.
+
+        Args:
+            species (str, optional): Filter by species
+            disease_category (str, optional): Filter by disease category
+            region (str, optional): Filter by region
+            days_lookback (int): Window length in days
+            start_date (date, optional): First as-of day (default: first case)
+            end_date (date, optional): Last as-of day (default: today)
+
+        Returns:
+            dict: 'dates' (datetime64[D] array) plus per-day count arrays and a
+                'has_cluster' flag array, or None if there are no cases at all
+        """
+        state = self._current()
+        self._stats['lookups'] += 1
+        if state.case_count == 0:
+            return None
+
+        first = _day(start_date) if start_date is not None else state.origin
+        last = _day(end_date or datetime.now())
+        as_of = np.arange(first, max(first, last + 1), dtype='int64')
+
+        end = np.clip(as_of - state.origin + 1, 0, state.n_days)
+        start = np.clip(as_of - days_lookback - state.origin, 0, state.n_days)
+        half = np.clip(as_of - days_lookback // 2 - state.origin, 0, state.n_days)
+
+        key = (species or None, disease_category or None, region or None)
+        row = state.rows.get(key)
+        if row is None:
+            zeros = np.zeros(len(as_of), dtype='int64')
+            window = np.zeros((len(MEASURES), len(as_of)), dtype='int64')
+            first_half = second_half = zeros
+        else:
+            cum = state.cum[:, row]
+            window = cum[:, end] - cum[:, start]
+            first_half = cum[0, half] - cum[0, start]
+            second_half = cum[0, end] - cum[0, half]
+
+        min_cluster_size = max(3, days_lookback // 12)
+        has_cluster = np.zeros(len(as_of), dtype=bool)
+        for days, _ in state.names.get(key, {}).values():
+            counts = np.searchsorted(days, end, 'left') - np.searchsorted(days, start, 'left')
+            has_cluster |= counts >= min_cluster_size
+
+        return {
+            'dates': as_of.astype('datetime64[D]'),
+            'case_count': window[0],
+            'contagious_count': window[1],
+            'severe_count': window[2],
+            'first_half': first_half,
+            'second_half': second_half,
+            'has_cluster': has_cluster,
+        }
+
+    def scope_values(self, dimension):
+        """
+        Distinct values of one dimension present in the index
+
+        Args:
+            dimension (str): 'species', 'disease_category' or 'region'
+
+        Returns:
+            list: Sorted values
+        """
+        state = self._current()
+        pos = DIMS.index(dimension)
+        return sorted({k[pos] for k in state.rows if k[pos] is not None})
+
+    def get_stats(self):
+        """
+        Get index statistics
+
+        Returns:
+            dict: Build/update/lookup counters and cube dimensions
+        """
+        state = self._state
+        stats = dict(self._stats)
+        stats.update({
+            'built': state is not None,
+            'scopes': len(state.rows) if state else 0,
+            'days': state.n_days if state else 0,
+            'cases': state.case_count if state else 0,
+        })
+        return stats
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_outbreak_index():
+    """Returns the process-wide OutbreakRiskIndex, creating it on first use"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = OutbreakRiskIndex()
+    return _index
@@ -0,0 +1,84 @@
+"""
+Prediction Cache for Classifier Inputs
+LRU map from an encoded feature vector to its prediction, owned by one fitted
+model and cleared whenever that model is retrained
+"""
+
+import os
+import threading
+from collections import OrderedDict
+
+from utils.metrics import cache_lookup
+
+
+class PredictionCache:
+    """
+    Thread-safe LRU of feature tuple -> prediction dict.
+
+    Keys are the encoded (pre-scaling) feature vector, so different raw inputs
+    that encode identically (e.g. an unseen breed mapped to 'unknown') share
+    one entry. max_entries=0 disables caching.
+    """
+
+    def __init__(self, max_entries=None):
+        """
+        Args:
+            max_entries (int): Entries kept before the least recently used is evicted
+                (DISEASE_PREDICTION_CACHE_SIZE, default 4096)
+        """
+        if max_entries is None:
+            max_entries = int(os.getenv('DISEASE_PREDICTION_CACHE_SIZE', 4096))
+        self.max_entries = max(0, max_entries)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'clears': 0}
+
+    def get(self, key):
+        """
+        Args:
+            key (tuple): Encoded feature vector
+
+        Returns:
+            Cached prediction, or None on a miss
+        """
+        if not self.max_entries:
+            return None
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self._stats['misses'] += 1
+            else:
+                self._entries.move_to_end(key)
+                self._stats['hits'] += 1
+        cache_lookup('disease_prediction', value is not None)
+        return value
+
+    def put(self, key, value):
+        if not self.max_entries:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._stats['clears'] += 1
+
+    def get_stats(self):
+        """
+        Get cache statistics
+
+        Returns:
+            dict: Hit/miss/eviction counters, hit ratio and entry count
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_ratio'] = round(stats['hits'] / lookups, 4) if lookups else None
+        stats['max_entries'] = self.max_entries
+        return stats
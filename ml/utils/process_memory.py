@@ -0,0 +1,39 @@
+"""
+Process Memory Usage
+Reports resident memory of the current process (used for per-worker model
+load reporting)
+"""
+
+import os
+
+
+def memory_usage():
+    """
+    Resident memory of this process, from /proc on Linux
+
+    RSS counts shared pages in full in every process; PSS splits each shared
+    page between the processes mapping it, so summing PSS across workers
+    gives their real footprint.
+
+    Returns:
+        dict: rss_mb, pss_mb, shared_mb and private_mb (None where unavailable)
+    """
+    usage = {'pid': os.getpid(), 'rss_mb': None, 'pss_mb': None, 'shared_mb': None, 'private_mb': None}
+    fields = {'Rss:': 'rss_mb', 'Pss:': 'pss_mb'}
+    try:
+        with open('/proc/self/smaps_rollup') as f:
+            shared = private = 0
+            for line in f:
+                parts = line.split()
+                if parts[0] in fields:
+                    usage[fields[parts[0]]] = round(int(parts[1]) / 1024, 1)
+                elif parts[0] in ('Shared_Clean:', 'Shared_Dirty:'):
+                    shared += int(parts[1])
+                elif parts[0] in ('Private_Clean:', 'Private_Dirty:'):
+                    private += int(parts[1])
+            usage['shared_mb'] = round(shared / 1024, 1)
+            usage['private_mb'] = round(private / 1024, 1)
+    except OSError:
+        import resource
+        usage['rss_mb'] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    return usage
@@ -0,0 +1,196 @@
+"""
+Process Pool for Prophet Fits
+Runs independent Prophet fit + predict jobs in parallel worker processes with
+Stan / BLAS threads capped per worker
+"""
+
+import os
+import time
+import threading
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# Thread pools that would otherwise size themselves to every core in each worker
+THREAD_ENV_VARS = ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS')
+
+_thread_limits = None
+
+
+def _init_worker(stan_threads):
+    """Worker initializer: cap Stan and BLAS threading before any fit runs"""
+    global _thread_limits
+    os.environ['STAN_NUM_THREADS'] = str(stan_threads)
+    for var in THREAD_ENV_VARS:
+        os.environ[var] = '1'
+    try:
+        from threadpoolctl import threadpool_limits
+        _thread_limits = threadpool_limits(limits=1)
+    except ImportError:
+        pass
+
+
+def fit_predict(task, serialize=True):
+    """
+    Fit one Prophet model and predict its future frame
+
+    Args:
+        task (dict): key, train (ds/y frame), future (ds frame), prophet_kwargs, regressors
+        serialize (bool): Return the fitted model as Prophet JSON (needed across processes)
+
+    Returns:
+        dict: model (JSON or Prophet), forecast frame, fit/predict seconds and worker
+            pid, or key and error if the fit failed
+    """
+    from prophet import Prophet
+
+    try:
+        start = time.perf_counter()
+        model = Prophet(**task['prophet_kwargs'])
+        for regressor in task.get('regressors', ()):
+            model.add_regressor(regressor)
+        model.fit(task['train'])
+        fitted = time.perf_counter()
+        forecast = model.predict(task['future'])[['ds', 'yhat', 'yhat_lower', 'yhat_upper']]
+        done = time.perf_counter()
+    except Exception as e:
+        return {'key': task['key'], 'error': str(e), 'worker_pid': os.getpid()}
+
+    if serialize:
+        from prophet.serialize import model_to_json
+        model = model_to_json(model)
+    return {
+        'key': task['key'],
+        'model': model,
+        'forecast': forecast,
+        'fit_seconds': round(fitted - start, 3),
+        'predict_seconds': round(done - fitted, 3),
+        'worker_pid': os.getpid(),
+    }
+
+
+class ProphetPool:
+    """
+    Lazily started ProcessPoolExecutor for Prophet jobs.
+
+    With one worker (or on a broken pool) jobs run inline in the calling
+    process. The executor is recreated after a fork so gunicorn workers never
+    share one.
+    """
+
+    def __init__(self, workers=None, stan_threads=None, start_method=None):
+        """
+        Args:
+            workers (int): Worker processes (PROPHET_WORKERS, default min(4, CPUs);
+                gunicorn.conf.py sets it to CPUs // server workers)
+            stan_threads (int): STAN_NUM_THREADS per worker (PROPHET_STAN_THREADS, default 1)
+            start_method (str): multiprocessing start method (PROPHET_POOL_START_METHOD, default spawn)
+        """
+        if workers is None:
+            workers = int(os.getenv('PROPHET_WORKERS') or min(4, os.cpu_count() or 1))
+        if stan_threads is None:
+            stan_threads = int(os.getenv('PROPHET_STAN_THREADS', 1))
+        self.workers = max(1, workers)
+        self.stan_threads = max(1, stan_threads)
+        self.start_method = start_method or os.getenv('PROPHET_POOL_START_METHOD', 'spawn')
+
+        self._executor = None
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._stats = {'jobs': 0, 'pooled_jobs': 0, 'inline_jobs': 0, 'pool_restarts': 0, 'fit_seconds_total': 0.0}
+
+    def _get_executor(self):
+        with self._lock:
+            if self._pid != os.getpid():
+                # Forked: the parent's executor and its pipes are not ours
+                self._executor = None
+                self._pid = os.getpid()
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=mp.get_context(self.start_method),
+                    initializer=_init_worker,
+                    initargs=(self.stan_threads,)
+                )
+            return self._executor
+
+    def _reset(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self._stats['pool_restarts'] += 1
+
+    def run(self, tasks):
+        """
+        Run fit_predict for every task, in parallel when more than one worker is configured
+
+        Args:
+            tasks (list): Task dicts (see fit_predict)
+
+        Returns:
+            list: fit_predict results in task order; models deserialized to Prophet objects
+        """
+        if not tasks:
+            return []
+        self._stats['jobs'] += len(tasks)
+
+        results = None
+        if self.workers > 1 and len(tasks) > 1:
+            try:
+                executor = self._get_executor()
+                futures = [executor.submit(fit_predict, task) for task in tasks]
+                results = [f.result() for f in futures]
+                from prophet.serialize import model_from_json
+                for result in results:
+                    if 'model' in result:
+                        result['model'] = model_from_json(result['model'])
+                self._stats['pooled_jobs'] += len(tasks)
+            except BrokenProcessPool as e:
+                print(f"   ⚠ Prophet pool broke ({e}); running fits inline")
+                self._reset()
+                results = None
+
+        if results is None:
+            results = [fit_predict(task, serialize=False) for task in tasks]
+            self._stats['inline_jobs'] += len(tasks)
+
+        self._stats['fit_seconds_total'] += sum(r.get('fit_seconds', 0.0) for r in results)
+        return results
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None and self._pid == os.getpid():
+                self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def get_stats(self):
+        """
+        Get pool statistics
+
+        Returns:
+            dict: Worker config and job counters
+        """
+        stats = dict(self._stats)
+        stats['fit_seconds_total'] = round(stats['fit_seconds_total'], 3)
+        stats.update({
+            'workers': self.workers,
+            'stan_threads': self.stan_threads,
+            'start_method': self.start_method,
+            'started': self._executor is not None,
+        })
+        return stats
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_prophet_pool():
+    """Returns the process-wide ProphetPool, creating it on first use"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ProphetPool()
+    return _pool
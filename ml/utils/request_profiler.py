@@ -0,0 +1,270 @@
+"""
+On-Demand Request Profiler
+Runs selected requests under cProfile (on an admin token or a sampling rate)
+and writes each profile as a pstats file to a profiles directory
+"""
+
+import cProfile
+import hmac
+import io
+import os
+import pstats
+import random
+import re
+import threading
+import time
+import uuid
+from datetime import datetime
+
+PROFILE_HEADER = 'X-ML-Profile'
+PROFILE_PARAM = 'profile'
+# Profile listing/download routes are never profiled themselves
+EXCLUDED_PREFIX = '/api/ml/profiles'
+
+
+class RequestProfiler:
+    """
+    Opt-in cProfile for Flask requests.
+
+    A request is profiled when it carries the admin token (ML_PROFILE_TOKEN)
+    in the X-ML-Profile header or ?profile= query flag, or when it is drawn
+    by ML_PROFILE_SAMPLE_RATE. cProfile only follows the thread it was
+    enabled in, so other requests served concurrently are unaffected; one
+    request per process is profiled at a time and any others asking are
+    served unprofiled. Profiles are pstats files, readable with
+    pstats/snakeviz or as text via /api/ml/profiles/<name>?format=text.
+    """
+
+    def __init__(self, profile_dir=None, token=None, sample_rate=None, keep=None):
+        """
+        Args:
+            profile_dir (str): Where profiles are written (ML_PROFILE_DIR, default ./profiles)
+            token (str): Admin token that enables on-demand profiling (ML_PROFILE_TOKEN;
+                unset = on-demand profiling and the profile endpoints are disabled)
+            sample_rate (float): Fraction of requests profiled at random (ML_PROFILE_SAMPLE_RATE, default 0)
+            keep (int): Newest profiles kept in profile_dir (ML_PROFILE_KEEP, default 100)
+        """
+        self.profile_dir = os.path.abspath(profile_dir or os.getenv('ML_PROFILE_DIR', './profiles'))
+        self.token = token if token is not None else os.getenv('ML_PROFILE_TOKEN', '')
+        if sample_rate is None:
+            sample_rate = float(os.getenv('ML_PROFILE_SAMPLE_RATE', 0))
+        if keep is None:
+            keep = int(os.getenv('ML_PROFILE_KEEP', 100))
+        self.sample_rate = min(1.0, max(0.0, sample_rate))
+        self.keep = max(1, keep)
+        self._busy = threading.Lock()
+        self._lock = threading.Lock()
+        self._stats = {'requested': 0, 'sampled': 0, 'skipped_busy': 0, 'rejected_token': 0, 'training_profiles': 0}
+
+    # ------------------------------------------------------------------
+    # Selection
+    # ------------------------------------------------------------------
+
+    def authorized(self, supplied):
+        """True when supplied matches the configured admin token"""
+        return bool(self.token) and bool(supplied) and hmac.compare_digest(str(supplied), self.token)
+
+    def _reason(self, request):
+        if request.path.startswith(EXCLUDED_PREFIX):
+            return None
+        supplied = request.headers.get(PROFILE_HEADER) or request.args.get(PROFILE_PARAM)
+        if supplied:
+            if self.authorized(supplied):
+                return 'requested'
+            with self._lock:
+                self._stats['rejected_token'] += 1
+        if self.sample_rate and random.random() < self.sample_rate:
+            return 'sampled'
+        return None
+
+    # ------------------------------------------------------------------
+    # Flask hooks
+    # ------------------------------------------------------------------
+
+    def install(self, app):
+        """
+        Profile selected requests on every route of a Flask app
+
+        Args:
+            app (Flask): Application to instrument
+        """
+        from flask import g, request
+
+        @app.before_request
+        def _start_profile():
+            reason = self._reason(request)
+            if reason is None:
+                return
+            if not self._busy.acquire(blocking=False):
+                with self._lock:
+                    self._stats['skipped_busy'] += 1
+                g.profile_busy = True
+                return
+            with self._lock:
+                self._stats[reason] += 1
+            g.profile = {'reason': reason, 'started': time.perf_counter(), 'profiler': cProfile.Profile()}
+            try:
+                g.profile['profiler'].enable()
+            except ValueError:
+                # Another profiler (e.g. a debugger) owns the profiling hook
+                self._busy.release()
+                g.pop('profile')
+
+        @app.after_request
+        def _finish_profile(response):
+            if g.pop('profile_busy', False):
+                response.headers[PROFILE_HEADER] = 'busy'
+            profile = g.pop('profile', None)
+            if profile is not None:
+                name = self._stop(profile, request.method, request.url_rule.rule if request.url_rule else request.path)
+                response.headers[PROFILE_HEADER] = profile['reason']
+                response.headers[f'{PROFILE_HEADER}-File'] = name
+                response.headers[f'{PROFILE_HEADER}-Seconds'] = f"{profile['seconds']:.3f}"
+            return response
+
+        @app.teardown_request
+        def _abandon_profile(exc):
+            # after_request did not run (the view raised); still release the profiler
+            profile = g.pop('profile', None)
+            if profile is not None:
+                self._stop(profile, request.method, request.path)
+
+    def active(self):
+        """True when the current Flask request is being profiled"""
+        from flask import g
+        return g.get('profile') is not None
+
+    def _stop(self, profile, method, route):
+        profile['profiler'].disable()
+        profile['seconds'] = time.perf_counter() - profile['started']
+        self._busy.release()
+        name = self.new_name(f'{method}_{route}')
+        self._dump(profile['profiler'], name)
+        return name
+
+    # ------------------------------------------------------------------
+    # Files
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def new_name(label):
+        """Profile file name: <timestamp>_<label slug>_<pid>_<id>.prof"""
+        slug = re.sub(r'[^A-Za-z0-9]+', '-', label).strip('-')[:80]
+        return f"{datetime.now().strftime('%Y%m%d-%H%M%S')}_{slug}_{os.getpid()}_{uuid.uuid4().hex[:6]}.prof"
+
+    def _dump(self, profiler, name):
+        os.makedirs(self.profile_dir, exist_ok=True)
+        tmp = os.path.join(self.profile_dir, f'.{name}.tmp')
+        profiler.dump_stats(tmp)
+        os.replace(tmp, os.path.join(self.profile_dir, name))
+        self._trim()
+
+    def _trim(self):
+        profiles = self.list()
+        for entry in profiles[self.keep:]:
+            try:
+                os.remove(os.path.join(self.profile_dir, entry['name']))
+            except OSError:
+                pass
+
+    def job_profile_path(self, label):
+        """Path a training job should dump its profile to (see profile_call)"""
+        with self._lock:
+            self._stats['training_profiles'] += 1
+        return os.path.join(self.profile_dir, self.new_name(label))
+
+    def list(self):
+        """
+        Returns:
+            list: Profiles in profile_dir (name, size, created_at), newest first
+        """
+        try:
+            names = [n for n in os.listdir(self.profile_dir) if n.endswith('.prof')]
+        except FileNotFoundError:
+            return []
+        entries = []
+        for name in names:
+            try:
+                stat = os.stat(os.path.join(self.profile_dir, name))
+            except OSError:
+                continue
+            entries.append({'name': name, 'size_bytes': stat.st_size, 'mtime': stat.st_mtime})
+        entries.sort(key=lambda e: e['mtime'], reverse=True)
+        for entry in entries:
+            entry['created_at'] = datetime.fromtimestamp(entry.pop('mtime')).isoformat()
+        return entries
+
+    def path(self, name):
+        """
+        Returns:
+            str: Path of a profile in profile_dir
+
+        Raises:
+            ValueError: If name is not a profile file name
+            FileNotFoundError: If the profile does not exist (or was trimmed)
+        """
+        if os.path.basename(name) != name or not name.endswith('.prof') or name.startswith('.'):
+            raise ValueError(f"Invalid profile name '{name}'")
+        path = os.path.join(self.profile_dir, name)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Profile '{name}' not found")
+        return path
+
+    def summary(self, name, sort='cumulative', limit=40):
+        """
+        pstats text report of a profile
+
+        Args:
+            name (str): Profile file name
+            sort (str): pstats sort key (cumulative, tottime, ncalls, ...)
+            limit (int): Functions listed
+
+        Returns:
+            str: Report text
+        """
+        stream = io.StringIO()
+        stats = pstats.Stats(self.path(name), stream=stream)
+        stats.strip_dirs().sort_stats(sort).print_stats(limit)
+        return stream.getvalue()
+
+    def get_stats(self):
+        """
+        Returns:
+            dict: Configuration and counts of profiled, skipped and rejected requests
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        stats.update({
+            'profile_dir': self.profile_dir,
+            'on_demand_enabled': bool(self.token),
+            'sample_rate': self.sample_rate,
+            'keep': self.keep,
+        })
+        return stats
+
+
+def profile_call(path, fn):
+    """
+    Run fn() under cProfile and write its pstats file to path (used in
+    training worker processes, where a profiled train request's work runs)
+    """
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(fn)
+    finally:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        profiler.dump_stats(path)
+
+
+_profiler = None
+_profiler_lock = threading.Lock()
+
+
+def get_request_profiler():
+    """Returns the process-wide RequestProfiler, creating it on first use"""
+    global _profiler
+    if _profiler is None:
+        with _profiler_lock:
+            if _profiler is None:
+                _profiler = RequestProfiler()
+    return _profiler
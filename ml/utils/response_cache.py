@@ -0,0 +1,244 @@
+"""
+Response Cache for Read-Only Analytics Endpoints
+Keeps serialized JSON responses with an ETag and Last-Modified time, bounded by
+TTL and total size, and drops them when their model reloads or source tables change
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from utils.metrics import cache_lookup
+
+# Tables cached views query directly. Row count catches deletes, MAX(id)
+# inserts and MAX(updated_at) edits
+SOURCE_WATERMARKS = {
+    'billing': "SELECT COUNT(*), MAX(bill_id), MAX(updated_at) FROM billing",
+    'billing_items': "SELECT COUNT(*), MAX(billing_item_id), MAX(created_at) FROM billing_items",
+    'appointments': "SELECT COUNT(*), MAX(appointment_id), MAX(updated_at) FROM appointments",
+}
+
+CachedResponse = namedtuple('CachedResponse', 'body etag last_modified expires tag watermark')
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU map of request key -> CachedResponse, bounded by total body bytes.
+
+    Every entry belongs to a model tag ('disease', 'sales', 'inventory') and a
+    set of source tables. invalidate(tag) drops a model's entries when it is
+    reloaded (and the disease entries when the case store refreshes); a lookup misses when the entry is older than the TTL or a source
+    table's watermark (row count, max id, max updated_at) differs from the one
+    the entry was built against. Watermarks are re-read from Postgres at most
+    every watermark_interval seconds per table, so a burst of hits costs no
+    queries.
+    """
+
+    def __init__(self, ttl=None, max_bytes=None, watermark_interval=None, enabled=None):
+        """
+        Args:
+            ttl (float): Seconds an entry is served (ML_RESPONSE_CACHE_TTL, default 300)
+            max_bytes (int): Total body bytes kept before LRU eviction (ML_RESPONSE_CACHE_MAX_MB, default 32)
+            watermark_interval (float): Seconds between watermark queries per table
+                (ML_RESPONSE_CACHE_WATERMARK_INTERVAL, default 30; 0 = every lookup)
+            enabled (bool): ML_RESPONSE_CACHE (default true)
+        """
+        if ttl is None:
+            ttl = float(os.getenv('ML_RESPONSE_CACHE_TTL', 300))
+        if max_bytes is None:
+            max_bytes = int(float(os.getenv('ML_RESPONSE_CACHE_MAX_MB', 32)) * 1024 * 1024)
+        if watermark_interval is None:
+            watermark_interval = float(os.getenv('ML_RESPONSE_CACHE_WATERMARK_INTERVAL', 30))
+        if enabled is None:
+            enabled = os.getenv('ML_RESPONSE_CACHE', 'true').lower() == 'true'
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.watermark_interval = watermark_interval
+        self.enabled = enabled and ttl > 0 and max_bytes > 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._generations = {}
+        self._watermarks = {}
+        self._lock = threading.Lock()
+        self._watermark_lock = threading.Lock()
+        self._stats = {
+            'hits': 0, 'misses': 0, 'not_modified': 0, 'expirations': 0, 'evictions': 0,
+            'invalidations': 0, 'watermark_changes': 0, 'watermark_queries': 0, 'watermark_errors': 0,
+        }
+        self._last_watermark_error = None
+
+    # ------------------------------------------------------------------
+    # Source table watermarks
+    # ------------------------------------------------------------------
+
+    def _current_watermark(self, sources):
+        """Watermarks of the given tables, re-querying the ones older than watermark_interval"""
+        now = time.monotonic()
+        stale = [s for s in sources
+                 if s not in self._watermarks or now - self._watermarks[s][1] >= self.watermark_interval]
+        if stale:
+            with self._watermark_lock:
+                now = time.monotonic()
+                stale = [s for s in stale
+                         if s not in self._watermarks or now - self._watermarks[s][1] >= self.watermark_interval]
+                if stale:
+                    self._refresh_watermarks(stale, now)
+        return tuple(self._watermarks.get(s, (None, 0))[0] for s in sources)
+
+    def _refresh_watermarks(self, sources, now):
+        from config.db_connection import pooled_connection
+        try:
+            values = {}
+            with pooled_connection() as conn:
+                cursor = conn.cursor()
+                for source in sources:
+                    cursor.execute(SOURCE_WATERMARKS[source])
+                    row = cursor.fetchone()
+                    values[source] = tuple(str(v) for v in (row.values() if isinstance(row, dict) else row))
+                cursor.close()
+        except Exception as e:
+            # Keep serving against the last known watermark until the database is back
+            with self._lock:
+                self._stats['watermark_errors'] += 1
+                self._last_watermark_error = str(e)
+                for source in sources:
+                    self._watermarks[source] = (self._watermarks.get(source, (None, 0))[0], now)
+            return
+        with self._lock:
+            self._stats['watermark_queries'] += 1
+            for source, value in values.items():
+                self._watermarks[source] = (value, now)
+
+    # ------------------------------------------------------------------
+    # Entries
+    # ------------------------------------------------------------------
+
+    def get(self, key, tag, sources=()):
+        """
+        Args:
+            key (tuple): Request key (path and normalized query params)
+            tag (str): Model the response is computed from
+            sources (tuple): Source tables the response is computed from
+
+        Returns:
+            tuple: (CachedResponse or None, token); pass the token to put() on a miss
+        """
+        watermark = self._current_watermark(sources)
+        with self._lock:
+            token = (self._generations.get(tag, 0), watermark)
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.expires <= time.monotonic():
+                    self._stats['expirations'] += 1
+                elif entry.watermark != watermark:
+                    self._stats['watermark_changes'] += 1
+                else:
+                    self._entries.move_to_end(key)
+                    self._stats['hits'] += 1
+                    cache_lookup('response', True)
+                    return entry, token
+                self._discard(key)
+            self._stats['misses'] += 1
+        cache_lookup('response', False)
+        return None, token
+
+    def put(self, key, tag, token, body):
+        """
+        Store a freshly computed response body
+
+        Args:
+            key (tuple): Request key
+            tag (str): Model the response is computed from
+            token (tuple): Token get() returned before the body was computed
+            body (bytes): Serialized JSON response
+
+        Returns:
+            CachedResponse: The entry to serve; it is not kept when the model
+                reloaded while the body was being computed or the body alone
+                exceeds max_bytes
+        """
+        generation, watermark = token
+        entry = CachedResponse(
+            body=body,
+            etag=hashlib.sha1(body).hexdigest(),
+            last_modified=time.time(),
+            expires=time.monotonic() + self.ttl,
+            tag=tag,
+            watermark=watermark,
+        )
+        with self._lock:
+            if generation != self._generations.get(tag, 0) or len(body) > self.max_bytes:
+                return entry
+            self._discard(key)
+            self._entries[key] = entry
+            self._bytes += len(body)
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._discard(oldest)
+                self._stats['evictions'] += 1
+        return entry
+
+    def _discard(self, key):
+        # Caller holds the lock
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry.body)
+
+    def invalidate(self, tag):
+        """Drop a model's entries; bodies still being computed against the old model are not stored"""
+        with self._lock:
+            self._generations[tag] = self._generations.get(tag, 0) + 1
+            for key in [k for k, e in self._entries.items() if e.tag == tag]:
+                self._discard(key)
+            self._stats['invalidations'] += 1
+
+    def record_not_modified(self):
+        """Count a conditional request answered with 304"""
+        with self._lock:
+            self._stats['not_modified'] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def get_stats(self):
+        """
+        Get cache statistics
+
+        Returns:
+            dict: Hit/miss/304 counters, hit ratio, size and watermark per source table
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            tags = {}
+            for entry in self._entries.values():
+                tags[entry.tag] = tags.get(entry.tag, 0) + 1
+            stats['entries'] = len(self._entries)
+            stats['entries_by_model'] = tags
+            stats['size_mb'] = round(self._bytes / (1024 * 1024), 3)
+            stats['watermarks'] = {source: value for source, (value, _) in self._watermarks.items()}
+            stats['last_watermark_error'] = self._last_watermark_error
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_ratio'] = round(stats['hits'] / lookups, 4) if lookups else None
+        stats['enabled'] = self.enabled
+        stats['ttl_seconds'] = self.ttl
+        stats['max_mb'] = round(self.max_bytes / (1024 * 1024), 3)
+        stats['watermark_interval_seconds'] = self.watermark_interval
+        return stats
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    """Returns the process-wide ResponseCache, creating it on first use"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResponseCache()
+    return _cache
@@ -0,0 +1,134 @@
+"""
+Single-Flight Request Coalescing
+Lets concurrent callers with the same key share one in-flight computation
+instead of each running its own Prophet fit or predict
+"""
+
+import threading
+import time
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error', 'waiters')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Thread-safe map of key -> in-flight call.
+
+    The first caller for a key (the leader) runs the function; callers that
+    arrive with the same key before it returns wait for it and receive the
+    same result, or the same exception. Nothing is kept once the call
+    finishes, so later callers run again (caching is the forecast cache's job).
+    Keys are tuples whose first element names the kind of call, for stats.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def _kind_stats(self, kind):
+        # Caller holds the lock
+        return self._stats.setdefault(kind, {
+            'requests': 0, 'executions': 0, 'deduplicated': 0, 'errors': 0,
+            'max_waiters': 0, 'saved_seconds': 0.0,
+        })
+
+    def do(self, key, fn):
+        """
+        Run fn() once for all concurrent callers with the same key
+
+        Args:
+            key (tuple): Normalized call key, e.g. ('sales_forecast', model_id, 90)
+            fn (callable): Computation to share
+
+        Returns:
+            tuple: (result, shared) where shared is True when this caller
+                received another caller's result
+
+        Raises:
+            Exception: Whatever fn raised, re-raised in every waiting caller
+        """
+        kind = key[0]
+        with self._lock:
+            stats = self._kind_stats(kind)
+            stats['requests'] += 1
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                stats['deduplicated'] += 1
+                stats['max_waiters'] = max(stats['max_waiters'], call.waiters)
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                stats['executions'] += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        start = time.perf_counter()
+        try:
+            call.result = fn()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            seconds = time.perf_counter() - start
+            with self._lock:
+                del self._calls[key]
+                stats = self._kind_stats(kind)
+                stats['saved_seconds'] += seconds * call.waiters
+                if call.error is not None:
+                    stats['errors'] += 1
+            call.done.set()
+        return call.result, False
+
+    def get_stats(self):
+        """
+        Get coalescing statistics
+
+        Returns:
+            dict: Requests, executions and deduplicated requests per kind,
+                with compute seconds the followers did not spend
+        """
+        with self._lock:
+            kinds = {kind: dict(stats) for kind, stats in self._stats.items()}
+            in_flight = len(self._calls)
+        for stats in kinds.values():
+            stats['saved_seconds'] = round(stats['saved_seconds'], 3)
+            stats['dedup_ratio'] = round(stats['deduplicated'] / stats['requests'], 4) if stats['requests'] else None
+        requests = sum(s['requests'] for s in kinds.values())
+        deduplicated = sum(s['deduplicated'] for s in kinds.values())
+        return {
+            'requests': requests,
+            'executions': sum(s['executions'] for s in kinds.values()),
+            'deduplicated': deduplicated,
+            'dedup_ratio': round(deduplicated / requests, 4) if requests else None,
+            'in_flight': in_flight,
+            'by_kind': kinds,
+        }
+
+
+_single_flight = None
+_single_flight_lock = threading.Lock()
+
+
+def get_single_flight():
+    """Returns the process-wide SingleFlight, creating it on first use"""
+    global _single_flight
+    if _single_flight is None:
+        with _single_flight_lock:
+            if _single_flight is None:
+                _single_flight = SingleFlight()
+    return _single_flight
@@ -0,0 +1,177 @@
+"""
+Startup Tracker for the ML Service
+Loads models in a background thread after the app is importable and records
+per-module import time, per-model load time and readiness
+"""
+
+import importlib
+import threading
+import time
+from datetime import datetime
+
+from utils.process_memory import memory_usage
+
+# Heavy modules imported (and timed) before the models load. Import times are
+# first-import times, so a shared dependency is charged to the first module
+# that pulls it in.
+WARM_IMPORTS = (
+    'numpy', 'pandas', 'sklearn.ensemble', 'joblib',
+    'scripts.disease_prediction', 'scripts.sales_forecasting', 'scripts.inventory_forecasting',
+)
+
+# Model states; 'missing' (no trained file) and 'failed' are settled, not ready
+PENDING, LOADING, READY, MISSING, FAILED = 'pending', 'loading', 'ready', 'missing', 'failed'
+
+
+class StartupTracker:
+    """
+    Records startup timings and each model's readiness.
+
+    The service is ready once no model is pending or loading; individual
+    models are ready once their pickle has been restored and swapped in.
+    """
+
+    def __init__(self):
+        self.started_at = time.time()
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._thread = None
+        self.app_import_seconds = None
+        self.imports = {}
+        self.models = {}
+
+    def mark_app_imported(self, import_started):
+        """
+        Args:
+            import_started (float): time.perf_counter() taken at the top of app.py
+        """
+        self.app_import_seconds = round(time.perf_counter() - import_started, 3)
+
+    def register(self, name, loader, has_artifact):
+        """
+        Register a model to load at startup
+
+        Args:
+            name (str): Model key, e.g. 'disease'
+            loader (callable): fn() -> bool, True when the model was loaded and swapped in
+            has_artifact (callable): fn() -> bool, True when a trained model file exists
+        """
+        with self._lock:
+            self.models[name] = {
+                'status': PENDING, 'loader': loader, 'has_artifact': has_artifact,
+                'load_seconds': None, 'ready_at': None, 'error': None,
+                'memory_before': None, 'memory_after': None,
+            }
+
+    def _timed_import(self, module):
+        start = time.perf_counter()
+        try:
+            importlib.import_module(module)
+            self.imports[module] = round(time.perf_counter() - start, 3)
+        except Exception as e:
+            self.imports[module] = f'failed: {e}'
+
+    def _load(self, name):
+        entry = self.models[name]
+        if not entry['has_artifact']():
+            entry['status'] = MISSING
+            return
+        entry['status'] = LOADING
+        entry['memory_before'] = memory_usage()
+        start = time.perf_counter()
+        try:
+            loaded = entry['loader']()
+        except Exception as e:
+            loaded = False
+            entry['error'] = str(e)
+        entry['load_seconds'] = round(time.perf_counter() - start, 3)
+        entry['memory_after'] = memory_usage()
+        entry['status'] = READY if loaded else FAILED
+        if loaded:
+            entry['ready_at'] = datetime.now().isoformat()
+
+    def load_all(self):
+        """Import the heavy modules, then load every registered model (blocking)"""
+        try:
+            for module in WARM_IMPORTS:
+                self._timed_import(module)
+            for name in list(self.models):
+                self._load(name)
+        finally:
+            self._done.set()
+            print(f"✓ Startup complete in {self.elapsed():.2f}s: "
+                  + ', '.join(f"{n}={m['status']}" for n, m in self.models.items()))
+
+    def start_background(self):
+        """Load models in a daemon thread so the app can answer health checks immediately"""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self.load_all, name='model-loader', daemon=True)
+                self._thread.start()
+        return self._thread
+
+    def wait(self, timeout=None):
+        """
+        Block until startup loading finishes
+
+        Returns:
+            bool: True if loading finished within the timeout
+        """
+        return self._done.wait(timeout)
+
+    def elapsed(self):
+        return time.perf_counter() - self._started
+
+    def mark_ready(self, name):
+        """Record that a model was (re)loaded outside startup, e.g. after training"""
+        entry = self.models.get(name)
+        if entry is not None:
+            entry['status'] = READY
+            entry['error'] = None
+            entry['ready_at'] = datetime.now().isoformat()
+
+    def is_ready(self, name=None):
+        """
+        Args:
+            name (str): Only this model (default: the whole service)
+
+        Returns:
+            bool: Model loaded, or (service) no model still pending/loading
+        """
+        if name is not None:
+            entry = self.models.get(name)
+            return entry is not None and entry['status'] == READY
+        return all(m['status'] not in (PENDING, LOADING) for m in self.models.values())
+
+    def get_report(self):
+        """
+        Returns:
+            dict: Readiness, per-model status/load time/memory and per-module import time
+        """
+        return {
+            'ready': self.is_ready(),
+            'started_at': datetime.fromtimestamp(self.started_at).isoformat(),
+            'uptime_seconds': round(self.elapsed(), 3),
+            'app_import_seconds': self.app_import_seconds,
+            'import_seconds': dict(self.imports),
+            'memory': memory_usage(),
+            'models': {
+                name: {k: v for k, v in m.items() if k not in ('loader', 'has_artifact')}
+                for name, m in self.models.items()
+            },
+        }
+
+
+_tracker = None
+_tracker_lock = threading.Lock()
+
+
+def get_startup_tracker():
+    """Returns the process-wide StartupTracker, creating it on first use"""
+    global _tracker
+    if _tracker is None:
+        with _tracker_lock:
+            if _tracker is None:
+                _tracker = StartupTracker()
+    return _tracker
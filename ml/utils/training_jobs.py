@@ -0,0 +1,548 @@
+"""
+Background Training Job Queue
+Runs model training in a separate process pool and tracks each job's status,
+stage, elapsed time and results so HTTP requests only submit and poll
+"""
+
+import fcntl
+import importlib
+import json
+import os
+import threading
+import time
+import uuid
+import multiprocessing as mp
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from datetime import datetime
+
+# model key -> (module, class) trained by a job
+TRAINABLE_MODELS = {
+    'disease': ('scripts.disease_prediction', 'DiseasePredictionModel'),
+    'sales': ('scripts.sales_forecasting', 'SalesForecastingModel'),
+    'inventory': ('scripts.inventory_forecasting', 'InventoryForecastingModel'),
+    'all': ('scripts.train_all', 'TrainAllPipeline'),
+}
+
+ACTIVE_STATUSES = ('queued', 'running', 'swapping')
+
+_progress_queue = None
+
+
+def _init_worker(progress_queue):
+    """Worker initializer: keep the queue used to report stages back to the parent"""
+    global _progress_queue
+    _progress_queue = progress_queue
+
+
+def _pid_alive(pid):
+    """True when a process with this pid exists on this host"""
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def model_class(model_key):
+    """Import and return the class trained for model_key"""
+    module_name, class_name = TRAINABLE_MODELS[model_key]
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def run_training_job(job_id, model_key, options=None, profile_path=None):
+    """
+    Train one model in a worker process; the model saves itself to disk
+
+    Args:
+        job_id (str): Job the stage updates belong to
+        model_key (str): Key in TRAINABLE_MODELS
+        options (dict): Keyword arguments for the model class
+        profile_path (str): Run train() under cProfile and write the pstats file here
+
+    Returns:
+        dict: Training results, train seconds and worker pid
+    """
+    def report(stage):
+        if _progress_queue is not None:
+            _progress_queue.put((job_id, stage, time.time()))
+
+    report('loading_modules')
+    model = model_class(model_key)(**(options or {}))
+    model.progress_callback = report
+    start = time.perf_counter()
+    if profile_path:
+        from utils.request_profiler import profile_call
+        results = profile_call(profile_path, model.train)
+    else:
+        results = model.train()
+    return {
+        'results': results,
+        'train_seconds': round(time.perf_counter() - start, 3),
+        'worker_pid': os.getpid(),
+    }
+
+
+class TrainingJobQueue:
+    """
+    Process-pool backed queue of training jobs.
+
+    Each job runs in a fresh worker process (max_tasks_per_child=1) so training
+    memory is returned to the OS when it finishes. When a job succeeds the
+    model's registered loader is called in this process; loaders build the new
+    model fully before assigning it, so inference keeps using the old model
+    until the swap.
+
+    Jobs live in the process that queued them. Under several server workers,
+    set job_dir so every snapshot is also written there and a status poll
+    that lands on another worker can still find the job. Submits then also
+    take a per-model file lock in job_dir and check its snapshots, so two
+    workers never train the same model at once.
+    """
+
+    def __init__(self, workers=None, history=None, start_method=None, job_dir=None):
+        """
+        Args:
+            workers (int): Concurrent training processes (TRAINING_WORKERS, default 1)
+            history (int): Finished jobs kept for polling (TRAINING_JOB_HISTORY, default 50)
+            start_method (str): multiprocessing start method (TRAINING_POOL_START_METHOD, default spawn)
+            job_dir (str): Directory shared by all workers for job snapshots
+                (TRAINING_JOB_DIR, default: unset, jobs are only kept in memory)
+        """
+        if workers is None:
+            workers = int(os.getenv('TRAINING_WORKERS', 1))
+        if history is None:
+            history = int(os.getenv('TRAINING_JOB_HISTORY', 50))
+        self.workers = max(1, workers)
+        self.history = max(1, history)
+        self.start_method = start_method or os.getenv('TRAINING_POOL_START_METHOD', 'spawn')
+        self.job_dir = job_dir or os.getenv('TRAINING_JOB_DIR') or None
+        if self.job_dir:
+            os.makedirs(self.job_dir, exist_ok=True)
+
+        self._executor = None
+        self._progress = None
+        self._pid = os.getpid()
+        self._jobs = OrderedDict()
+        self._loaders = {}
+        self._lock = threading.Lock()
+        self._stats = {'submitted': 0, 'deduplicated': 0, 'succeeded': 0, 'failed': 0}
+
+    def register_loader(self, model_key, loader):
+        """
+        Register the function that loads a freshly trained model into serving
+
+        Args:
+            model_key (str): Key in TRAINABLE_MODELS
+            loader (callable): fn() -> bool, True when the new model was loaded
+        """
+        self._loaders[model_key] = loader
+
+    # ------------------------------------------------------------------
+    # Executor
+    # ------------------------------------------------------------------
+
+    def _get_executor(self):
+        # Caller holds self._lock
+        if self._pid != os.getpid():
+            # Forked: the parent's executor, queue and jobs are not ours
+            self._executor = None
+            self._progress = None
+            self._jobs.clear()
+            self._pid = os.getpid()
+        if self._executor is None:
+            ctx = mp.get_context(self.start_method)
+            self._progress = ctx.Queue()
+            threading.Thread(target=self._drain_progress, args=(self._progress,), daemon=True).start()
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=ctx,
+                initializer=_init_worker,
+                initargs=(self._progress,),
+                # fork cannot recycle workers; every other start method gets a fresh process per job
+                max_tasks_per_child=None if self.start_method == 'fork' else 1
+            )
+        return self._executor
+
+    def _drain_progress(self, progress):
+        while True:
+            try:
+                job_id, stage, ts = progress.get()
+            except (EOFError, OSError):
+                return
+            with self._lock:
+                job = self._jobs.get(job_id)
+                if job is None or job['status'] not in ACTIVE_STATUSES:
+                    continue
+                if job['status'] == 'queued':
+                    job['status'] = 'running'
+                    job['started_at'] = ts
+                job['stage'] = stage
+                job['stages'].append({'stage': stage, 'at': ts})
+                self._persist(job)
+
+    # ------------------------------------------------------------------
+    # Jobs
+    # ------------------------------------------------------------------
+
+    def submit(self, model_key, options=None, profile_path=None):
+        """
+        Queue a training job, or return the one already queued/running for this model
+
+        Args:
+            model_key (str): Key in TRAINABLE_MODELS
+            options (dict): Keyword arguments for the model class
+            profile_path (str): Profile the training run to this pstats file
+
+        Returns:
+            dict: Job snapshot (see get)
+        """
+        if model_key not in TRAINABLE_MODELS:
+            raise ValueError(f"Unknown model '{model_key}'. Use one of: {', '.join(TRAINABLE_MODELS)}")
+
+        with self._model_lock(model_key), self._lock:
+            for job in self._jobs.values():
+                if job['model'] == model_key and job['status'] in ACTIVE_STATUSES:
+                    self._stats['deduplicated'] += 1
+                    return self._snapshot(job)
+            active = self._active_elsewhere(model_key)
+            if active is not None:
+                self._stats['deduplicated'] += 1
+                return active
+
+            job_id = uuid.uuid4().hex
+            job = {
+                'job_id': job_id,
+                'model': model_key,
+                'status': 'queued',
+                'stage': 'queued',
+                'stages': [],
+                'submitted_at': time.time(),
+                'started_at': None,
+                'finished_at': None,
+                'results': None,
+                'error': None,
+                'model_swapped': False,
+                'worker_pid': None,
+                'profile': os.path.basename(profile_path) if profile_path else None,
+                'owner_pid': os.getpid(),
+                'done': threading.Event(),
+            }
+            future = self._submit(job_id, model_key, options, profile_path)
+            # Registered only once the pool accepted it, so a failed submit leaves no
+            # queued job that later submits for this model would be deduplicated onto
+            self._jobs[job_id] = job
+            self._stats['submitted'] += 1
+            self._trim()
+            self._persist(job)
+            snapshot = self._snapshot(job)
+
+        future.add_done_callback(lambda f, job_id=job_id: self._finish(job_id, f))
+        return snapshot
+
+    def _submit(self, job_id, model_key, options, profile_path):
+        # Caller holds self._lock. A pool that broke (or was shut down) before
+        # _finish could replace it is replaced here and the submit retried once
+        args = (run_training_job, job_id, model_key, options, profile_path)
+        try:
+            return self._get_executor().submit(*args)
+        except (BrokenProcessPool, RuntimeError):
+            self._executor = None
+            return self._get_executor().submit(*args)
+
+    def _finish(self, job_id, future):
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None:
+            return
+
+        try:
+            outcome = future.result()
+            results = outcome['results']
+            if isinstance(results, dict) and results.get('status') == 'error':
+                raise RuntimeError(results.get('message', 'Training failed'))
+        except BrokenProcessPool as e:
+            # A worker died (e.g. OOM); start a fresh pool for the next job
+            with self._lock:
+                self._executor = None
+            if self._close(job, 'failed', error=f'Training process died: {e}'):
+                print(f"❌ Training job {job_id} ({job['model']}) failed: worker process died")
+            return
+        except Exception as e:
+            if self._close(job, 'failed', error=str(e)):
+                print(f"❌ Training job {job_id} ({job['model']}) failed: {e}")
+            return
+
+        with self._lock:
+            job['status'] = 'swapping'
+            job['stage'] = 'swapping_model'
+            job['results'] = results
+            job['worker_pid'] = outcome['worker_pid']
+            job['train_seconds'] = outcome['train_seconds']
+            if job['started_at'] is None:
+                job['started_at'] = job['submitted_at']
+            self._persist(job)
+
+        loader = self._loaders.get(job['model'])
+        try:
+            swapped = bool(loader()) if loader else False
+        except Exception as e:
+            self._close(job, 'failed', error=f'Model trained but could not be loaded: {e}')
+            return
+        if loader and not swapped:
+            self._close(job, 'failed', error='Model trained but could not be loaded')
+            return
+
+        self._close(job, 'succeeded', swapped=swapped)
+        print(f"✓ Training job {job_id} ({job['model']}) complete")
+
+    def _close(self, job, status, error=None, swapped=False):
+        with self._lock:
+            if job['status'] not in ACTIVE_STATUSES:
+                # Already closed by shutdown (interrupted)
+                return False
+            job['status'] = status
+            job['stage'] = 'done' if status == 'succeeded' else 'failed'
+            job['error'] = error
+            job['model_swapped'] = swapped
+            job['finished_at'] = time.time()
+            self._stats[status] += 1
+            self._persist(job)
+        job['done'].set()
+        return True
+
+    def _trim(self):
+        # Caller holds self._lock; drop the oldest finished jobs beyond the history size
+        finished = [jid for jid, j in self._jobs.items() if j['status'] not in ACTIVE_STATUSES]
+        for jid in finished[:max(0, len(finished) - self.history)]:
+            del self._jobs[jid]
+            if self.job_dir:
+                try:
+                    os.remove(self._job_path(jid))
+                except OSError:
+                    pass
+
+    def _job_path(self, job_id):
+        return os.path.join(self.job_dir, f'{job_id}.json')
+
+    def _persist(self, job):
+        # Caller holds self._lock; write atomically so readers never see a partial file
+        if not self.job_dir:
+            return
+        self._write_snapshot(job['job_id'], self._snapshot(job))
+
+    def _write_snapshot(self, job_id, snapshot):
+        path = self._job_path(job_id)
+        tmp = f'{path}.{os.getpid()}.tmp'
+        try:
+            with open(tmp, 'w') as f:
+                json.dump(snapshot, f, default=str)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"⚠️  Could not write training job snapshot: {str(e)}")
+
+    def _load_persisted(self, job_id):
+        # Jobs queued by another worker; ids are uuid hex, so the path cannot escape job_dir
+        if not self.job_dir or not all(c in '0123456789abcdef' for c in job_id):
+            return None
+        try:
+            with open(self._job_path(job_id)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @contextmanager
+    def _model_lock(self, model_key):
+        # Serializes submits for one model across every worker sharing job_dir
+        if not self.job_dir:
+            yield
+            return
+        with open(os.path.join(self.job_dir, f'.{model_key}.lock'), 'w') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _active_elsewhere(self, model_key):
+        """
+        Active job for model_key queued by another worker, from its job_dir snapshot.
+        A snapshot whose owner process is gone (killed mid-job) is marked failed.
+        Caller holds the model lock.
+        """
+        if not self.job_dir:
+            return None
+        try:
+            names = [n for n in os.listdir(self.job_dir) if n.endswith('.json')]
+        except OSError:
+            return None
+        for name in names:
+            job_id = name[:-len('.json')]
+            if job_id in self._jobs:
+                continue
+            snapshot = self._load_persisted(job_id)
+            if not snapshot or snapshot.get('model') != model_key or snapshot.get('status') not in ACTIVE_STATUSES:
+                continue
+            if _pid_alive(snapshot.get('owner_pid')):
+                return snapshot
+            snapshot.update({
+                'status': 'failed',
+                'stage': 'failed',
+                'error': 'Training interrupted: the worker that ran it exited',
+                'finished_at': datetime.now().isoformat(),
+            })
+            self._write_snapshot(job_id, snapshot)
+        return None
+
+    @staticmethod
+    def _iso(ts):
+        return datetime.fromtimestamp(ts).isoformat() if ts else None
+
+    def _snapshot(self, job):
+        # Caller holds self._lock
+        end = job['finished_at'] or time.time()
+        snapshot = {
+            'job_id': job['job_id'],
+            'model': job['model'],
+            'status': job['status'],
+            'stage': job['stage'],
+            'stages': [{'stage': s['stage'], 'at': self._iso(s['at'])} for s in job['stages']],
+            'submitted_at': self._iso(job['submitted_at']),
+            'started_at': self._iso(job['started_at']),
+            'finished_at': self._iso(job['finished_at']),
+            'queued_seconds': round((job['started_at'] or end) - job['submitted_at'], 3),
+            'elapsed_seconds': round(end - job['started_at'], 3) if job['started_at'] else 0.0,
+            'model_swapped': job['model_swapped'],
+            'error': job['error'],
+            'owner_pid': job['owner_pid'],
+        }
+        if job.get('profile'):
+            snapshot['profile'] = job['profile']
+        if job['status'] == 'succeeded':
+            snapshot['results'] = job['results']
+            snapshot['train_seconds'] = job.get('train_seconds')
+            snapshot['worker_pid'] = job['worker_pid']
+        return snapshot
+
+    def get(self, job_id):
+        """
+        Args:
+            job_id (str): Job id returned by submit
+
+        Returns:
+            dict: Status, stage, stage history, timings, results or error; None if unknown
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                return self._snapshot(job)
+        return self._load_persisted(job_id)
+
+    def list(self, model_key=None):
+        """
+        Args:
+            model_key (str): Only jobs for this model
+
+        Returns:
+            list: Job snapshots, newest first (results omitted)
+        """
+        with self._lock:
+            jobs = [self._snapshot(j) for j in reversed(self._jobs.values())
+                    if model_key is None or j['model'] == model_key]
+        for job in jobs:
+            job.pop('results', None)
+        return jobs
+
+    def wait(self, job_id, timeout=None):
+        """
+        Block until a job finishes
+
+        Args:
+            job_id (str): Job id returned by submit
+            timeout (float): Seconds to wait (None = forever)
+
+        Returns:
+            dict: Job snapshot (still active if the timeout expired); None if unknown
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is not None:
+            job['done'].wait(timeout)
+            return self.get(job_id)
+
+        # Queued by another worker: poll its job_dir snapshot
+        deadline = None if timeout is None else time.monotonic() + timeout
+        snapshot = self._load_persisted(job_id)
+        while snapshot is not None and snapshot['status'] in ACTIVE_STATUSES:
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            time.sleep(1)
+            snapshot = self._load_persisted(job_id)
+        return snapshot
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        """
+        Stop the training pool
+
+        Args:
+            wait (bool): Block until queued and running jobs finish
+            cancel_futures (bool): Drop jobs that have not started yet
+
+        With wait=False (server worker exit) the training processes are
+        terminated and every active job is closed as failed, so it does not
+        stay 'running' in job_dir after this worker is gone.
+        """
+        with self._lock:
+            executor = self._executor if self._pid == os.getpid() else None
+            self._executor = None
+            interrupted = [] if wait else [j for j in self._jobs.values() if j['status'] in ACTIVE_STATUSES]
+        if executor is None:
+            return
+        # Outside the lock: done-callbacks (_finish) run on the executor's manager thread and take it
+        for job in interrupted:
+            self._close(job, 'failed', error='Training interrupted: the server worker shut down')
+        if not wait:
+            # A running fit would otherwise keep the interpreter from exiting
+            for process in list((getattr(executor, '_processes', None) or {}).values()):
+                process.terminate()
+        executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+    def get_stats(self):
+        """
+        Get queue statistics
+
+        Returns:
+            dict: Worker config, job counters and active jobs by model
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['active'] = {j['model']: j['job_id'] for j in self._jobs.values()
+                               if j['status'] in ACTIVE_STATUSES}
+            stats['tracked_jobs'] = len(self._jobs)
+            stats['started'] = self._executor is not None
+        stats.update({
+            'workers': self.workers,
+            'start_method': self.start_method,
+            'job_dir': self.job_dir,
+        })
+        return stats
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_training_jobs():
+    """Returns the process-wide TrainingJobQueue, creating it on first use"""
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = TrainingJobQueue()
+    return _queue
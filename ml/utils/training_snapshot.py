@@ -0,0 +1,265 @@
+"""
+Shared Training Snapshot
+Extracts every source table the three models train on exactly once and derives
+each model's training frames from that snapshot in pandas
+"""
+
+import time
+
+import pandas as pd
+
+from config.db_connection import pooled_connection
+from utils.copy_fetch import fetch_frame
+from utils.data_loader import DataLoader
+from utils.frame_stream import apply_dtypes
+
+BILL_COLUMNS = [
+    'bill_id', 'sale_date', 'total_amount', 'subtotal', 'payment_method',
+    'appointment_id', 'appointment_type'
+]
+BILL_DTYPES = {
+    'bill_id': 'int64', 'sale_date': 'datetime64[ns]', 'total_amount': 'float64',
+    'subtotal': 'float64', 'appointment_id': 'Int64'
+}
+ITEM_COLUMNS = ['billing_item_id', 'bill_id', 'item_id', 'item_name', 'item_type', 'quantity', 'total_price']
+ITEM_DTYPES = {
+    'billing_item_id': 'int64', 'bill_id': 'int64', 'item_id': 'Int64',
+    'quantity': 'float64', 'total_price': 'float64'
+}
+INVENTORY_COLUMNS = [
+    'item_id', 'item_code', 'item_name', 'category', 'quantity', 'unit_cost',
+    'selling_price', 'reorder_level', 'reorder_quantity', 'lead_time_days',
+    'last_restock_date', 'expiry_date', 'is_active', 'created_at'
+]
+DISPENSED_COLUMNS = ['transaction_id', 'item_id', 'item_name', 'item_type', 'usage_date', 'quantity']
+DISPENSED_DTYPES = {
+    'transaction_id': 'int64', 'item_id': 'int64', 'usage_date': 'datetime64[ns]', 'quantity': 'float64'
+}
+
+
+class TrainingSnapshot:
+    """
+    One extraction of billing, billing_items, appointments, inventory,
+    inventory_transactions and disease_cases shared by every model.
+
+    billing_items is read once without joining billing; joins and the
+    per-model aggregations (daily revenue, item mix, consumption, monthly
+    category demand) happen in pandas. The object pickles cleanly, so it can
+    be handed to worker processes.
+    """
+
+    def __init__(self, bills, items, inventory, dispensed, disease_cases, extract_seconds):
+        self.bills = bills
+        self.items = items
+        self.inventory = inventory
+        self.dispensed = dispensed
+        self.disease_cases = disease_cases
+        self.extract_seconds = extract_seconds
+
+    @classmethod
+    def extract(cls, engine=None):
+        """
+        Read every source table once
+
+        Args:
+            engine (str): Fetch engine, 'cursor' or 'copy' (default: ML_FETCH_ENGINE)
+
+        Returns:
+            TrainingSnapshot: Raw frames plus per-source extraction seconds
+        """
+        timings = {}
+
+        def timed(name, fn):
+            start = time.perf_counter()
+            frame = fn()
+            timings[name] = round(time.perf_counter() - start, 3)
+            return frame
+
+        with pooled_connection() as conn:
+            cursor = conn.cursor()
+
+            # Paid bills with their appointment type (billing + appointments, one pass)
+            bills = timed('billing', lambda: fetch_frame(cursor, """
+                SELECT
+                    b.bill_id,
+                    DATE(b.bill_date) AS sale_date,
+                    b.total_amount,
+                    b.subtotal,
+                    b.payment_method,
+                    a.appointment_id,
+                    a.appointment_type
+                FROM billing b
+                LEFT JOIN appointments a ON b.appointment_id = a.appointment_id
+                WHERE b.payment_status IN ('fully_paid', 'partially_paid')
+                  AND b.bill_date IS NOT NULL
+            """, BILL_COLUMNS, dtypes=BILL_DTYPES, engine=engine))
+
+            # Line items; restricted to paid bills by the pandas join below
+            items = timed('billing_items', lambda: fetch_frame(cursor, """
+                SELECT
+                    bi.billing_item_id,
+                    bi.bill_id,
+                    bi.item_id,
+                    bi.item_name,
+                    bi.item_type,
+                    bi.quantity,
+                    bi.total_price
+                FROM billing_items bi
+            """, ITEM_COLUMNS, dtypes=ITEM_DTYPES, engine=engine))
+
+            # Small per-item snapshot; always the cursor engine
+            def inventory_rows():
+                cursor.execute("""
+                    SELECT
+                        item_id, item_code, item_name, category, quantity, unit_cost,
+                        selling_price, reorder_level, reorder_quantity,
+                        COALESCE(lead_time_days, 7) AS lead_time_days,
+                        last_restock_date, expiry_date, is_active, created_at
+                    FROM inventory
+                    WHERE is_active = true
+                    ORDER BY category, item_name
+                """)
+                return pd.DataFrame(cursor.fetchall(), columns=INVENTORY_COLUMNS)
+            inventory = timed('inventory', inventory_rows)
+
+            dispensed = timed('inventory_transactions', lambda: fetch_frame(cursor, """
+                SELECT
+                    it.transaction_id,
+                    it.item_id,
+                    i.item_name,
+                    i.category AS item_type,
+                    DATE(it.transaction_date) AS usage_date,
+                    it.quantity
+                FROM inventory_transactions it
+                JOIN inventory i ON it.item_id = i.item_id
+                WHERE it.transaction_type = 'dispensed'
+            """, DISPENSED_COLUMNS, dtypes=DISPENSED_DTYPES, engine=engine))
+            cursor.close()
+
+        disease_cases = timed('disease_cases', lambda: DataLoader().load_disease_data(engine=engine))
+
+        return cls(
+            apply_dtypes(bills, BILL_DTYPES),
+            apply_dtypes(items, ITEM_DTYPES),
+            inventory,
+            apply_dtypes(dispensed, DISPENSED_DTYPES),
+            disease_cases,
+            timings
+        )
+
+    def _paid_items(self):
+        return self.items.merge(self.bills[['bill_id', 'sale_date']], on='bill_id', how='inner')
+
+    # ------------------------------------------------------------------
+    # Per-model training frames
+    # ------------------------------------------------------------------
+
+    def sales_frames(self):
+        """
+        Returns:
+            tuple: (billing_df, items_df, appointment_df) as SalesForecastingModel.load_data
+        """
+        bills = self.bills
+        by_method = bills['total_amount'].where
+        billing_df = bills.assign(
+            cash_revenue=by_method(bills['payment_method'] == 'cash', 0.0),
+            card_revenue=by_method(bills['payment_method'] == 'card', 0.0),
+            bank_revenue=by_method(bills['payment_method'] == 'bank_transfer', 0.0),
+        ).groupby('sale_date', sort=True).agg(
+            daily_revenue=('total_amount', 'sum'),
+            daily_subtotal=('subtotal', 'sum'),
+            transaction_count=('bill_id', 'count'),
+            avg_transaction_value=('total_amount', 'mean'),
+            cash_revenue=('cash_revenue', 'sum'),
+            card_revenue=('card_revenue', 'sum'),
+            bank_revenue=('bank_revenue', 'sum'),
+        ).reset_index()
+
+        items_df = self._paid_items().groupby(['sale_date', 'item_type'], sort=True, dropna=False).agg(
+            category_revenue=('total_price', 'sum'),
+            item_count=('billing_item_id', 'count'),
+        ).reset_index()
+
+        appointment_df = bills[bills['appointment_id'].notna()].groupby(
+            ['sale_date', 'appointment_type'], sort=True, dropna=False
+        ).agg(
+            type_revenue=('total_amount', 'sum'),
+            appointment_count=('bill_id', 'count'),
+        ).reset_index()
+
+        return billing_df, items_df, appointment_df
+
+    def inventory_frames(self):
+        """
+        Returns:
+            tuple: (inventory_df, consumption_df, category_df) as
+                InventoryForecastingModel.load_inventory_data
+        """
+        keys = ['item_id', 'item_name', 'item_type', 'usage_date']
+        if not self.dispensed.empty:
+            consumption_df = self.dispensed.groupby(keys, sort=True, dropna=False).agg(
+                quantity_used=('quantity', 'sum'),
+                transaction_count=('transaction_id', 'count'),
+            ).reset_index()
+            consumption_df.insert(5, 'revenue_generated', 0.0)
+            print("   Using inventory_transactions for consumption data")
+        else:
+            paid = self._paid_items()
+            paid = paid[paid['item_id'].notna()].rename(columns={'sale_date': 'usage_date'})
+            consumption_df = paid.groupby(keys, sort=True, dropna=False).agg(
+                quantity_used=('quantity', 'sum'),
+                revenue_generated=('total_price', 'sum'),
+                transaction_count=('billing_item_id', 'count'),
+            ).reset_index()
+            consumption_df['item_id'] = consumption_df['item_id'].astype('int64')
+            print("   Using billing_items as consumption proxy (no dispensing records yet)")
+
+        paid = self._paid_items()
+        category_df = paid.assign(
+            year=paid['sale_date'].dt.year.astype('int64'),
+            month=paid['sale_date'].dt.month.astype('int64'),
+        ).groupby(['item_type', 'year', 'month'], dropna=False).agg(
+            total_quantity=('quantity', 'sum'),
+            total_revenue=('total_price', 'sum'),
+            unique_items=('item_id', 'nunique'),
+        ).reset_index().rename(columns={'item_type': 'category'})
+        category_df = category_df.sort_values(['year', 'month', 'category']).reset_index(drop=True)
+
+        return self.inventory, consumption_df, category_df
+
+    def disease_frame(self):
+        """
+        Returns:
+            pd.DataFrame: Disease cases as DataLoader.load_disease_data
+        """
+        return self.disease_cases
+
+    def training_data(self, model_key):
+        """
+        Args:
+            model_key (str): 'disease', 'sales' or 'inventory'
+
+        Returns:
+            Training data accepted by that model's train(data)
+        """
+        return {
+            'disease': self.disease_frame,
+            'sales': self.sales_frames,
+            'inventory': self.inventory_frames,
+        }[model_key]()
+
+    def get_stats(self):
+        """
+        Returns:
+            dict: Row counts and extraction seconds per source
+        """
+        return {
+            'rows': {
+                'billing': len(self.bills),
+                'billing_items': len(self.items),
+                'inventory': len(self.inventory),
+                'inventory_transactions': len(self.dispensed),
+                'disease_cases': len(self.disease_cases),
+            },
+            'extract_seconds': dict(self.extract_seconds),
+        }
@@ -6,6 +6,28 @@
 import * as mlService from '../services/mlService.js';
 import { insertAuditLog } from '../models/auditLogModel.js';
 
+/**
+ * Validators the browser sent for its cached copy of an analytics response
+ */
+const validatorsFrom = (req) => ({
+  ifNoneMatch: req.get('if-none-match'),
+  ifModifiedSince: req.get('if-modified-since')
+});
+
+/**
+ * Relay a cached analytics response with the ML service's ETag/Last-Modified,
+ * or 304 when the browser's copy is still current
+ */
+const sendRevalidated = (res, result) => {
+  if (result.etag) res.set('ETag', result.etag);
+  if (result.lastModified) res.set('Last-Modified', result.lastModified);
+  res.set('Cache-Control', 'private, no-cache');
+  if (result.status === 304) {
+    return res.status(304).end();
+  }
+  return res.json(result.data);
+};
+
 /**
  * @desc    Check ML service health
  * @route   GET /api/ml/health
@@ -97,8 +119,8 @@ const predictDisease = async (req, res) => {
  */
 const getDiseaseTrends = async (req, res) => {
   try {
-    const result = await mlService.getDiseaseTrends(req.query);
-    res.json(result);
+    const result = await mlService.getDiseaseTrends(req.query, validatorsFrom(req));
+    sendRevalidated(res, result);
   } catch (error) {
     console.error('Get disease trends error:', error);
     res.status(500).json({
@@ -160,11 +182,12 @@ const trainDiseaseModel = async (req, res) => {
       userId: req.user?.user_id,
       action: 'TRAIN',
       tableName: 'ml_models',
-      newValues: { model: 'disease_prediction', ...result },
+      newValues: { model: 'disease_prediction', job_id: result.job_id },
       ipAddress: req.ip,
       userAgent: req.get('user-agent')
     });
-    res.json(result);
+    // Queued: the client polls GET /api/ml/jobs/:id for the outcome
+    res.status(202).json(result);
   } catch (error) {
     console.error('Disease model training error:', error);
     res.status(500).json({ success: false, message: error.message });
@@ -178,11 +201,12 @@ const trainSalesModel = async (req, res) => {
       userId: req.user?.user_id,
       action: 'TRAIN',
       tableName: 'ml_models',
-      newValues: { model: 'sales_forecasting', ...result },
+      newValues: { model: 'sales_forecasting', job_id: result.job_id },
       ipAddress: req.ip,
       userAgent: req.get('user-agent')
     });
-    res.json(result);
+    // Queued: the client polls GET /api/ml/jobs/:id for the outcome
+    res.status(202).json(result);
   } catch (error) {
     console.error('Sales model training error:', error);
     res.status(500).json({
@@ -235,8 +259,8 @@ const predictMonthlyRevenue = async (req, res) => {
  */
 const getSalesTrends = async (req, res) => {
   try {
-    const result = await mlService.getSalesTrends(req.query);
-    res.json(result);
+    const result = await mlService.getSalesTrends(req.query, validatorsFrom(req));
+    sendRevalidated(res, result);
   } catch (error) {
     console.error('Get sales trends error:', error);
     res.status(500).json({
@@ -253,8 +277,8 @@ const getSalesTrends = async (req, res) => {
  */
 const getTopRevenueServices = async (req, res) => {
   try {
-    const result = await mlService.getTopRevenueServices(req.query);
-    res.json(result);
+    const result = await mlService.getTopRevenueServices(req.query, validatorsFrom(req));
+    sendRevalidated(res, result);
   } catch (error) {
     console.error('Get top revenue services error:', error);
     res.status(500).json({
@@ -280,11 +304,12 @@ const trainInventoryModel = async (req, res) => {
       userId: req.user?.user_id,
       action: 'TRAIN',
       tableName: 'ml_models',
-      newValues: { model: 'inventory_forecasting', ...result },
+      newValues: { model: 'inventory_forecasting', job_id: result.job_id },
       ipAddress: req.ip,
       userAgent: req.get('user-agent')
     });
-    res.json(result);
+    // Queued: the client polls GET /api/ml/jobs/:id for the outcome
+    res.status(202).json(result);
   } catch (error) {
     console.error('Inventory model training error:', error);
     res.status(500).json({
@@ -337,8 +362,8 @@ const getReorderSuggestions = async (req, res) => {
  */
 const getFastMovingItems = async (req, res) => {
   try {
-    const result = await mlService.getFastMovingItems(req.query);
-    res.json(result);
+    const result = await mlService.getFastMovingItems(req.query, validatorsFrom(req));
+    sendRevalidated(res, result);
   } catch (error) {
     console.error('Get fast-moving items error:', error);
     res.status(500).json({
@@ -355,8 +380,8 @@ const getFastMovingItems = async (req, res) => {
  */
 const getCategoryDemandAnalysis = async (req, res) => {
   try {
-    const result = await mlService.getCategoryDemandAnalysis();
-    res.json(result);
+    const result = await mlService.getCategoryDemandAnalysis(validatorsFrom(req));
+    sendRevalidated(res, result);
   } catch (error) {
     console.error('Get category demand analysis error:', error);
     res.status(500).json({
@@ -442,6 +467,20 @@ const getRetrainCheck = async (_req, res) => {
   }
 };
 
+/**
+ * @desc    Get the status of a training job (queued by a train endpoint)
+ * @route   GET /api/ml/jobs/:id
+ * @access  Private (Admin only)
+ */
+const getTrainingJob = async (req, res) => {
+  try {
+    const result = await mlService.getTrainingJob(req.params.id);
+    res.status(result.status).json(result.data);
+  } catch (error) {
+    res.status(500).json({ success: false, message: error.message });
+  }
+};
+
 const predictPetRisk = async (req, res) => {
   try {
     const result = await mlService.predictPetRisk(req.body);
@@ -494,6 +533,7 @@ export {
   getModelsStatus,
   getRetrainCheck,
   testDatabaseConnection,
+  getTrainingJob,
 
   // Disease Prediction
   trainDiseaseModel,
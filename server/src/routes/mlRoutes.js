@@ -41,6 +41,11 @@ router.get(
   mlController.testDatabaseConnection
 );
 
+// @route   GET /api/ml/jobs/:id
+// @desc    Get the status of a training job queued by a train endpoint
+// @access  Private (Admin only)
+router.get('/jobs/:id', authorize('admin'), mlController.getTrainingJob);
+
 // ============================================
 // Disease Prediction Routes
 // ============================================
@@ -69,6 +69,31 @@ const testDatabaseConnection = async () => {
   }
 };
 
+/**
+ * GET a cached analytics endpoint, forwarding the browser's validators so the
+ * ML service can answer 304 Not Modified without sending the body again
+ * @param {string} path - ML endpoint path
+ * @param {Object} params - Query parameters
+ * @param {Object} validators - { ifNoneMatch, ifModifiedSince } from the client request
+ * @returns {Promise<{status: number, data: Object, etag: string, lastModified: string}>}
+ */
+const getRevalidated = async (path, params = {}, validators = {}) => {
+  const headers = {};
+  if (validators.ifNoneMatch) headers['If-None-Match'] = validators.ifNoneMatch;
+  if (validators.ifModifiedSince) headers['If-Modified-Since'] = validators.ifModifiedSince;
+  const response = await mlClient.get(path, {
+    params,
+    headers,
+    validateStatus: (status) => (status >= 200 && status < 300) || status === 304
+  });
+  return {
+    status: response.status,
+    data: response.data,
+    etag: response.headers.etag,
+    lastModified: response.headers['last-modified']
+  };
+};
+
 // ============================================
 // Disease Prediction Services
 // ============================================
@@ -90,11 +115,11 @@ const predictDisease = async (params) => {
 /**
  * Get disease trends
  * @param {Object} params - Query parameters
+ * @param {Object} validators - Conditional request headers (see getRevalidated)
  */
-const getDiseaseTrends = async (params) => {
+const getDiseaseTrends = async (params, validators) => {
   try {
-    const response = await mlClient.get('/api/ml/disease/trends', { params });
-    return response.data;
+    return await getRevalidated('/api/ml/disease/trends', params, validators);
   } catch (error) {
     console.error('Failed to get disease trends:', error.message);
     throw new Error('Failed to retrieve disease trends');
@@ -106,12 +131,39 @@ const getDiseaseTrends = async (params) => {
 // ============================================
 
 /**
- * Train or retrain the disease prediction model
+ * Queue a training job on the ML service. Training runs in the background
+ * there; the caller gets { success, message, job_id, job } back right away
+ * and polls getTrainingJob(job_id) for the outcome.
+ * @param {string} path - Train endpoint, e.g. /api/ml/disease/train
+ */
+const submitTrainingJob = async (path) => {
+  const response = await mlClient.post(path, {});
+  return response.data;
+};
+
+/**
+ * Get the status of a training job
+ * @param {string} jobId - Job id returned when the training job was queued
+ * @returns {Promise<{status: number, data: Object}>} 404 is passed through for unknown jobs
+ */
+const getTrainingJob = async (jobId) => {
+  try {
+    const response = await mlClient.get(`/api/ml/jobs/${encodeURIComponent(jobId)}`, {
+      validateStatus: (status) => (status >= 200 && status < 300) || status === 404
+    });
+    return { status: response.status, data: response.data };
+  } catch (error) {
+    console.error('Failed to get training job:', error.message);
+    throw new Error('Failed to retrieve training job status');
+  }
+};
+
+/**
+ * Queue training of the disease prediction model; resolves with the queued job
  */
 const trainDiseaseModel = async () => {
   try {
-    const response = await mlClient.post('/api/ml/disease/train', {});
-    return response.data;
+    return await submitTrainingJob('/api/ml/disease/train');
   } catch (error) {
     console.error('Disease model training failed:', error.message);
     throw new Error('Failed to train disease prediction model');
@@ -119,12 +171,11 @@ const trainDiseaseModel = async () => {
 };
 
 /**
- * Train or retrain the sales forecasting model
+ * Queue training of the sales forecasting model; resolves with the queued job
  */
 const trainSalesModel = async () => {
   try {
-    const response = await mlClient.post('/api/ml/sales/train', {});
-    return response.data;
+    return await submitTrainingJob('/api/ml/sales/train');
   } catch (error) {
     console.error('Sales model training failed:', error.message);
     throw new Error('Failed to train sales forecasting model');
@@ -166,11 +217,11 @@ const predictMonthlyRevenue = async (params) => {
  * Get historical sales trends and seasonal patterns
  * @param {Object} params - Query parameters
  * @param {number} params.months - Number of months to analyse (default: 12)
+ * @param {Object} validators - Conditional request headers (see getRevalidated)
  */
-const getSalesTrends = async (params = {}) => {
+const getSalesTrends = async (params = {}, validators) => {
   try {
-    const response = await mlClient.get('/api/ml/sales/trends', { params });
-    return response.data;
+    return await getRevalidated('/api/ml/sales/trends', params, validators);
   } catch (error) {
     console.error('Failed to get sales trends:', error.message);
     throw new Error('Failed to retrieve sales trends');
@@ -181,11 +232,11 @@ const getSalesTrends = async (params = {}) => {
  * Get top revenue-generating services and products
  * @param {Object} params - Query parameters
  * @param {number} params.limit - Number of items to return (default: 10)
+ * @param {Object} validators - Conditional request headers (see getRevalidated)
  */
-const getTopRevenueServices = async (params = {}) => {
+const getTopRevenueServices = async (params = {}, validators) => {
   try {
-    const response = await mlClient.get('/api/ml/sales/top-services', { params });
-    return response.data;
+    return await getRevalidated('/api/ml/sales/top-services', params, validators);
   } catch (error) {
     console.error('Failed to get top revenue services:', error.message);
     throw new Error('Failed to retrieve top revenue services');
@@ -197,12 +248,11 @@ const getTopRevenueServices = async (params = {}) => {
 // ============================================
 
 /**
- * Train or retrain the inventory forecasting model
+ * Queue training of the inventory forecasting model; resolves with the queued job
  */
 const trainInventoryModel = async () => {
   try {
-    const response = await mlClient.post('/api/ml/inventory/train', {});
-    return response.data;
+    return await submitTrainingJob('/api/ml/inventory/train');
   } catch (error) {
     console.error('Inventory model training failed:', error.message);
     throw new Error('Failed to train inventory forecasting model');
@@ -242,11 +292,11 @@ const getReorderSuggestions = async (params = {}) => {
  * Get fast-moving and slow-moving inventory items
  * @param {Object} params - Query parameters
  * @param {number} params.limit - Number of items per category (default: 10)
+ * @param {Object} validators - Conditional request headers (see getRevalidated)
  */
-const getFastMovingItems = async (params = {}) => {
+const getFastMovingItems = async (params = {}, validators) => {
   try {
-    const response = await mlClient.get('/api/ml/inventory/fast-moving', { params });
-    return response.data;
+    return await getRevalidated('/api/ml/inventory/fast-moving', params, validators);
   } catch (error) {
     console.error('Failed to get fast-moving items:', error.message);
     throw new Error('Failed to retrieve fast-moving items');
@@ -255,11 +305,11 @@ const getFastMovingItems = async (params = {}) => {
 
 /**
  * Get demand analysis by inventory category
+ * @param {Object} validators - Conditional request headers (see getRevalidated)
  */
-const getCategoryDemandAnalysis = async () => {
+const getCategoryDemandAnalysis = async (validators) => {
   try {
-    const response = await mlClient.get('/api/ml/inventory/category-analysis');
-    return response.data;
+    return await getRevalidated('/api/ml/inventory/category-analysis', {}, validators);
   } catch (error) {
     console.error('Failed to get category demand analysis:', error.message);
     throw new Error('Failed to retrieve category demand analysis');
@@ -395,6 +445,7 @@ export {
   getModelsStatus,
   getRetrainCheck,
   testDatabaseConnection,
+  getTrainingJob,
 
   // Disease Prediction
   trainDiseaseModel,